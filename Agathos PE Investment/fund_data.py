@@ -0,0 +1,126 @@
+"""Fund metrics for the Agathos charts, loaded from CSV or Parquet.
+
+The source is one row per fund. An optional Manager column lets a single
+file hold the funds of many managers; render_pipeline.py renders one
+deck per manager. The fund whose name ends in "(Target)" is the target
+fund, or the latest vintage when no fund is marked. Its Net IRR and
+Net MOIC give the target lines, and its commitment and vintage drive the
+deployment timeline.
+
+Parsed and validated frames are cached until the file changes.
+"""
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+FUND_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "Agathos_Fund_Performance_and_Strategy.csv")
+
+DEFAULT_MANAGER = "Agathos"
+TARGET_SUFFIX = " (Target)"
+
+# Column name -> kind: text, whole number or number
+REQUIRED_COLUMNS = {
+    "Fund": "text",
+    "Vintage Year": "whole",
+    "Committed Capital (£m)": "number",
+    "Deployed Capital (£m)": "number",
+    "Gross IRR (%)": "number",
+    "Net IRR (%)": "number",
+    "Gross MOIC (x)": "number",
+    "Net MOIC (x)": "number"
+}
+OPTIONAL_COLUMNS = {
+    "Manager": "text",
+    "No. of Platform Investments": "whole",
+    "Sectors": "text"
+}
+# Capital and multiples can't be negative; IRRs can
+NON_NEGATIVE_COLUMNS = ("Committed Capital (£m)", "Deployed Capital (£m)", "Gross MOIC (x)", "Net MOIC (x)",
+                        "No. of Platform Investments")
+
+def validate_fund_data(df, source="fund data"):
+    """Copy of df with the schema's columns coerced to their types; raises ValueError when df doesn't fit it."""
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"{source} is missing columns: {', '.join(missing)}")
+    if df.empty:
+        raise ValueError(f"{source} has no funds")
+
+    df = df.copy()
+    columns = {**REQUIRED_COLUMNS, **{c: kind for c, kind in OPTIONAL_COLUMNS.items() if c in df.columns}}
+    for column, kind in columns.items():
+        if kind == "text":
+            if df[column].isna().any() and column in REQUIRED_COLUMNS:
+                raise ValueError(f"{source}: {column!r} is empty in rows {_rows(df[column].isna())}")
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str).str.strip())
+            continue
+        values = pd.to_numeric(df[column], errors="coerce")
+        bad = values.isna()
+        if bad.any():
+            raise ValueError(f"{source}: {column!r} is not numeric in rows {_rows(bad)}")
+        if kind == "whole":
+            if (values % 1 != 0).any():
+                raise ValueError(f"{source}: {column!r} is not a whole number in rows {_rows(values % 1 != 0)}")
+            values = values.astype("int64")
+        df[column] = values
+    if "Manager" in df.columns:
+        df["Manager"] = df["Manager"].fillna(DEFAULT_MANAGER)
+
+    for column in NON_NEGATIVE_COLUMNS:
+        if column in df.columns and (df[column] < 0).any():
+            raise ValueError(f"{source}: {column!r} is negative in rows {_rows(df[column] < 0)}")
+    over_deployed = df["Deployed Capital (£m)"] > df["Committed Capital (£m)"]
+    if over_deployed.any():
+        raise ValueError(f"{source}: deployed capital exceeds committed capital in rows {_rows(over_deployed)}")
+    duplicated = df.duplicated([c for c in ("Manager", "Fund") if c in df.columns])
+    if duplicated.any():
+        raise ValueError(f"{source}: duplicate funds in rows {_rows(duplicated)}")
+    return df
+
+def _rows(mask):
+    # 1-based data rows, as a spreadsheet user would count them below the header
+    return ", ".join(str(i + 1) for i in mask.to_numpy().nonzero()[0])
+
+@lru_cache(maxsize=32)
+def _load(path, modified):
+    if path.lower().endswith((".parquet", ".pq")):
+        df = pd.read_parquet(path)
+    elif path.lower().endswith(".csv"):
+        df = pd.read_csv(path)
+    else:
+        raise ValueError(f"Unsupported fund data file {path!r}; use .csv or .parquet")
+    return validate_fund_data(df, source=os.path.basename(path))
+
+def load_fund_data(path=FUND_DATA_PATH):
+    """Validated fund metrics from a CSV or Parquet file.
+
+    The parsed frame is cached until the file's modification time changes,
+    so treat it as read-only (copy before editing).
+    """
+    path = os.path.abspath(path)
+    return _load(path, os.path.getmtime(path))
+
+def split_by_manager(df):
+    """{manager: that manager's funds}, in order of first appearance; one DEFAULT_MANAGER group without a Manager column."""
+    if "Manager" not in df.columns:
+        return {DEFAULT_MANAGER: df}
+    return {manager: group.reset_index(drop=True) for manager, group in df.groupby("Manager", sort=False)}
+
+def manager_name(df):
+    """The manager whose funds df holds, for chart titles."""
+    if "Manager" not in df.columns:
+        return DEFAULT_MANAGER
+    managers = df["Manager"].dropna().unique()
+    return managers[0] if len(managers) == 1 else "Combined"
+
+def target_fund(df):
+    """Position and row of the target fund: the one named "... (Target)", else the latest vintage."""
+    marked = df["Fund"].str.endswith(TARGET_SUFFIX).to_numpy().nonzero()[0]
+    position = int(marked[-1]) if len(marked) else int(df["Vintage Year"].to_numpy().argmax())
+    return position, df.iloc[position]
+
+def short_fund_name(name):
+    """Fund name without the "(Target)" marker, e.g. "Fund III"."""
+    return name[:-len(TARGET_SUFFIX)] if name.endswith(TARGET_SUFFIX) else name
@@ -5,6 +5,8 @@ import numpy as np
 import os
 import matplotlib.patches as mpatches
 
+from fund_data import FUND_DATA_PATH, load_fund_data, manager_name, short_fund_name, target_fund
+
 # Set professional financial style
 sns.set_theme(style="whitegrid", context="notebook", font_scale=1.2)
 
@@ -31,12 +33,14 @@ colors = {
 
 # Get the current directory
 current_dir = os.path.dirname(os.path.abspath(__file__))
+# Where the charts are saved (render_pipeline.py points this at a folder per manager)
+output_dir = current_dir
 
 # --- Fee Model ---
 mgmt_fee_drag = 0.135  # 13.5% of Gross IRR
 carry_drag = 0.0375    # 3.75% of Gross IRR
 
-# Simulating extracted key data from Agathos Fund III documents for .csv export
+# Simulating extracted key data from Agathos Fund III documents; seeds the CSV when it doesn't exist yet
 data = {
     "Fund": ["Fund I", "Fund II", "Fund III (Target)"],
     "Vintage Year": [2016, 2020, 2025],
@@ -60,11 +64,16 @@ data = {
     "Sectors": ["Business Services, Healthcare", "Education, Healthcare", "Education, ESG, Healthcare"]
 }
 
-fund_data_df = pd.DataFrame(data)
+csv_path = FUND_DATA_PATH
+
+def save_fund_data_csv():
+    # Save as CSV in the current directory
+    pd.DataFrame(data).to_csv(csv_path, index=False)
 
-# Save as CSV in the current directory
-csv_path = os.path.join(current_dir, "Agathos_Fund_Performance_and_Strategy.csv")
-fund_data_df.to_csv(csv_path, index=False)
+# The charts are drawn from the CSV (edit it, or pass another file to render_pipeline.py)
+if not os.path.exists(csv_path):
+    save_fund_data_csv()
+fund_data_df = load_fund_data(csv_path)
 
 def set_ymax(ax, values, buffer=0.10):
     ymax = max(values) * (1 + buffer)
@@ -94,11 +103,12 @@ def create_irr_comparison():
     add_labels(bars1)
     add_labels(bars2)
     set_ymax(ax, list(fund_data_df['Gross IRR (%)']) + list(fund_data_df['Net IRR (%)']))
-    ax.axhline(y=18.0, color=colors['target'], linestyle='--', alpha=0.8,
-               linewidth=2, label='Fund III Target Net IRR')
+    _, target = target_fund(fund_data_df)
+    ax.axhline(y=target['Net IRR (%)'], color=colors['target'], linestyle='--', alpha=0.8,
+               linewidth=2, label=f"{short_fund_name(target['Fund'])} Target Net IRR")
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('IRR (%)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Gross vs. Net IRR', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Gross vs. Net IRR', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -111,7 +121,7 @@ def create_irr_comparison():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'irr_comparison'))
+    save_png_only(fig, os.path.join(output_dir, 'irr_comparison'))
     plt.close(fig)
 
 def create_moic_comparison():
@@ -137,7 +147,7 @@ def create_moic_comparison():
     set_ymax(ax, list(fund_data_df['Gross MOIC (x)']) + list(fund_data_df['Net MOIC (x)']))
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('MOIC (x)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Gross vs. Net MOIC', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Gross vs. Net MOIC', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -150,7 +160,7 @@ def create_moic_comparison():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'moic_comparison'))
+    save_png_only(fig, os.path.join(output_dir, 'moic_comparison'))
     plt.close(fig)
 
 def create_timeline_chart():
@@ -162,11 +172,12 @@ def create_timeline_chart():
     for x, y in zip(fund_data_df['Vintage Year'], fund_data_df['Net IRR (%)']):
         ax.annotate(f'{y:.1f}%', (x, y), textcoords="offset points", xytext=(0, 8),
                     ha='center', fontsize=11, fontweight='bold', color='black')
-    ax.axhline(y=18.0, color=colors['target'], linestyle='--', alpha=0.8,
-               linewidth=2, label='Fund III Target')
+    _, target = target_fund(fund_data_df)
+    ax.axhline(y=target['Net IRR (%)'], color=colors['target'], linestyle='--', alpha=0.8,
+               linewidth=2, label=f"{short_fund_name(target['Fund'])} Target")
     ax.set_xlabel('Vintage Year', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('Net IRR (%)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Net IRR by Vintage Year', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Net IRR by Vintage Year', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(fund_data_df['Vintage Year'])
     ax.tick_params(axis='x', labelsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -174,12 +185,12 @@ def create_timeline_chart():
                       edgecolor='black', fancybox=False)
     fig.text(0.02, 0.01, 
              'Note: Shows the evolution of Net IRR across fund vintages.\n'
-             'Fund III (2025) represents target performance.',
+             f"{short_fund_name(target['Fund'])} ({target['Vintage Year']}) represents target performance.",
              fontsize=10, style='italic', color='#333333')
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'irr_timeline'))
+    save_png_only(fig, os.path.join(output_dir, 'irr_timeline'))
     plt.close(fig)
 
 def create_capital_comparison():
@@ -205,7 +216,7 @@ def create_capital_comparison():
     set_ymax(ax, list(fund_data_df['Committed Capital (£m)']) + list(fund_data_df['Deployed Capital (£m)']))
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('Capital (£m)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Committed vs. Deployed Capital', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Committed vs. Deployed Capital', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -217,7 +228,7 @@ def create_capital_comparison():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'capital_comparison'))
+    save_png_only(fig, os.path.join(output_dir, 'capital_comparison'))
     plt.close(fig)
 
 def create_gross_irr_chart():
@@ -234,7 +245,7 @@ def create_gross_irr_chart():
     set_ymax(ax, fund_data_df['Gross IRR (%)'])
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('Gross IRR (%)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Gross IRR (Before Fees)', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Gross IRR (Before Fees)', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -242,7 +253,7 @@ def create_gross_irr_chart():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'gross_irr_only'))
+    save_png_only(fig, os.path.join(output_dir, 'gross_irr_only'))
     plt.close(fig)
 
 def create_net_irr_chart():
@@ -259,7 +270,7 @@ def create_net_irr_chart():
     set_ymax(ax, fund_data_df['Net IRR (%)'])
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('Net IRR (%)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Net IRR (After Fees)', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Net IRR (After Fees)', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -267,7 +278,7 @@ def create_net_irr_chart():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'net_irr_only'))
+    save_png_only(fig, os.path.join(output_dir, 'net_irr_only'))
     plt.close(fig)
 
 def create_gross_moic_chart():
@@ -284,7 +295,7 @@ def create_gross_moic_chart():
     set_ymax(ax, fund_data_df['Gross MOIC (x)'])
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('Gross MOIC (x)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Gross MOIC (Before Fees)', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Gross MOIC (Before Fees)', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -292,7 +303,7 @@ def create_gross_moic_chart():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'gross_moic_only'))
+    save_png_only(fig, os.path.join(output_dir, 'gross_moic_only'))
     plt.close(fig)
 
 def create_net_moic_single_chart():
@@ -309,7 +320,7 @@ def create_net_moic_single_chart():
     set_ymax(ax, fund_data_df['Net MOIC (x)'])
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('Net MOIC (x)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – Net MOIC (After Fees)', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – Net MOIC (After Fees)', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -317,7 +328,7 @@ def create_net_moic_single_chart():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'net_moic_single_only'))
+    save_png_only(fig, os.path.join(output_dir, 'net_moic_single_only'))
     plt.close(fig)
 
 def create_net_moic_chart():
@@ -342,16 +353,18 @@ def create_net_moic_chart():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'net_moic_only'))
+    save_png_only(fig, os.path.join(output_dir, 'net_moic_only'))
     plt.close(fig)
 
 def create_fund3_deployment_timeline():
-    years = list(range(2025, 2035))
-    committed = 100  # £m
-    drawdown = [committed * 0.2 if y < 2030 else 0 for y in years]  # 20% per year for 5 years
+    _, target = target_fund(fund_data_df)
+    vintage = int(target['Vintage Year'])
+    years = list(range(vintage, vintage + 10))
+    committed = target['Committed Capital (£m)']  # £m
+    drawdown = [committed * 0.2 if y < vintage + 5 else 0 for y in years]  # 20% per year for 5 years
     cumulative_drawn = [sum(drawdown[:i+1]) for i in range(len(drawdown))]
-    # Simulate distributions: return 25% of committed per year from 2030-2034
-    distributions = [0 if y < 2030 else committed * 0.25 for y in years]
+    # Simulate distributions: return 25% of committed per year in years 6-10
+    distributions = [0 if y < vintage + 5 else committed * 0.25 for y in years]
     cumulative_returned = [sum(distributions[:i+1]) for i in range(len(distributions))]
     net_cash = [draw - ret for draw, ret in zip(cumulative_drawn, cumulative_returned)]
     fig, ax = plt.subplots(figsize=(12, 7), facecolor=colors['background'])
@@ -360,12 +373,12 @@ def create_fund3_deployment_timeline():
     ax.plot(years, net_cash, label='Net Cash Out', color='#888888', linestyle='--', linewidth=2)
     ax.set_xlabel('Year', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('£m', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Fund III – Simulated Capital Deployment & Return Timeline', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f"{short_fund_name(target['Fund'])} – Simulated Capital Deployment & Return Timeline", fontsize=16, fontweight='bold', pad=20)
     ax.legend(loc='center right', frameon=True, framealpha=0.95, edgecolor='black', fancybox=False)
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'fund3_deployment_timeline'))
+    save_png_only(fig, os.path.join(output_dir, 'fund3_deployment_timeline'))
     plt.close(fig)
 
 def create_irr_comparison_with_fee_drag():
@@ -386,12 +399,15 @@ def create_irr_comparison_with_fee_drag():
         ax.annotate(f'{height:.1f}%', xy=(bar.get_x() + bar.get_width() / 2, height), xytext=(0, 12), textcoords="offset points", ha='center', va='bottom', fontsize=11, fontweight='bold', color='black')
     # Add extra y-axis buffer for annotation and labels
     set_ymax(ax, list(gross) + list(net), buffer=0.18)
-    # Green, dashed, clearly labeled target line for Fund III
-    ax.axhline(y=18.0, color='green', linestyle='--', alpha=0.9, linewidth=2)
-    ax.annotate('Fund III Target Net IRR', xy=(2, 18.0), xytext=(1.7, 21.5), color='green', fontsize=12, fontweight='bold', arrowprops=dict(arrowstyle='->', color='green', lw=2), bbox=dict(boxstyle='round,pad=0.2', fc='white', ec='green', lw=1, alpha=0.7))
+    # Green, dashed, clearly labeled target line for the target fund
+    position, target = target_fund(fund_data_df)
+    target_irr = target['Net IRR (%)']
+    ax.axhline(y=target_irr, color='green', linestyle='--', alpha=0.9, linewidth=2)
+    ax.annotate(f"{short_fund_name(target['Fund'])} Target Net IRR", xy=(position, target_irr),
+                xytext=(position - 0.3, target_irr + 3.5), color='green', fontsize=12, fontweight='bold', arrowprops=dict(arrowstyle='->', color='green', lw=2), bbox=dict(boxstyle='round,pad=0.2', fc='white', ec='green', lw=1, alpha=0.7))
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('IRR (%)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – IRR: Gross, Fee Drag, and Net', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – IRR: Gross, Fee Drag, and Net', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -400,7 +416,7 @@ def create_irr_comparison_with_fee_drag():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.08, 1, 1])
     fig.subplots_adjust(bottom=0.15, top=0.92, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'irr_comparison_fee_drag'))
+    save_png_only(fig, os.path.join(output_dir, 'irr_comparison_fee_drag'))
     plt.close(fig)
 
 def create_moic_comparison_with_fee_drag():
@@ -420,12 +436,15 @@ def create_moic_comparison_with_fee_drag():
         height = bar.get_height()
         ax.annotate(f'{height:.2f}x', xy=(bar.get_x() + bar.get_width() / 2, height), xytext=(0, 8), textcoords="offset points", ha='center', va='bottom', fontsize=11, fontweight='bold', color='black')
     set_ymax(ax, list(gross) + list(net))
-    # Green, dashed, clearly labeled target line for Fund III
-    ax.axhline(y=1.8, color='green', linestyle='--', alpha=0.9, linewidth=2)
-    ax.annotate('Fund III Target Net MOIC', xy=(2, 1.8), xytext=(2.1, 2.0), color='green', fontsize=12, fontweight='bold', arrowprops=dict(arrowstyle='->', color='green'))
+    # Green, dashed, clearly labeled target line for the target fund
+    position, target = target_fund(fund_data_df)
+    target_moic = target['Net MOIC (x)']
+    ax.axhline(y=target_moic, color='green', linestyle='--', alpha=0.9, linewidth=2)
+    ax.annotate(f"{short_fund_name(target['Fund'])} Target Net MOIC", xy=(position, target_moic),
+                xytext=(position + 0.1, target_moic + 0.2), color='green', fontsize=12, fontweight='bold', arrowprops=dict(arrowstyle='->', color='green'))
     ax.set_xlabel('Fund', fontsize=12, fontweight='bold', labelpad=10)
     ax.set_ylabel('MOIC (x)', fontsize=12, fontweight='bold', labelpad=10)
-    ax.set_title('Agathos Funds – MOIC: Gross, Fee Drag, and Net', fontsize=16, fontweight='bold', pad=20)
+    ax.set_title(f'{manager_name(fund_data_df)} Funds – MOIC: Gross, Fee Drag, and Net', fontsize=16, fontweight='bold', pad=20)
     ax.set_xticks(x)
     ax.set_xticklabels(fund_data_df['Fund'], fontsize=11)
     ax.tick_params(axis='y', labelsize=11)
@@ -434,19 +453,26 @@ def create_moic_comparison_with_fee_drag():
     ax.grid(True, alpha=0.2, linestyle='--')
     plt.tight_layout(rect=[0, 0.06, 1, 1])
     fig.subplots_adjust(bottom=0.13, top=0.93, left=0.08, right=0.98)
-    save_png_only(fig, os.path.join(current_dir, 'moic_comparison_fee_drag'))
+    save_png_only(fig, os.path.join(output_dir, 'moic_comparison_fee_drag'))
     plt.close(fig)
 
-# Generate all visualizations
-create_irr_comparison()
-create_moic_comparison()
-create_timeline_chart()
-create_capital_comparison()
-create_gross_irr_chart()
-create_net_irr_chart()
-create_gross_moic_chart()
-create_net_moic_single_chart()
-create_net_moic_chart()
-create_fund3_deployment_timeline()
-create_irr_comparison_with_fee_drag()
-create_moic_comparison_with_fee_drag()
+# Every chart by the name of the PNG it writes (render_pipeline.py renders them in parallel)
+CHARTS = {
+    'irr_comparison': create_irr_comparison,
+    'moic_comparison': create_moic_comparison,
+    'irr_timeline': create_timeline_chart,
+    'capital_comparison': create_capital_comparison,
+    'gross_irr_only': create_gross_irr_chart,
+    'net_irr_only': create_net_irr_chart,
+    'gross_moic_only': create_gross_moic_chart,
+    'net_moic_single_only': create_net_moic_single_chart,
+    'net_moic_only': create_net_moic_chart,
+    'fund3_deployment_timeline': create_fund3_deployment_timeline,
+    'irr_comparison_fee_drag': create_irr_comparison_with_fee_drag,
+    'moic_comparison_fee_drag': create_moic_comparison_with_fee_drag
+}
+
+if __name__ == '__main__':
+    # Generate all visualizations
+    for create_chart in CHARTS.values():
+        create_chart()
@@ -0,0 +1,167 @@
+"""Render the Agathos chart deck in parallel, skipping charts that have not changed.
+
+Every chart in graphs.CHARTS gets a content hash of its inputs:
+- the chart function's source and the shared helpers;
+- the style (colour palette, matplotlib rcParams, dpi and matplotlib version);
+- the fund data, when the chart uses it.
+
+Charts whose hash matches the manifest from the last run, and whose PNG
+still exists, are skipped. The rest are rendered across a process pool on
+the non-interactive Agg backend. One stale chart renders in this process,
+so a single edit does not pay for starting workers.
+
+The fund data comes from a CSV or Parquet file (see fund_data.py). A file
+with a Manager column is rendered as one deck per manager, each in its own
+folder under --output-dir, with all decks sharing one process pool.
+
+Examples:
+    python render_pipeline.py                    render what changed
+    python render_pipeline.py --force            re-render the whole deck
+    python render_pipeline.py --charts irr_timeline net_irr_only
+    python render_pipeline.py --data managers.parquet --output-dir decks
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # before pyplot is imported (by graphs)
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import graphs
+from fund_data import load_fund_data, split_by_manager
+
+MANIFEST_NAME = '.render_manifest.json'  # one per output folder
+DPI = 300  # save_png_only's resolution, part of every hash
+
+def _style_fingerprint():
+    rc = sorted((key, repr(value)) for key, value in plt.rcParams.items())
+    return repr((matplotlib.__version__, DPI, graphs.colors, rc))
+
+def chart_hashes(fund_data=None):
+    """Content hash of every chart's inputs, keyed by chart name."""
+    fund_data = graphs.fund_data_df if fund_data is None else fund_data
+    data_csv = fund_data.to_csv(index=False)
+    shared = (_style_fingerprint() + inspect.getsource(graphs.set_ymax) + inspect.getsource(graphs.save_png_only)
+              + inspect.getsource(sys.modules[load_fund_data.__module__]))
+    hashes = {}
+    for name, create_chart in graphs.CHARTS.items():
+        source = inspect.getsource(create_chart)
+        content = shared + source + (data_csv if 'fund_data_df' in source else '')
+        hashes[name] = hashlib.sha256(content.encode()).hexdigest()
+    return hashes
+
+def load_manifest(output_dir=None):
+    try:
+        with open(os.path.join(output_dir or graphs.current_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, output_dir=None):
+    with open(os.path.join(output_dir or graphs.current_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def output_path(name, output_dir=None):
+    return os.path.join(output_dir or graphs.current_dir, f"{name}.png")
+
+def deck_dir(output_dir, manager):
+    """Folder for one manager's deck under output_dir, named after the manager."""
+    return os.path.join(output_dir, re.sub(r'[^\w.-]+', '_', manager).strip('_') or 'manager')
+
+def render_chart(name, fund_data=None, output_dir=None):
+    """Render one chart (in a worker or in this process) and return its name and render time."""
+    if fund_data is not None:
+        graphs.fund_data_df = fund_data
+    graphs.output_dir = output_dir or graphs.current_dir
+    start = time.perf_counter()
+    graphs.CHARTS[name]()
+    return name, time.perf_counter() - start
+
+def _check_names(names):
+    names = list(names or graphs.CHARTS)
+    unknown = [name for name in names if name not in graphs.CHARTS]
+    if unknown:
+        raise ValueError(f"Unknown charts: {', '.join(unknown)}; choose from {', '.join(graphs.CHARTS)}")
+    return names
+
+def render_decks(decks, names=None, force=False, workers=None):
+    """Render the stale charts of several decks in one pool.
+
+    decks maps an output folder to its fund data. Returns {folder: {name: seconds}}
+    for the charts rendered.
+    """
+    names = _check_names(names)
+    tasks, hashes = [], {}
+    for output_dir, deck_data in decks.items():
+        os.makedirs(output_dir, exist_ok=True)
+        hashes[output_dir] = chart_hashes(deck_data)
+        manifest = load_manifest(output_dir)
+        tasks += [(name, deck_data, output_dir) for name in names
+                  if force or manifest.get(name) != hashes[output_dir][name]
+                  or not os.path.exists(output_path(name, output_dir))]
+
+    workers = min(workers or multiprocessing.cpu_count(), len(tasks))
+    if workers <= 1:
+        times = [render_chart(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            times = list(executor.map(render_chart, *zip(*tasks)))
+    graphs.output_dir = graphs.current_dir
+
+    rendered = {output_dir: {} for output_dir in decks}
+    for (_, _, output_dir), (name, seconds) in zip(tasks, times):
+        rendered[output_dir][name] = seconds
+    for output_dir, deck_rendered in rendered.items():
+        manifest = load_manifest(output_dir)
+        manifest.update({name: hashes[output_dir][name] for name in deck_rendered})
+        save_manifest(manifest, output_dir)
+    return rendered
+
+def render_charts(names=None, fund_data=None, force=False, workers=None, output_dir=None):
+    """Render the stale charts among names (default: all) and return {name: seconds} for those rendered."""
+    output_dir = output_dir or graphs.current_dir
+    return render_decks({output_dir: fund_data}, names, force, workers)[output_dir]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the Agathos charts, skipping unchanged ones.")
+    parser.add_argument('--charts', nargs='+', metavar='NAME', help="Charts to consider (default: all)")
+    parser.add_argument('--force', action='store_true', help="Re-render even when nothing changed")
+    parser.add_argument('--workers', type=int, help="Number of worker processes (default: CPUs)")
+    parser.add_argument('--data', metavar='FILE', help="Fund data, .csv or .parquet (default: the Agathos CSV)")
+    parser.add_argument('--output-dir', metavar='DIR',
+                        help="Where to save the charts (default: next to graphs.py); "
+                             "a file with a Manager column gets a folder per manager here")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        if args.data:
+            data = load_fund_data(args.data)
+            output_dir = args.output_dir or graphs.current_dir
+            if 'Manager' in data.columns:
+                decks = {deck_dir(output_dir, manager): deck_data
+                         for manager, deck_data in split_by_manager(data).items()}
+            else:
+                decks = {output_dir: data}
+        else:
+            decks = {args.output_dir or graphs.current_dir: None}
+        rendered = render_decks(decks, args.charts, force=args.force, workers=args.workers)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    count = sum(len(deck_rendered) for deck_rendered in rendered.values())
+    skipped = len(rendered) * len(args.charts or graphs.CHARTS) - count
+    print(f"Rendered {count} chart(s) in {len(rendered)} deck(s), skipped {skipped} unchanged, "
+          f"in {time.perf_counter() - start:.1f} s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Headless batch runner for nightly multi-symbol predictions.
+
+Runs fetch -> features -> train -> forecast for every symbol across a process
+pool and writes the predictions and metrics to Parquet (or CSV) so the UI can
+read precomputed results. Symbols whose downloaded data and pipeline settings
+hash to the same value as in the previous run are skipped.
+
+Examples:
+    python batch_predict.py BTC-USD ETH-USD SOL-USD --output results
+    python batch_predict.py --symbols-file universe.txt --workers 4 --format csv
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+# Make the backend modules importable when run as a script
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Bump when the pipeline changes in a way that should invalidate stored results
+PIPELINE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+METRICS_NAME = 'metrics'
+PREDICTIONS_DIR = 'predictions'
+
+def input_hash(crypto_data, optimize):
+    """Hash the OHLCV input together with the pipeline settings."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(crypto_data, index=True).values.tobytes())
+    digest.update(f"v{PIPELINE_VERSION}|optimize={optimize}".encode())
+    return digest.hexdigest()
+
+def _predictions_frame(symbol, result):
+    prepared_data = result['prepared_data']
+    test_dates = prepared_data.index[-len(result['y_test']):]
+    test = pd.DataFrame({
+        'Date': test_dates,
+        'Kind': 'test',
+        'Actual': result['y_test'],
+        'Predicted': result['ensemble_pred']
+    })
+    future_dates = pd.date_range(start=prepared_data.index[-1] + pd.Timedelta(days=1), periods=len(result['fiscal_year_preds']), freq='D')
+    forecast = pd.DataFrame({
+        'Date': future_dates,
+        'Kind': 'forecast',
+        'Actual': float('nan'),
+        'Predicted': result['fiscal_year_preds']
+    })
+    predictions = pd.concat([test, forecast], ignore_index=True)
+    predictions.insert(0, 'Symbol', symbol)
+    return predictions
+
+def _metrics_frame(symbol, result, run_at):
+    rows = []
+    for name, model_result in result['model_results'].items():
+        rows.append({'Model': name, 'Weight': result['weights'][name], **model_result['metrics']})
+    rows.append({'Model': 'Ensemble', 'Weight': 1.0, **result['metrics']})
+    metrics = pd.DataFrame(rows)
+    metrics.insert(0, 'Symbol', symbol)
+    metrics['Best_Model'] = result['best_model_name']
+    metrics['Tomorrow_Pred'] = float(result['tomorrow_pred'])
+    metrics['Last_Close'] = float(result['crypto_data']['Close'].iloc[-1])
+    metrics['Last_Date'] = result['crypto_data'].index[-1]
+    metrics['Run_At'] = run_at
+    return metrics
+
+def process_symbol(symbol, previous_hash, optimize, n_jobs, run_at):
+    """Worker entry point: returns a status dict and, when rerun, the result frames."""
+    # Streamlit warns about a missing runtime for every cached call outside the app
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    from utils.trading_platform import get_crypto_data, run_pipeline
+
+    try:
+        crypto_data = get_crypto_data.__wrapped__(symbol)
+        digest = input_hash(crypto_data, optimize)
+        if digest == previous_hash:
+            return {'symbol': symbol, 'status': 'skipped', 'input_hash': digest}
+
+        # The training code reports progress with print(); keep the batch log readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_pipeline(symbol, crypto_data=crypto_data, optimize=optimize, n_jobs=n_jobs, use_cache=False)
+        return {
+            'symbol': symbol,
+            'status': 'updated',
+            'input_hash': digest,
+            'rows': len(crypto_data),
+            'predictions': _predictions_frame(symbol, result),
+            'metrics': _metrics_frame(symbol, result, run_at)
+        }
+    except Exception as e:
+        return {'symbol': symbol, 'status': 'failed', 'error': str(e)}
+
+def _write(df, path_base, fmt):
+    if fmt == 'parquet':
+        df.to_parquet(f"{path_base}.parquet", index=False)
+    else:
+        df.to_csv(f"{path_base}.csv", index=False)
+
+def _read(path_base, fmt):
+    path = f"{path_base}.{fmt}"
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path) if fmt == 'parquet' else pd.read_csv(path, parse_dates=['Last_Date', 'Run_At'])
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def load_results(output_dir, fmt='parquet'):
+    """Read the latest metrics table written by a batch run (None if there is none)."""
+    return _read(os.path.join(output_dir, METRICS_NAME), fmt)
+
+def load_predictions(output_dir, symbol, fmt='parquet'):
+    """Read the stored test-set and forecast predictions for one symbol."""
+    path = os.path.join(output_dir, PREDICTIONS_DIR, f"{symbol}.{fmt}")
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path) if fmt == 'parquet' else pd.read_csv(path, parse_dates=['Date'])
+
+def run_batch(symbols, output_dir, workers=None, optimize=True, fmt='parquet', force=False):
+    """Process every symbol in a process pool and merge the results into output_dir."""
+    if fmt == 'parquet':
+        # Fail before any training if no Parquet engine (pyarrow/fastparquet) is installed
+        pd.DataFrame({'Symbol': []}).to_parquet(io.BytesIO())
+    os.makedirs(os.path.join(output_dir, PREDICTIONS_DIR), exist_ok=True)
+    manifest = load_manifest(output_dir)
+    run_at = datetime.now().isoformat(timespec='seconds')
+
+    workers = workers or max(1, multiprocessing.cpu_count() - 1)
+    workers = min(workers, len(symbols))
+    # Share the CPUs between the symbol workers and each worker's model training
+    n_jobs = max(1, multiprocessing.cpu_count() // workers)
+
+    outcomes = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                process_symbol, symbol,
+                None if force else manifest.get(symbol, {}).get('input_hash'),
+                optimize, n_jobs, run_at
+            ): symbol
+            for symbol in symbols
+        }
+        for future in as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+            message = outcome.get('error', '') if outcome['status'] == 'failed' else ''
+            print(f"{outcome['symbol']}: {outcome['status']} {message}".rstrip())
+
+    updated = [o for o in outcomes if o['status'] == 'updated']
+    for outcome in updated:
+        _write(outcome['predictions'], os.path.join(output_dir, PREDICTIONS_DIR, outcome['symbol']), fmt)
+
+    # Keep the previous metrics for skipped symbols and replace the rerun ones
+    metrics = load_results(output_dir, fmt)
+    if updated:
+        new_metrics = pd.concat([o['metrics'] for o in updated], ignore_index=True)
+        if metrics is not None:
+            metrics = metrics[~metrics['Symbol'].isin(new_metrics['Symbol'])]
+            new_metrics = pd.concat([metrics, new_metrics], ignore_index=True)
+        _write(new_metrics, os.path.join(output_dir, METRICS_NAME), fmt)
+
+    for outcome in outcomes:
+        if outcome['status'] == 'updated':
+            manifest[outcome['symbol']] = {
+                'input_hash': outcome['input_hash'],
+                'rows': outcome['rows'],
+                'last_run': run_at
+            }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return outcomes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute predictions for many symbols without the UI.")
+    parser.add_argument('symbols', nargs='*', help="Yahoo Finance symbols, e.g. BTC-USD ETH-USD")
+    parser.add_argument('--symbols-file', help="Text file with one symbol per line")
+    parser.add_argument('--output', default='batch_results', help="Directory for predictions, metrics and the manifest")
+    parser.add_argument('--workers', type=int, help="Number of worker processes (default: CPUs - 1)")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet', help="Output file format")
+    parser.add_argument('--no-grid-search', action='store_true', help="Train with default hyperparameters")
+    parser.add_argument('--force', action='store_true', help="Rerun every symbol even if its inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        parser.error("no symbols given")
+
+    outcomes = run_batch(symbols, args.output, workers=args.workers, optimize=not args.no_grid_search,
+                         fmt=args.format, force=args.force)
+    counts = {status: sum(o['status'] == status for o in outcomes) for status in ('updated', 'skipped', 'failed')}
+    print(f"\nDone: {counts['updated']} updated, {counts['skipped']} skipped, {counts['failed']} failed")
+    return 1 if counts['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import os
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def make_ohlcv(n_rows, seed=42, start_price=100.0, tz=None):
+    """Build a synthetic daily OHLCV frame shaped like the yfinance download.
+
+    Prices follow a geometric random walk and the index ends today, so every
+    backend function (including the YTD statistics) works without a network.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.03, n_rows)
+    close = start_price * np.cumprod(1 + returns)
+    open_ = np.empty(n_rows)
+    open_[0] = start_price
+    open_[1:] = close[:-1]
+    spread = np.abs(rng.normal(0, 0.01, n_rows))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.lognormal(mean=16, sigma=0.5, size=n_rows)
+
+    index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=n_rows, freq='D', tz=tz, name='Date')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume
+    }, index=index)
+
+def save_fixture(df, name):
+    """Freeze a fixture to CSV so later runs use byte-identical inputs."""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    path = os.path.join(FIXTURE_DIR, f"{name}.csv")
+    df.to_csv(path)
+    return path
+
+def load_fixture(path, n_rows=None, tz=None):
+    """Load a frozen OHLCV fixture, optionally keeping only the last n_rows."""
+    df = pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+    if tz is not None:
+        df.index = df.index.tz_localize(tz) if df.index.tz is None else df.index.tz_convert(tz)
+    elif df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    if n_rows is not None:
+        df = df.tail(n_rows)
+    return df
@@ -0,0 +1,264 @@
+"""Offline benchmark harness for the Bitcoin backend.
+
+Times and memory-profiles the feature, training and forecasting functions on
+synthetic (or frozen) OHLCV fixtures, writes the results as JSON and can fail
+the run when a case regresses against a saved baseline. Cases with an
+absolute budget in TIME_LIMITS fail the run whenever they exceed it.
+
+Examples:
+    python run_benchmarks.py --sizes 1000 5000 50000
+    python run_benchmarks.py --cases prepare_features predict_fiscal_year --save-baseline
+    python run_benchmarks.py --compare results/baseline.json --threshold 1.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+BASELINE_PATH = os.path.join(RESULTS_DIR, 'baseline.json')
+
+# Make the backend modules importable the same way the frontend does
+sys.path.append(os.path.dirname(BENCH_DIR))
+
+import numpy as np
+import pandas as pd
+
+from fixtures import make_ohlcv, load_fixture, save_fixture
+from models.bitcoin_model import BitcoinPredictor
+from utils import trading_platform as tp
+
+DEFAULT_SIZES = [1000, 5000, 50000]
+# Median seconds a case may take at a row count; checked whenever that case and size run
+TIME_LIMITS = {
+    ('render_bitcoin_history', 5000): 1.0
+}
+
+def _uncached(func):
+    """Return the function underneath st.cache_data so every run does the work."""
+    return getattr(func, '__wrapped__', func)
+
+def _predictor_with(df):
+    predictor = BitcoinPredictor()
+    predictor.data = df
+    return predictor
+
+# Each case maps to (setup, run, max_repeat). setup(raw_df) builds the inputs
+# outside the timed region; run(inputs) is the code being measured.
+def _setup_raw(df):
+    return df.copy()
+
+def _setup_prepared(df):
+    return _uncached(tp.prepare_features)(df)
+
+def _setup_chart(df):
+    prepared = _setup_prepared(df)
+    n_test = max(1, len(prepared) // 5)
+    y_test = prepared['Close'].values[-n_test:]
+    return prepared, float(y_test[-1]), y_test, y_test * 1.01, np.full(365, y_test[-1])
+
+def _setup_predictor(df):
+    return df.tz_localize('UTC') if df.index.tz is None else df
+
+CASES = {
+    'prepare_features': (
+        _setup_raw,
+        lambda df: _uncached(tp.prepare_features)(df),
+        None
+    ),
+    'train_model_and_predict': (
+        _setup_prepared,
+        lambda df: _uncached(tp.train_model_and_predict)(df, optimize=False),
+        1
+    ),
+    'train_model_and_predict_grid_search': (
+        _setup_prepared,
+        lambda df: _uncached(tp.train_model_and_predict)(df, optimize=True),
+        1
+    ),
+    'predict_fiscal_year': (
+        _setup_prepared,
+        lambda df: tp.predict_fiscal_year(df, None, None, None),
+        None
+    ),
+    'render_bitcoin_history': (
+        _setup_chart,
+        lambda args: tp.render_bitcoin_history(*args),
+        None
+    ),
+    'BitcoinPredictor.prepare_features': (
+        _setup_predictor,
+        lambda df: BitcoinPredictor().prepare_features(df.copy()),
+        None
+    ),
+    'BitcoinPredictor.get_summary_stats': (
+        _setup_predictor,
+        lambda df: _predictor_with(df).get_summary_stats(),
+        None
+    ),
+    'BitcoinPredictor.get_predictions': (
+        _setup_predictor,
+        lambda df: _predictor_with(df).get_predictions(),
+        None
+    ),
+    'BitcoinPredictor.get_chart_data': (
+        _setup_predictor,
+        lambda df: _predictor_with(df).get_chart_data(),
+        None
+    ),
+    'BitcoinPredictor.get_performance_metrics': (
+        _setup_predictor,
+        lambda df: _predictor_with(df).get_performance_metrics(),
+        None
+    ),
+    'BitcoinPredictor.get_detailed_predictions': (
+        _setup_predictor,
+        lambda df: _predictor_with(df).get_detailed_predictions(),
+        None
+    ),
+}
+
+def run_case(name, raw_df, repeat):
+    """Time a case `repeat` times, then measure its peak traced allocation once."""
+    setup, run, max_repeat = CASES[name]
+    inputs = setup(raw_df)
+    if max_repeat is not None:
+        repeat = min(repeat, max_repeat)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(inputs)
+        timings.append(time.perf_counter() - start)
+
+    # tracemalloc slows execution down, so memory is profiled in a separate run.
+    # It only sees this process: joblib workers used by the model training are not traced.
+    tracemalloc.start()
+    run(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'case': name,
+        'rows': len(raw_df),
+        'runs': repeat,
+        'time_min_s': min(timings),
+        'time_median_s': statistics.median(timings),
+        'peak_mem_mb': peak / 1024 ** 2
+    }
+
+def _versions():
+    versions = {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__}
+    for module in ('sklearn', 'xgboost', 'ta'):
+        try:
+            versions[module] = __import__(module).__version__
+        except Exception:
+            versions[module] = None
+    return versions
+
+def run_benchmarks(sizes, cases, repeat=3, fixture=None, seed=42, freeze=False):
+    results = []
+    for n_rows in sizes:
+        raw_df = load_fixture(fixture, n_rows) if fixture else make_ohlcv(n_rows, seed=seed)
+        if freeze and not fixture:
+            print(f"Froze fixture to {save_fixture(raw_df, f'ohlcv_{n_rows}_seed{seed}')}")
+        for name in cases:
+            print(f"Running {name} on {len(raw_df):,} rows...")
+            result = run_case(name, raw_df, repeat)
+            print(f"  {result['time_min_s']:.4f}s (min of {result['runs']}), peak {result['peak_mem_mb']:.1f} MB")
+            results.append(result)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'machine': platform.platform(),
+        'processor': platform.processor(),
+        'versions': _versions(),
+        'fixture': fixture or f'synthetic(seed={seed})',
+        'results': results
+    }
+
+def compare(current, baseline, threshold):
+    """Return the cases whose time or memory grew by more than `threshold`x."""
+    base = {(r['case'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        ref = base.get((result['case'], result['rows']))
+        if ref is None:
+            continue
+        for key in ('time_min_s', 'peak_mem_mb'):
+            if ref[key] > 0 and result[key] > ref[key] * threshold:
+                regressions.append({
+                    'case': result['case'],
+                    'rows': result['rows'],
+                    'metric': key,
+                    'baseline': ref[key],
+                    'current': result[key],
+                    'ratio': result[key] / ref[key]
+                })
+    return regressions
+
+def check_limits(current):
+    """Return the cases whose median time is over their TIME_LIMITS budget."""
+    return [
+        {'case': r['case'], 'rows': r['rows'], 'limit': TIME_LIMITS[r['case'], r['rows']], 'current': r['time_median_s']}
+        for r in current['results']
+        if (r['case'], r['rows']) in TIME_LIMITS and r['time_median_s'] > TIME_LIMITS[r['case'], r['rows']]
+    ]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Bitcoin backend on offline OHLCV fixtures.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts to benchmark")
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES), metavar='CASE',
+                        help="Cases to run (default: all). Choices: " + ", ".join(CASES))
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case (training cases run once)")
+    parser.add_argument('--fixture', help="Frozen OHLCV CSV to use instead of synthetic data")
+    parser.add_argument('--seed', type=int, default=42, help="Seed for the synthetic fixture")
+    parser.add_argument('--freeze', action='store_true', help="Save the synthetic fixtures to data/ for later --fixture runs")
+    parser.add_argument('--output', help="Where to write the JSON results (default: results/<timestamp>.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Also store the results as results/baseline.json")
+    parser.add_argument('--compare', help="Baseline JSON to check the results against")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Allowed slowdown/memory growth ratio before the check fails")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.cases, repeat=args.repeat, fixture=args.fixture,
+                            seed=args.seed, freeze=args.freeze)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated at {BASELINE_PATH}")
+
+    status = 0
+    over_limit = check_limits(report)
+    if over_limit:
+        print(f"\n{len(over_limit)} case(s) over their time limit:")
+        for r in over_limit:
+            print(f"  {r['case']} [{r['rows']:,} rows]: median {r['current']:.4f}s > {r['limit']:.4f}s")
+        status = 1
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x:")
+            for r in regressions:
+                print(f"  {r['case']} [{r['rows']:,} rows] {r['metric']}: "
+                      f"{r['baseline']:.4f} -> {r['current']:.4f} ({r['ratio']:.2f}x)")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.2f}x against {args.compare}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import numpy as np
+
+def _as_float(x):
+    """Turn a date index (or any numeric sequence) into float64 positions."""
+    if hasattr(x, 'asi8'):
+        return x.asi8.astype(np.float64)
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+def _bucket_edges(n, n_buckets):
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+def lttb_indices(x, y, n_out):
+    """Return the indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    LTTB keeps the first and last points and, for every bucket in between,
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket. It preserves the visual shape of a line
+    far better than taking every n-th point. NaN values are never selected.
+    """
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+
+    xv, yv = x[valid], y[valid]
+    # The first and last points are kept; the rest is split into n_out - 2 buckets
+    edges = 1 + _bucket_edges(n - 2, n_out - 2)
+    sums_x = np.add.reduceat(xv, edges[:-1])
+    sums_y = np.add.reduceat(yv, edges[:-1])
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, xv[-1])
+    avg_y = np.append(sums_y / counts, yv[-1])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((xv[a] - avg_x[i + 1]) * (yv[start:stop] - yv[a])
+                      - (xv[a] - xv[start:stop]) * (avg_y[i + 1] - yv[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return valid[kept]
+
+def minmax_indices(y, n_buckets):
+    """Return the sorted indices of the minimum and maximum of every bucket.
+
+    Cheaper than LTTB and keeps every spike, which suits bar-like series such
+    as volume where the peaks are what the eye reads.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.flatnonzero(~np.isnan(y))
+
+    edges = _bucket_edges(n, n_buckets)
+    filled_min = np.where(np.isnan(y), np.inf, y)
+    filled_max = np.where(np.isnan(y), -np.inf, y)
+    indices = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        lo = start + int(np.argmin(filled_min[start:stop]))
+        hi = start + int(np.argmax(filled_max[start:stop]))
+        indices.extend((lo, hi) if lo <= hi else (hi, lo))
+    indices = np.unique(np.asarray(indices, dtype=np.int64))
+    return indices[~np.isnan(y[indices])]
+
+def max_indices(y, n_buckets):
+    """Return the index of the maximum of every bucket.
+
+    This is what a dense bar chart shows once several bars share a pixel
+    column, so filling up to these points looks the same as drawing every bar.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_buckets >= n:
+        return np.flatnonzero(~np.isnan(y))
+
+    edges = _bucket_edges(n, n_buckets)
+    filled = np.where(np.isnan(y), -np.inf, y)
+    indices = np.fromiter((start + int(np.argmax(filled[start:stop])) for start, stop in zip(edges[:-1], edges[1:])),
+                          dtype=np.int64, count=n_buckets)
+    return indices[~np.isnan(y[indices])]
+
+def downsample(series, n_out, method='lttb', keep_extrema=False):
+    """Downsample a pandas Series with a date (or numeric) index to about n_out points.
+
+    keep_extrema also keeps the global minimum and maximum, so the reduced
+    series reports the same high and low as the full one.
+    """
+    if method == 'lttb':
+        indices = lttb_indices(series.index, series.values, n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(series.values, max(1, n_out // 2))
+    elif method == 'max':
+        indices = max_indices(series.values, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    if keep_extrema and series.notna().any():
+        values = series.values.astype(np.float64)
+        indices = np.union1d(indices, [np.nanargmin(values), np.nanargmax(values)])
+    return series.iloc[indices]
@@ -1,8 +1,12 @@
 import yfinance as yh
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
 from datetime import datetime, timedelta
 from sklearn.preprocessing import StandardScaler, RobustScaler
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, ExtraTreesRegressor, VotingRegressor
@@ -18,12 +22,16 @@ from sklearn.feature_selection import SelectKBest, f_regression
 import ta
 import warnings
 import sys
+import io
+from concurrent.futures import ThreadPoolExecutor
 from joblib import Parallel, delayed
 import multiprocessing
 from functools import lru_cache
 import streamlit as st
 import requests
 
+from .downsampling import downsample
+
 warnings.filterwarnings('ignore')
 
 @st.cache_data(ttl=3600)
@@ -257,11 +265,11 @@ def predict_fiscal_year(df, model, scaler, features):
     # Remove the initial last_price to return only future predictions
     return future_prices[1:]
 
-def train_single_model(model_name, model, X_train, y_train, X_test, y_test, df):
+def train_single_model(model_name, model, X_train, y_train, X_test, y_test, df, optimize=True):
     print(f"\nTraining {model_name}...")
     
-    # Optimize hyperparameters
-    optimized_model = optimize_hyperparameters(model, X_train, y_train)
+    # Optimize hyperparameters (skipped when optimize=False to train with the default parameters)
+    optimized_model = optimize_hyperparameters(model, X_train, y_train) if optimize else model
     
     # Train model
     optimized_model.fit(X_train, y_train)
@@ -300,7 +308,7 @@ def train_single_model(model_name, model, X_train, y_train, X_test, y_test, df):
     }
 
 @st.cache_data
-def train_model_and_predict(df):
+def train_model_and_predict(df, optimize=True, n_jobs=None):
     # Prepare features
     features = [col for col in df.columns if col not in ['Open', 'High', 'Low', 'Close', 'Volume']]
     target = 'Close'
@@ -352,10 +360,11 @@ def train_model_and_predict(df):
     }
     
     # Train models in parallel
-    n_jobs = max(1, multiprocessing.cpu_count() - 1)  # Leave one CPU free
+    if n_jobs is None:
+        n_jobs = max(1, multiprocessing.cpu_count() - 1)  # Leave one CPU free
     model_results = Parallel(n_jobs=n_jobs)(
         delayed(train_single_model)(
-            name, model, X_train_selected, y_train, X_test_selected, y_test, df
+            name, model, X_train_selected, y_train, X_test_selected, y_test, df, optimize
         ) for name, model in models.items()
     )
     
@@ -417,35 +426,42 @@ def train_model_and_predict(df):
     
     return model_results, scaler, selected_features, tomorrow_pred, y_test, ensemble_pred, ensemble_metrics
 
-def plot_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds):
-    # Set style and parameters for professional look
-    plt.style.use('default')  # Use default style as base
-    sns.set_theme(style="whitegrid")  # Apply seaborn theme
-    
-    # Set custom parameters for professional look
-    plt.rcParams.update({
-        'figure.dpi': 300,
-        'savefig.dpi': 300,
-        'font.family': 'sans-serif',
-        'font.sans-serif': ['Arial', 'DejaVu Sans'],
-        'axes.linewidth': 1.5,
-        'axes.labelsize': 12,
-        'axes.titlesize': 14,
-        'xtick.labelsize': 10,
-        'ytick.labelsize': 10,
-        'legend.fontsize': 10,
-        'grid.linewidth': 0.8,
-        'grid.alpha': 0.3,
-        'figure.facecolor': '#f8f9fa',
-        'axes.facecolor': '#ffffff',
-        'axes.grid': True,
-        'grid.color': '#cccccc',
-        'grid.linestyle': '--',
-        'axes.edgecolor': '#333333'
-    })
-    
-    # Create figure with subplots
-    fig = plt.figure(figsize=(20, 15))
+# Professional look shared by the interactive plot and the fast renderer
+CHART_RC = {
+    'figure.dpi': 300,
+    'savefig.dpi': 300,
+    'font.family': 'sans-serif',
+    'font.sans-serif': ['Arial', 'DejaVu Sans'],
+    'axes.linewidth': 1.5,
+    'axes.labelsize': 12,
+    'axes.titlesize': 14,
+    'xtick.labelsize': 10,
+    'ytick.labelsize': 10,
+    'legend.fontsize': 10,
+    'grid.linewidth': 0.8,
+    'grid.alpha': 0.3,
+    'figure.facecolor': '#f8f9fa',
+    'axes.facecolor': '#ffffff',
+    'axes.grid': True,
+    'grid.color': '#cccccc',
+    'grid.linestyle': '--',
+    'axes.edgecolor': '#333333'
+}
+
+CHART_FIGSIZE = (20, 15)
+# Screen resolution of render_bitcoin_history: 1200 x 900 pixels at CHART_FIGSIZE
+RENDER_DPI = 60
+
+# Renders run one at a time: Matplotlib's rcParams and font cache are process-global
+_render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart-render')
+
+def _draw_bitcoin_history(fig, df, tomorrow_pred, y_test, y_pred, fiscal_year_preds, max_points=None):
+    """Draw the four history panels on fig.
+
+    With max_points set, every line is downsampled to about that many points
+    per full-width panel (LTTB) and volume is drawn as a filled step of the
+    per-pixel maxima instead of one bar patch per day.
+    """
     gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.2)
     
     # Define professional color scheme
@@ -457,13 +473,21 @@ def plot_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds):
         'volume': '#9467bd',      # Purple
         'volatility': '#e377c2'   # Pink
     }
+
+    def thin(series, n_out, method='lttb'):
+        return series if max_points is None else downsample(series, n_out, method)
+
+    full_width = max_points
+    half_width = None if max_points is None else max(3, max_points // 2)
     
     # Main price plot
     ax1 = fig.add_subplot(gs[0, :])
-    ax1.plot(df.index, df['Close'], label='Historical Price', color=colors['historical'], 
+    close = thin(df['Close'], full_width)
+    ax1.plot(close.index, close.values, label='Historical Price', color=colors['historical'], 
              linewidth=2, alpha=0.9)
     test_dates = df.index[-len(y_test):]
-    ax1.plot(test_dates, y_pred, label='Test Predictions', color=colors['prediction'], 
+    test_pred = thin(pd.Series(np.asarray(y_pred), index=test_dates), full_width)
+    ax1.plot(test_pred.index, test_pred.values, label='Test Predictions', color=colors['prediction'], 
              linewidth=2, alpha=0.9)
     tomorrow_date = df.index[-1] + timedelta(days=1)
     ax1.scatter(tomorrow_date, tomorrow_pred, color=colors['tomorrow'], s=150, 
@@ -472,14 +496,14 @@ def plot_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds):
     ax1.set_title('Bitcoin Price History and Predictions', fontsize=16, pad=15, fontweight='bold')
     ax1.set_ylabel('Price per Bitcoin (USD)', fontsize=12, fontweight='bold')
     ax1.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
-    ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    ax1.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
     ax1.xaxis.set_major_locator(YearLocator())
     ax1.xaxis.set_major_formatter(DateFormatter('%Y'))
     plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
     ax1.legend(loc='upper left', frameon=True, fancybox=True, framealpha=0.9, 
               edgecolor='black', shadow=True)
     
-    # Last year and future predictions
+    # Last year and future predictions (at most 365 points each, never downsampled)
     ax2 = fig.add_subplot(gs[1, :])
     last_year = df.iloc[-365:]
     last_year_dates = last_year.index
@@ -498,7 +522,7 @@ def plot_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds):
     ax2.set_title('Bitcoin Price - Last Fiscal Year and Future Prediction', fontsize=16, pad=15, fontweight='bold')
     ax2.set_ylabel('Price per Bitcoin (USD)', fontsize=12, fontweight='bold')
     ax2.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
-    ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    ax2.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
     ax2.xaxis.set_major_locator(MonthLocator(interval=2))
     ax2.xaxis.set_major_formatter(DateFormatter('%Y-%m'))
     plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
@@ -507,17 +531,23 @@ def plot_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds):
     
     # Volume plot
     ax3 = fig.add_subplot(gs[2, 0])
-    ax3.bar(df.index, df['Volume'], color=colors['volume'], alpha=0.7, edgecolor='black', linewidth=0.5)
+    if max_points is None:
+        ax3.bar(df.index, df['Volume'], color=colors['volume'], alpha=0.7, edgecolor='black', linewidth=0.5)
+    else:
+        volume = thin(df['Volume'], half_width, method='max')
+        ax3.fill_between(volume.index, volume.values, step='mid', color=colors['volume'], alpha=0.7, linewidth=0)
+        ax3.step(volume.index, volume.values, where='mid', color='black', linewidth=0.5)
+        ax3.set_ylim(bottom=0)
     ax3.set_title('Trading Volume', fontsize=16, pad=15, fontweight='bold')
     ax3.set_ylabel('Volume', fontsize=12, fontweight='bold')
     ax3.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
-    ax3.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f}'))
+    ax3.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{x:,.0f}'))
     plt.setp(ax3.get_xticklabels(), rotation=45, ha='right')
     
     # Volatility plot
     ax4 = fig.add_subplot(gs[2, 1])
-    volatility = df['Returns'].rolling(window=30).std() * np.sqrt(252) * 100
-    ax4.plot(df.index, volatility, color=colors['volatility'], linewidth=2)
+    volatility = thin(df['Returns'].rolling(window=30).std() * np.sqrt(252) * 100, half_width)
+    ax4.plot(volatility.index, volatility.values, color=colors['volatility'], linewidth=2)
     ax4.set_title('30-Day Rolling Volatility (Annualized)', fontsize=16, pad=15, fontweight='bold')
     ax4.set_ylabel('Volatility (%)', fontsize=12, fontweight='bold')
     ax4.grid(True, alpha=0.3, linestyle='--', linewidth=0.8)
@@ -529,17 +559,65 @@ def plot_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds):
     
     # Add a subtle background color to the figure
     fig.patch.set_facecolor('#f8f9fa')
+
+@lru_cache(maxsize=8)
+def _render_style(dpi):
+    # Built once per resolution instead of on every render
+    return {**sns.axes_style('whitegrid'), **sns.plotting_context('notebook'), **CHART_RC,
+            'figure.dpi': dpi, 'savefig.dpi': dpi}
+
+def render_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds, dpi=RENDER_DPI, fmt='png'):
+    """Render the history chart to image bytes at screen resolution.
+
+    Uses an Agg canvas directly (no pyplot state), so it is safe to call from a
+    worker thread. Series are downsampled to the pixel width of each panel.
+    The default canvas keeps the layout in inches and only lowers the pixel
+    density, so 5,000 rows render well under a second (see run_benchmarks.py).
+    """
+    with matplotlib.rc_context(_render_style(dpi)):
+        fig = Figure(figsize=CHART_FIGSIZE, dpi=dpi)
+        FigureCanvasAgg(fig)
+        _draw_bitcoin_history(fig, df, tomorrow_pred, y_test, y_pred, fiscal_year_preds,
+                              max_points=int(CHART_FIGSIZE[0] * dpi))
+        buffer = io.BytesIO()
+        # Fast zlib level: the PNG is a transient screen image, not an archive
+        save_kwargs = {'pil_kwargs': {'compress_level': 1}} if fmt == 'png' else {}
+        fig.savefig(buffer, format=fmt, dpi=dpi, **save_kwargs)
+    return buffer.getvalue()
+
+def render_bitcoin_history_async(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds, dpi=RENDER_DPI, fmt='png'):
+    """Start render_bitcoin_history on the chart worker thread and return its Future."""
+    return _render_executor.submit(render_bitcoin_history, df, tomorrow_pred, y_test, y_pred,
+                                   fiscal_year_preds, dpi, fmt)
+
+def plot_bitcoin_history(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds, fast=False,
+                         output='bitcoin_prediction.png'):
+    if fast:
+        # Screen-resolution render in the worker thread, written straight to disk
+        image = render_bitcoin_history_async(df, tomorrow_pred, y_test, y_pred, fiscal_year_preds).result()
+        with open(output, 'wb') as f:
+            f.write(image)
+        print(f"Plot has been saved as '{output}'")
+        return output
+
+    # Set style and parameters for professional look
+    plt.style.use('default')  # Use default style as base
+    sns.set_theme(style="whitegrid")  # Apply seaborn theme
     
-    # Ensure everything fits with proper spacing
-    fig.tight_layout(rect=[0, 0.03, 1, 0.98])
+    # Set custom parameters for professional look
+    plt.rcParams.update(CHART_RC)
+    
+    # Create figure with subplots
+    fig = plt.figure(figsize=CHART_FIGSIZE)
+    _draw_bitcoin_history(fig, df, tomorrow_pred, y_test, y_pred, fiscal_year_preds)
     
     try:
         plt.show()
     except Exception as e:
         print(f"Warning: Could not display plot: {str(e)}")
         # Save the plot instead
-        plt.savefig('bitcoin_prediction.png', dpi=300, bbox_inches='tight')
-        print("Plot has been saved as 'bitcoin_prediction.png'")
+        plt.savefig(output, dpi=300, bbox_inches='tight')
+        print(f"Plot has been saved as '{output}'")
 
 def get_live_btc_price():
     """Fetch the current Bitcoin price in USD from CoinGecko (real-time)."""
@@ -557,6 +635,43 @@ def get_live_btc_price():
         print(f"Error fetching live BTC price from CoinGecko: {e}")
         return None
 
+def run_pipeline(symbol="BTC-USD", crypto_data=None, optimize=True, n_jobs=None, use_cache=True):
+    """Run fetch -> features -> train -> forecast for one symbol without printing charts.
+
+    Pass crypto_data to skip the download, and use_cache=False to bypass the
+    Streamlit caches when running outside the app (e.g. in batch workers).
+    """
+    def resolve(func):
+        return func if use_cache else getattr(func, '__wrapped__', func)
+
+    if crypto_data is None:
+        crypto_data = resolve(get_crypto_data)(symbol)
+    prepared_data = resolve(prepare_features)(crypto_data)
+    model_results, scaler, features, tomorrow_pred, y_test, ensemble_pred, metrics = resolve(train_model_and_predict)(
+        prepared_data, optimize=optimize, n_jobs=n_jobs
+    )
+
+    r2_scores = {name: results['metrics']['R2'] for name, results in model_results.items()}
+    weights = {name: score/sum(r2_scores.values()) for name, score in r2_scores.items()}
+    best_model_name = max(weights.items(), key=lambda x: x[1])[0]
+    fiscal_year_preds = predict_fiscal_year(prepared_data, model_results[best_model_name]['model'], scaler, features)
+
+    return {
+        'symbol': symbol,
+        'crypto_data': crypto_data,
+        'prepared_data': prepared_data,
+        'model_results': model_results,
+        'scaler': scaler,
+        'features': features,
+        'tomorrow_pred': tomorrow_pred,
+        'y_test': y_test,
+        'ensemble_pred': ensemble_pred,
+        'metrics': metrics,
+        'weights': weights,
+        'best_model_name': best_model_name,
+        'fiscal_year_preds': fiscal_year_preds
+    }
+
 def main(symbol="BTC-USD"):
     try:
         # Get crypto data
@@ -574,32 +689,29 @@ def main(symbol="BTC-USD"):
         print(f"24h Volume: {crypto_data['Volume'].iloc[-1]:,.0f}")
         print(f"Total Data Points: {len(crypto_data)}")
         
-        # Prepare features for the model
-        prepared_data = prepare_features(crypto_data)
+        # Prepare features, train models and forecast the next year
+        result = run_pipeline(symbol, crypto_data=crypto_data)
+        prepared_data = result['prepared_data']
+        tomorrow_pred = result['tomorrow_pred']
+        metrics = result['metrics']
         print(f"Data Points After Feature Preparation: {len(prepared_data)}")
         
-        # Train models and get predictions
-        model_results, scaler, features, tomorrow_pred, y_test, ensemble_pred, metrics = train_model_and_predict(prepared_data)
-        
         print("\nModel Weights in Ensemble:")
-        r2_scores = {name: results['metrics']['R2'] for name, results in model_results.items()}
-        weights = {name: score/sum(r2_scores.values()) for name, score in r2_scores.items()}
-        for name, weight in sorted(weights.items(), key=lambda x: x[1], reverse=True):
+        for name, weight in sorted(result['weights'].items(), key=lambda x: x[1], reverse=True):
             print(f"{name}: {weight:.2%}")
         
         print(f"\nTomorrow's Predicted Price: ${tomorrow_pred:,.2f}")
         print(f"Prediction Range: ${tomorrow_pred * (1 - 2*metrics['RMSE']/tomorrow_pred):,.2f} - ${tomorrow_pred * (1 + 2*metrics['RMSE']/tomorrow_pred):,.2f}")
         print(f"Predicted Market Value: ${tomorrow_pred * circulating_supply:,.2f}")
         
-        best_model_name = max(weights.items(), key=lambda x: x[1])[0]
-        fiscal_year_preds = predict_fiscal_year(prepared_data, model_results[best_model_name]['model'], scaler, features)
-        plot_bitcoin_history(prepared_data, tomorrow_pred, y_test, ensemble_pred, fiscal_year_preds)
+        plot_bitcoin_history(prepared_data, tomorrow_pred, result['y_test'], result['ensemble_pred'], result['fiscal_year_preds'])
         
     except Exception as e:
         print(f"An error occurred: {str(e)}")
         raise
 
 if __name__ == "__main__":
+    # Run from backend/ as a module: python -m utils.trading_platform [SYMBOL]
     symbol = sys.argv[1] if len(sys.argv) > 1 else "BTC-USD"
     main(symbol) 
     
\ No newline at end of file
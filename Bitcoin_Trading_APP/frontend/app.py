@@ -3,9 +3,6 @@ import plotly.graph_objects as go
 import sys
 import os
 import pandas as pd
-import base64
-from PIL import Image
-import io
 import re
 
 # Configure Streamlit page
@@ -22,37 +19,12 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from backend.Trading_Platoform_Bitcoin import get_crypto_data, prepare_features, train_model_and_predict, predict_fiscal_year, get_live_btc_price
+from backend.utils.downsampling import downsample
+from assets import logo_src
 
-def get_image_as_base64(image_path):
-    """Convert a PNG image to base64 string, fallback to placeholder if missing."""
-    if os.path.exists(image_path):
-        try:
-            img = Image.open(image_path)
-            # Resize large images to prevent performance issues
-            if img.width > 500 or img.height > 500:
-                img.thumbnail((500, 500), Image.Resampling.LANCZOS)
-            buffered = io.BytesIO()
-            # Convert to RGB if necessary (for RGBA images)
-            if img.mode in ('RGBA', 'LA'):
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            img.save(buffered, format="PNG", optimize=True)
-            return base64.b64encode(buffered.getvalue()).decode()
-        except Exception as e:
-            print(f"Error converting image {image_path} to base64: {e}")
-    
-    # Fallback to placeholder
-    placeholder_path = os.path.join(os.path.dirname(__file__), "images", "placeholder.png")
-    if os.path.exists(placeholder_path):
-        try:
-            img = Image.open(placeholder_path)
-            buffered = io.BytesIO()
-            img.save(buffered, format="PNG")
-            return base64.b64encode(buffered.getvalue()).decode()
-        except Exception as e:
-            print(f"Error converting placeholder image to base64: {e}")
-    return ""
+# Points per chart trace sent to the browser (roughly the plot width in pixels)
+CHART_POINTS_DESKTOP = 1500
+CHART_POINTS_MOBILE = 500
 
 APP_DIR = os.path.dirname(__file__)
 crypto_options = {
@@ -224,6 +196,44 @@ def extract_short_symbol(symbol):
     match = re.match(r"([A-Za-z]+)", symbol)
     return match.group(1) if match else symbol
 
+def chart_point_budget():
+    """Pick the number of points per trace from the client's user agent."""
+    user_agent = st.context.headers.get('User-Agent', '') if hasattr(st, 'context') else ''
+    return CHART_POINTS_MOBILE if re.search(r'Mobi|Android|iPhone|iPad', user_agent) else CHART_POINTS_DESKTOP
+
+def data_fingerprint(data):
+    """Row count plus a hash of the last row, so a new or updated latest bar gives a new value."""
+    return len(data), int(pd.util.hash_pandas_object(data.tail(1)).iloc[0])
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def get_chart_series(symbol, column, n_days, zoom, n_points, fingerprint, _data):
+    """Return one chart trace reduced to n_points with LTTB, keeping its high and low.
+
+    The data frame itself is not hashed: symbol and its data_fingerprint
+    identify it, so the cache is keyed by symbol, data, range, zoom window and
+    width.
+    """
+    series = _data[column]
+    if n_days is not None:
+        series = series.tail(n_days)
+    if zoom is not None:
+        series = series.loc[zoom[0]:zoom[1]]
+    return downsample(series.dropna(), n_points, keep_extrema=True)
+
+def chart_zoom(data, n_days, n_points, key):
+    """Date slider for zooming into a range at full resolution.
+
+    Returns the selected (start, end) window, or None when the whole range is
+    shown or it already fits in n_points.
+    """
+    index = data.index[-n_days:] if n_days is not None else data.index
+    if len(index) <= n_points:
+        return None
+    start, end = index[0].to_pydatetime(), index[-1].to_pydatetime()
+    window = st.slider("Zoom", min_value=start, max_value=end, value=(start, end),
+                       format="YYYY-MM-DD", key=key)
+    return None if window == (start, end) else (pd.Timestamp(window[0]), pd.Timestamp(window[1]))
+
 def show_dashboard():
     # Apply global black theme styling
     st.markdown("""
@@ -493,12 +503,11 @@ def show_dashboard():
             price_change = ((data['Close'].iloc[-1] - data['Close'].iloc[-2]) / data['Close'].iloc[-2]) * 100 if len(data) > 1 else 0
             market_cap = price * 1e9  # Placeholder, you can use your supply dict if you want
             logo_path = crypto_info['logo'] if os.path.exists(crypto_info['logo']) else os.path.join(APP_DIR, "images", "placeholder.png")
-            logo_b64 = get_image_as_base64(logo_path)
             short_symbol = extract_short_symbol(crypto_info['symbol'])
             crypto_data_list.append({
                 'name': crypto_name,
                 'symbol': short_symbol,  # Use cleaned symbol for display
-                'logo_b64': logo_b64,
+                'logo': logo_path,
                 'price': price,
                 'price_change': price_change,
                 'market_cap': market_cap,
@@ -550,7 +559,7 @@ def show_dashboard():
             # Centered, round logo and name
             st.markdown(f'''
             <div style="text-align: center;">
-                <img src="data:image/png;base64,{mover['logo_b64']}" 
+                <img src="{logo_src(mover['logo'], 'mover')}" 
                      style="width:64px;height:64px;border-radius:50%;object-fit:cover;display:block;margin:0 auto;box-shadow:0 0 10px #0052ff33;">
                 <div style="color:#fff;font-size:0.95rem;font-weight:600;margin-top:8px;">{mover['name']}</div>
             </div>
@@ -664,7 +673,7 @@ def show_dashboard():
             with cols[0]:
                 st.markdown(f"""
                 <div style='text-align:center;'>
-                    <img src='data:image/png;base64,{c['logo_b64']}' 
+                    <img src='{logo_src(c['logo'], 'row')}' 
                          style='width:45px;height:45px;border-radius:50%;
                                 object-fit: contain;
                                 box-shadow: 0 0 10px rgba(0, 82, 255, 0.2);'>
@@ -894,10 +903,10 @@ def show_details():
 
     # Only render details after loading is done
     # Enhanced crypto header with logo
-    logo_b64 = get_image_as_base64(crypto_info['logo'])
+    header_logo = logo_src(crypto_info['logo'], 'header')
     st.markdown(f"""
     <div style='text-align: center; margin-bottom: 40px;'>
-        <img src='data:image/png;base64,{logo_b64}' 
+        <img src='{header_logo}' 
              class='crypto-logo-mobile'
              style='width: 120px; height: 120px; border-radius: 50%; 
                     object-fit: contain;
@@ -966,11 +975,14 @@ def show_details():
     st.markdown(f'<h2 class="section-header">{selected_crypto} Historical Price Chart</h2>', unsafe_allow_html=True)
     price_range = st.selectbox("Price Chart Time Range", list(price_ranges.keys()), index=4, key="price_range")
     n_price = price_ranges[price_range]
-    price_data = prepared_data.tail(n_price) if n_price is not None else prepared_data
+    n_points = chart_point_budget()
+    fingerprint = data_fingerprint(prepared_data)
+    price_zoom = chart_zoom(prepared_data, n_price, n_points, key=f"price_zoom_{price_range}")
+    price_series = get_chart_series(crypto_info['symbol'], 'Close', n_price, price_zoom, n_points, fingerprint, prepared_data)
     fig_hist = go.Figure()
     fig_hist.add_trace(go.Scatter(
-        x=price_data.index,
-        y=price_data['Close'],
+        x=price_series.index,
+        y=price_series.values,
         mode='lines',
         name='Historical Price',
         line=dict(color='#0052ff', width=2)
@@ -1051,10 +1063,12 @@ def show_details():
             st.write(rsi_data['RSI'].head(20))
             st.write(rsi_data['RSI'].tail(20))
         elif rsi_data['RSI'].notna().sum() > 10:
+            rsi_zoom = chart_zoom(prepared_data, n_rsi, n_points, key=f"rsi_zoom_{rsi_range}")
+            rsi_series = get_chart_series(crypto_info['symbol'], 'RSI', n_rsi, rsi_zoom, n_points, fingerprint, prepared_data)
             fig_rsi = go.Figure()
             fig_rsi.add_trace(go.Scatter(
-                x=rsi_data.index,
-                y=rsi_data['RSI'],
+                x=rsi_series.index,
+                y=rsi_series.values,
                 mode='lines',
                 line=dict(color='#9f7aea', width=2),
                 name='RSI'
@@ -1095,17 +1109,20 @@ def show_details():
             st.write(macd_data[['MACD', 'MACD_signal']].head(20))
             st.write(macd_data[['MACD', 'MACD_signal']].tail(20))
         elif macd_data['MACD'].notna().sum() > 10 and macd_data['MACD_signal'].notna().sum() > 10:
+            macd_zoom = chart_zoom(prepared_data, n_macd, n_points, key=f"macd_zoom_{macd_range}")
+            macd_series = get_chart_series(crypto_info['symbol'], 'MACD', n_macd, macd_zoom, n_points, fingerprint, prepared_data)
+            signal_series = get_chart_series(crypto_info['symbol'], 'MACD_signal', n_macd, macd_zoom, n_points, fingerprint, prepared_data)
             fig_macd = go.Figure()
             fig_macd.add_trace(go.Scatter(
-                x=macd_data.index,
-                y=macd_data['MACD'],
+                x=macd_series.index,
+                y=macd_series.values,
                 mode='lines',
                 line=dict(color='#0052ff', width=2),
                 name='MACD'
             ))
             fig_macd.add_trace(go.Scatter(
-                x=macd_data.index,
-                y=macd_data['MACD_signal'],
+                x=signal_series.index,
+                y=signal_series.values,
                 mode='lines',
                 line=dict(color='#ea3943', width=2),
                 name='Signal'
@@ -0,0 +1,102 @@
+"""Pre-resized logo assets for the dashboard and details pages.
+
+Logos are resized once to the sizes they are displayed at (twice the CSS size
+for high-density screens), saved as optimized WebP under static/logos and
+served by Streamlit's static file server. When static serving is disabled the
+pre-encoded base64 data URI is used instead; either way no image is decoded or
+re-encoded while a page renders.
+
+Run this file to rebuild every logo up front:
+    python assets.py [--force]
+"""
+import argparse
+import base64
+import os
+from functools import lru_cache
+
+from PIL import Image
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(APP_DIR, "images")
+STATIC_LOGO_DIR = os.path.join(APP_DIR, "static", "logos")
+PLACEHOLDER_PATH = os.path.join(IMAGES_DIR, "placeholder.png")
+
+# CSS pixel size of each place a logo is shown
+LOGO_SIZES = {
+    'row': 45,
+    'mover': 64,
+    'header': 120
+}
+PIXEL_RATIO = 2
+WEBP_QUALITY = 90
+
+def _asset_path(source_path, size):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    # Some logo file names contain spaces, brackets or dots; keep URLs simple
+    stem = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in stem)
+    return os.path.join(STATIC_LOGO_DIR, f"{stem}-{size}.webp")
+
+def build_logo(source_path, size, force=False):
+    """Resize one logo to size x size CSS pixels and save it as WebP; returns its path."""
+    output_path = _asset_path(source_path, size)
+    if not force and os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(source_path):
+        return output_path
+
+    pixels = size * PIXEL_RATIO
+    img = Image.open(source_path)
+    img.thumbnail((pixels, pixels), Image.Resampling.LANCZOS)
+    # Flatten transparency onto white, as the logos have always been displayed
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    os.makedirs(STATIC_LOGO_DIR, exist_ok=True)
+    img.save(output_path, format="WEBP", quality=WEBP_QUALITY, method=6)
+    return output_path
+
+@lru_cache(maxsize=None)
+def _encoded_logo(source_path, size, mtime):
+    # mtime is part of the cache key so an updated source image is picked up
+    with open(build_logo(source_path, size), 'rb') as f:
+        return base64.b64encode(f.read()).decode()
+
+def _static_serving_enabled():
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+def logo_src(source_path, placement):
+    """Return an <img> src for a logo shown at the given placement ('row', 'mover' or 'header')."""
+    if not os.path.exists(source_path):
+        source_path = PLACEHOLDER_PATH
+    size = LOGO_SIZES[placement]
+    try:
+        if _static_serving_enabled():
+            asset = build_logo(source_path, size)
+            return f"app/static/logos/{os.path.basename(asset)}"
+        return f"data:image/webp;base64,{_encoded_logo(source_path, size, os.path.getmtime(source_path))}"
+    except Exception as e:
+        print(f"Error preparing logo {source_path}: {e}")
+        return ""
+
+def build_all_logos(force=False):
+    paths = []
+    for name in sorted(os.listdir(IMAGES_DIR)):
+        if name.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')):
+            for size in LOGO_SIZES.values():
+                paths.append(build_logo(os.path.join(IMAGES_DIR, name), size, force=force))
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-resize the logo images into static/logos.")
+    parser.add_argument('--force', action='store_true', help="Rebuild every logo even if it is up to date")
+    args = parser.parse_args()
+    paths = build_all_logos(force=args.force)
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"Built {len(paths)} logo assets ({total / 1024:.0f} KB) in {STATIC_LOGO_DIR}")
@@ -10,6 +10,8 @@ from openpyxl import Workbook
 from openpyxl.drawing.image import Image
 import os
 
+from simulation import ASSET_PARAMS, INVESTMENT, PLATFORM_FEES, max_drawdown, sharpe_ratio, simulate, total_fee_bps
+
 # CloudMundi brand colors
 CLOUDMUNDI_TEAL = '#2DD4BF'
 CLOUDMUNDI_NAVY = '#1E3A8A' 
@@ -22,22 +24,10 @@ plt.style.use('seaborn-v0_8-darkgrid')
 plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['font.sans-serif'] = ['Arial', 'Helvetica', 'DejaVu Sans']
 
-# Platform fees in basis points
-PLATFORM_FEES = {
-    'eToro': {'trading': 50, 'spread': 100, 'management': 0},    # 150 bps total
-    'Revolut': {'trading': 30, 'spread': 190, 'management': 0},  # 220 bps total  
-    'Robinhood': {'trading': 0, 'spread': 50, 'management': 0}   # 50 bps total
-}
-
-# Asset class assumptions (annualized) - More realistic
-ASSET_PARAMS = {
-    'Bitcoin': {'return': 0.15, 'volatility': 0.25},    # 15% return, 25% vol (more conservative)
-    'S&P 500': {'return': 0.08, 'volatility': 0.12},    # 8% return, 12% vol
-    'Gold': {'return': 0.05, 'volatility': 0.10},       # 5% return, 10% vol
-    'Bonds': {'return': 0.03, 'volatility': 0.03}       # 3% return, 3% vol
-}
-
-INVESTMENT = 10000  # £10,000
+# Platform fees, asset assumptions and the £10,000 investment live in simulation.py.
+# Charts draw the seeded sample path as their lines, over the no-fee 5th-95th
+# percentile band of this many Monte Carlo paths.
+MONTE_CARLO_PATHS = 10000
 
 def create_fee_table():
     """Create and save platform fee comparison table"""
@@ -76,17 +66,6 @@ def create_fee_table():
     plt.savefig('platform_fee_table.png', dpi=300, bbox_inches='tight', facecolor='white')
     plt.close()
 
-def simulate_asset_returns(asset, days):
-    """Simulate returns for a specific asset"""
-    params = ASSET_PARAMS[asset]
-    mu = params['return'] / 252  # Daily return
-    sigma = params['volatility'] / np.sqrt(252)  # Daily volatility
-    
-    np.random.seed(hash(asset) % 2**32)
-    returns = np.random.normal(mu, sigma, days)
-    prices = INVESTMENT * np.cumprod(1 + returns)
-    return prices
-
 def create_asset_predictions():
     """Create predicted returns for each asset class"""
     days = 252  # 1 year
@@ -96,9 +75,10 @@ def create_asset_predictions():
     fig.patch.set_facecolor('white')
     
     colors = {'Bitcoin': '#F7931A', 'S&P 500': '#003366', 'Gold': '#FFD700', 'Bonds': '#4B8E4B'}
+    simulation = simulate(colors, days=days)
     
-    for asset, color in colors.items():
-        values = simulate_asset_returns(asset, days)
+    for i, (asset, color) in enumerate(colors.items()):
+        values = simulation.gross[i, 0]
         ax.plot(dates, values, label=asset, color=color, linewidth=3, alpha=0.9)
         
         # Add final value annotation
@@ -141,23 +121,20 @@ def create_platform_adjusted_returns():
     asset_colors = {'Bitcoin': '#F7931A', 'S&P 500': '#003366', 'Gold': '#FFD700', 'Bonds': '#4B8E4B'}
     platform_colors = {'eToro': CLOUDMUNDI_TEAL, 'Revolut': CLOUDMUNDI_NAVY, 'Robinhood': CLOUDMUNDI_ACCENT}
     
+    # (asset, platform, path, day) values after compounded daily fees
+    simulation = simulate(assets, platform_colors, days, n_paths=MONTE_CARLO_PATHS, dtype=np.float32)
+    net_values = simulation.net
+    bands = np.percentile(simulation.gross, [5, 95], axis=1)  # (band, asset, day)
+    
     for idx, asset in enumerate(assets):
         ax = axes[idx]
-        base_values = simulate_asset_returns(asset, days)
+        base_values = simulation.gross[idx, 0]
+        ax.fill_between(dates, bands[0, idx], bands[1, idx], color='gray', alpha=0.12, linewidth=0,
+                        label='5th-95th Percentile')
         
         # Plot for each platform
-        for platform, color in platform_colors.items():
-            # Calculate total fee impact
-            total_fee_bps = sum(PLATFORM_FEES[platform].values())
-            annual_fee = total_fee_bps / 10000  # Convert bps to decimal
-            daily_fee = annual_fee / 252
-            
-            # Apply fees to returns
-            fee_adjusted_values = base_values.copy()
-            for i in range(1, len(fee_adjusted_values)):
-                fee_adjusted_values[i] = fee_adjusted_values[i-1] * (1 - daily_fee) * (base_values[i] / base_values[i-1])
-            
-            ax.plot(dates, fee_adjusted_values, label=f'{platform} ({total_fee_bps} bps)', 
+        for p, (platform, color) in enumerate(platform_colors.items()):
+            ax.plot(dates, net_values[idx, p, 0], label=f'{platform} ({total_fee_bps(platform)} bps)', 
                    color=color, linewidth=2.5, alpha=0.8)
         
         # Add base performance (no fees)
@@ -174,31 +151,12 @@ def create_platform_adjusted_returns():
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
     
-    plt.suptitle('Platform Fee Impact on Asset Performance (1 Year)', 
+    plt.suptitle(f'Platform Fee Impact on Asset Performance (1 Year, {MONTE_CARLO_PATHS:,} Paths)', 
                 fontsize=20, fontweight='bold', color=CLOUDMUNDI_NAVY, y=0.98)
     plt.tight_layout()
     plt.savefig('platform_fee_impact.png', dpi=300, bbox_inches='tight', facecolor='white')
     plt.close()
 
-def simulate_portfolio(asset_weights, platform, days):
-    """Simulate portfolio with given asset weights and platform fees"""
-    # Asset weights: {'Bitcoin': 0.3, 'S&P 500': 0.25, 'Gold': 0.25, 'Bonds': 0.2}
-    portfolio_values = np.zeros(days)
-    
-    for asset, weight in asset_weights.items():
-        asset_values = simulate_asset_returns(asset, days) * weight
-        portfolio_values += asset_values
-    
-    # Apply platform fees
-    total_fee_bps = sum(PLATFORM_FEES[platform].values())
-    annual_fee = total_fee_bps / 10000
-    daily_fee = annual_fee / 252
-    
-    for i in range(1, days):
-        portfolio_values[i] = portfolio_values[i] * (1 - daily_fee * i)
-    
-    return portfolio_values
-
 def plot_portfolio_projection(days, filename, title):
     dates = pd.date_range(start='2024-01-01', periods=days)
     fig, ax = plt.subplots(figsize=(16, 9))
@@ -208,12 +166,17 @@ def plot_portfolio_projection(days, filename, title):
     # Asset weights
     asset_weights = {'Bitcoin': 0.3, 'S&P 500': 0.25, 'Gold': 0.25, 'Bonds': 0.2}
     
-    # Store results for IRR calculation
+    # (platform, path, day) values; results keeps the final values of every path for the IRR table
+    simulation = simulate(asset_weights, PLATFORM_FEES, days, n_paths=MONTE_CARLO_PATHS)
+    portfolios = simulation.portfolio(asset_weights)
+    bands = np.percentile(simulation.gross_portfolio(asset_weights), [5, 95], axis=0)
+    ax.fill_between(dates, bands[0], bands[1], color='gray', alpha=0.12, linewidth=0,
+                    label=f'5th-95th Percentile ({MONTE_CARLO_PATHS:,} paths, no fees)')
     results = {}
     
-    for platform, color in zip(PLATFORM_FEES.keys(), [CLOUDMUNDI_TEAL, CLOUDMUNDI_NAVY, CLOUDMUNDI_ACCENT]):
-        values = simulate_portfolio(asset_weights, platform, days)
-        results[platform] = values
+    for p, (platform, color) in enumerate(zip(PLATFORM_FEES.keys(), [CLOUDMUNDI_TEAL, CLOUDMUNDI_NAVY, CLOUDMUNDI_ACCENT])):
+        values = portfolios[p, 0]
+        results[platform] = portfolios[p, :, -1]
         
         # Plot line
         ax.plot(dates, values, label=platform, color=color, linewidth=3, alpha=0.9)
@@ -261,9 +224,9 @@ def plot_portfolio_projection(days, filename, title):
     ax.spines['right'].set_visible(False)
     
     # Add IRR table
-    irr_text = 'Annualized Returns:\n'
+    irr_text = 'Median Annualized Returns:\n'
     for platform in PLATFORM_FEES.keys():
-        final = results[platform][-1]
+        final = np.median(results[platform])
         irr = ((final / INVESTMENT) ** (252/days) - 1) * 100
         irr_text += f'{platform}: {irr:.1f}%\n'
     
@@ -278,16 +241,11 @@ def plot_portfolio_projection(days, filename, title):
 def create_portfolio_simulation():
     """Projected return simulation - Professional version"""
     dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
-    np.random.seed(42)
-    
-    # More realistic returns with volatility
-    etoro_returns = np.cumsum(np.random.normal(0.08/252, 0.15/np.sqrt(252), len(dates))) - 0.015
-    revolut_returns = np.cumsum(np.random.normal(0.08/252, 0.15/np.sqrt(252), len(dates))) - 0.025
-    robinhood_returns = np.cumsum(np.random.normal(0.08/252, 0.15/np.sqrt(252), len(dates))) - 0.005
     
-    etoro_returns = (etoro_returns + 1) * 100
-    revolut_returns = (revolut_returns + 1) * 100
-    robinhood_returns = (robinhood_returns + 1) * 100
+    # The recommended mix on each platform, as % of the initial investment
+    asset_weights = {'Bitcoin': 0.3, 'S&P 500': 0.25, 'Gold': 0.25, 'Bonds': 0.2}
+    portfolios = simulate(asset_weights, ['eToro', 'Revolut', 'Robinhood'], len(dates)).portfolio(asset_weights)
+    etoro_returns, revolut_returns, robinhood_returns = portfolios[:, 0] / INVESTMENT * 100
     
     fig, ax = plt.subplots(figsize=(16, 9))
     fig.patch.set_facecolor('white')
@@ -423,33 +381,22 @@ def create_asset_allocation():
     plt.close()
 
 def calculate_max_drawdown(prices):
-    peak = prices[0]
-    max_dd = 0
-    for price in prices:
-        if price > peak:
-            peak = price
-        dd = (peak - price) / peak
-        if dd > max_dd:
-            max_dd = dd
-    return max_dd
+    return max_drawdown(prices)
 
 def calculate_sharpe_ratio(returns, risk_free_rate=0.01):
-    excess_returns = returns - (risk_free_rate / 252)
-    if np.std(excess_returns) == 0:
-        return 0
-    return np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)
+    return sharpe_ratio(returns, risk_free_rate)
 
 def create_asset_risk_table():
-    """Create a table summarizing risk metrics for each asset class"""
+    """Create a table summarizing risk metrics for each asset class (averaged over the Monte Carlo paths)"""
     assets = list(ASSET_PARAMS.keys())
     metrics = []
     days = 252
-    for asset in assets:
-        prices = simulate_asset_returns(asset, days)
-        returns = np.diff(prices) / prices[:-1]
-        vol = np.std(returns) * np.sqrt(252)
-        max_dd = calculate_max_drawdown(prices)
-        sharpe = calculate_sharpe_ratio(returns)
+    prices = simulate(assets, days=days, n_paths=MONTE_CARLO_PATHS).gross  # (asset, path, day)
+    returns = np.diff(prices, axis=-1) / prices[..., :-1]
+    vols = (np.std(returns, axis=-1) * np.sqrt(252)).mean(axis=-1)
+    max_dds = calculate_max_drawdown(prices).mean(axis=-1)
+    sharpes = calculate_sharpe_ratio(returns).mean(axis=-1)
+    for vol, max_dd, sharpe in zip(vols, max_dds, sharpes):
         metrics.append([
             f"{vol*100:.1f}%",
             f"{max_dd*100:.1f}%",
@@ -471,7 +418,7 @@ def create_asset_risk_table():
     table.set_fontsize(13)
     table.scale(1.2, 2)
     fig.patch.set_facecolor('white')
-    plt.title('Asset Class Risk Metrics (1 Year Simulation)', fontsize=16, fontweight='bold', color=CLOUDMUNDI_NAVY, pad=15)
+    plt.title(f'Asset Class Risk Metrics (1 Year Simulation, mean of {MONTE_CARLO_PATHS:,} paths)', fontsize=16, fontweight='bold', color=CLOUDMUNDI_NAVY, pad=15)
     plt.tight_layout()
     plt.savefig('asset_risk_table.png', dpi=300, bbox_inches='tight', facecolor='white')
     plt.close()
@@ -0,0 +1,118 @@
+"""Vectorized price-path simulation for the CloudMundi platform charts.
+
+Every asset is simulated as one (path, day) array of compounded daily
+returns. Platform fees are a per-day factor (1 - daily_fee) ** day built
+with a cumulative product, so net values are the gross tensor broadcast
+against the fee factors: (asset, platform, path, day). Nothing loops
+over days, and tens of thousands of Monte Carlo paths cost one array
+operation per asset.
+
+Path 0 of every asset is the same draw for any path count, so charts that
+show a single representative path don't change with n_paths.
+"""
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+
+TRADING_DAYS = 252
+INVESTMENT = 10000  # £10,000
+
+# Platform fees in basis points
+PLATFORM_FEES = {
+    'eToro': {'trading': 50, 'spread': 100, 'management': 0},    # 150 bps total
+    'Revolut': {'trading': 30, 'spread': 190, 'management': 0},  # 220 bps total
+    'Robinhood': {'trading': 0, 'spread': 50, 'management': 0}   # 50 bps total
+}
+
+# Asset class assumptions (annualized) - More realistic
+ASSET_PARAMS = {
+    'Bitcoin': {'return': 0.15, 'volatility': 0.25},    # 15% return, 25% vol (more conservative)
+    'S&P 500': {'return': 0.08, 'volatility': 0.12},    # 8% return, 12% vol
+    'Gold': {'return': 0.05, 'volatility': 0.10},       # 5% return, 10% vol
+    'Bonds': {'return': 0.03, 'volatility': 0.03}       # 3% return, 3% vol
+}
+
+def asset_seed(asset, seed=0):
+    """Random seed for an asset's paths, stable across runs (unlike hash() of a string)."""
+    return (zlib.crc32(asset.encode()) + seed) % 2**32
+
+def total_fee_bps(platform):
+    return sum(PLATFORM_FEES[platform].values())
+
+def fee_factors(platforms, days):
+    """(platform, day) share of value left after compounded daily fees: (1 - daily_fee) ** day.
+
+    The annual fee is charged as annual_fee / 252 per trading day, and day 0
+    (the investment date) is fee free.
+    """
+    daily_fees = np.array([total_fee_bps(p) / 10000 / TRADING_DAYS for p in platforms])
+    keep = np.broadcast_to((1 - daily_fees)[:, None], (len(daily_fees), days)).copy()
+    keep[:, 0] = 1.0
+    return np.cumprod(keep, axis=1)
+
+def simulate_gross(assets, days, n_paths=1, seed=0, investment=INVESTMENT, dtype=np.float64):
+    """(asset, path, day) values of investment held in each asset, before platform fees."""
+    values = np.empty((len(assets), n_paths, days), dtype=dtype)
+    for i, asset in enumerate(assets):
+        params = ASSET_PARAMS[asset]
+        mu = params['return'] / TRADING_DAYS  # Daily return
+        sigma = params['volatility'] / np.sqrt(TRADING_DAYS)  # Daily volatility
+        returns = np.random.RandomState(asset_seed(asset, seed)).normal(mu, sigma, (n_paths, days))
+        values[i] = investment * np.cumprod(1 + returns, axis=1)
+    return values
+
+@dataclass
+class Simulation:
+    """Gross paths of assets and the fee factors of platforms, with net values by broadcasting."""
+    assets: tuple
+    platforms: tuple
+    gross: np.ndarray        # (asset, path, day)
+    fee_factors: np.ndarray  # (platform, day)
+
+    @property
+    def net(self):
+        """(asset, platform, path, day) values after each platform's fees."""
+        return self.gross[:, None] * self.fee_factors[None, :, None].astype(self.gross.dtype)
+
+    def net_for(self, asset, platform):
+        """(path, day) values of one asset on one platform, without building the full net tensor."""
+        return (self.gross[self.assets.index(asset)]
+                * self.fee_factors[self.platforms.index(platform)].astype(self.gross.dtype))
+
+    def gross_portfolio(self, asset_weights):
+        """(path, day) values of a buy-and-hold portfolio before fees.
+
+        asset_weights maps assets to their share of the initial investment.
+        """
+        weights = np.array([asset_weights.get(asset, 0.0) for asset in self.assets], dtype=self.gross.dtype)
+        return np.tensordot(weights, self.gross, axes=1)
+
+    def portfolio(self, asset_weights):
+        """(platform, path, day) values of a buy-and-hold portfolio, fees charged on the whole portfolio."""
+        return self.gross_portfolio(asset_weights)[None] * self.fee_factors[:, None].astype(self.gross.dtype)
+
+def simulate(assets=None, platforms=None, days=TRADING_DAYS, n_paths=1, seed=0, investment=INVESTMENT,
+             dtype=np.float64):
+    """Simulate n_paths price paths of every asset over days trading days.
+
+    Use dtype=np.float32 to halve memory for large Monte Carlo runs: the
+    net tensor of 4 assets, 3 platforms and 20,000 one-year paths is 240 MB
+    in float32.
+    """
+    assets = tuple(assets or ASSET_PARAMS)
+    platforms = tuple(platforms or PLATFORM_FEES)
+    return Simulation(assets, platforms, simulate_gross(assets, days, n_paths, seed, investment, dtype),
+                      fee_factors(platforms, days))
+
+def max_drawdown(prices):
+    """Largest peak-to-trough fall along the last axis, as a fraction of the peak."""
+    peaks = np.maximum.accumulate(prices, axis=-1)
+    return ((peaks - prices) / peaks).max(axis=-1)
+
+def sharpe_ratio(returns, risk_free_rate=0.01):
+    """Annualized Sharpe ratio of daily returns along the last axis (0 where they don't vary)."""
+    excess_returns = returns - (risk_free_rate / TRADING_DAYS)
+    std = np.std(excess_returns, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std == 0, 0.0, np.mean(excess_returns, axis=-1) / std * np.sqrt(TRADING_DAYS))
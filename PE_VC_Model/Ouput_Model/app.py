@@ -1,23 +1,79 @@
-# Calculate Baseline (No Fees) in USD, then convert
+import os
+import sys
+
+import streamlit as st
+import plotly.graph_objects as go
+
+# The model engine is shared with app.py and feeapp.py in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model import CapitalCallSchedule, Currency, FeeStructure, PerformanceMetrics, get_model
+
+st.set_page_config(page_title="PE/VC Output Model", page_icon="📈", layout="wide")
+st.title("📈 PE/VC Output Model")
+st.markdown("""
+    Fund output with the performance fee charged every harvest year on that
+    year's gain above the hurdle, against a no-fee baseline.
+""")
+
+st.sidebar.header("Investment Parameters")
+fund_currency = st.sidebar.selectbox("Fund Currency", options=[c.value for c in Currency], index=2)
+currency = st.sidebar.selectbox("Reporting Currency", options=[c.value for c in Currency], index=2)
+
+use_capital_calls = st.sidebar.checkbox("Use Capital Calls", value=False)
 if use_capital_calls:
-    baseline_initial = total_commitment / selected_rate
+    total_commitment = st.sidebar.number_input("Total Commitment", min_value=1000, max_value=10000000,
+                                               value=10000, step=1000)
+    investment_period = st.sidebar.number_input("Investment Period (Years)", min_value=1, max_value=5, value=3)
+    call_frequency = st.sidebar.selectbox("Call Frequency", options=['quarterly', 'semi-annual', 'annual'])
+    initial_investment = total_commitment
+    capital_call_schedule = CapitalCallSchedule(total_commitment, investment_period, call_frequency)
 else:
-    baseline_initial = initial_investment / selected_rate
-
-baseline_model = FinancialModel(
-    initial_investment=baseline_initial,
-    currency=Currency(currency),
-    fee_structure=FeeStructure(
-        management_fee=0.0,
-        performance_fee=0.0,
-        hurdle_rate=hurdle_rate
-    ),
-    performance_metrics=PerformanceMetrics(
-        target_irr=target_irr,
-        moic=moic,
-        mm=mm,
-        tvpi=tvpi
-    )
+    initial_investment = st.sidebar.number_input("Initial Investment", min_value=100, max_value=1000000,
+                                                 value=1000, step=100)
+    capital_call_schedule = None
+
+st.sidebar.subheader("Fee Structure")
+management_fee = st.sidebar.slider("Management Fee (% per year)", 0.0, 5.0, 2.0, 0.1) / 100
+performance_fee = st.sidebar.slider("Performance Fee (% of annual gain above hurdle)", 0.0, 30.0, 20.0, 0.5) / 100
+hurdle_rate = st.sidebar.slider("Hurdle Rate (%)", 0.0, 30.0, 8.0, 0.5) / 100
+
+st.sidebar.subheader("Performance Assumptions")
+target_irr = st.sidebar.slider("Target IRR (%)", -20.0, 50.0, 15.0, 0.5) / 100
+moic = st.sidebar.slider("MOIC (x)", 0.5, 5.0, 2.0, 0.1)
+mm = st.sidebar.slider("Money Multiple (MM)", 0.5, 5.0, 2.5, 0.1)
+tvpi = st.sidebar.slider("TVPI (x)", 0.5, 5.0, 2.5, 0.1)
+
+# Models are built in the fund currency; get_model and the disk cache share them with the other apps
+performance_metrics = PerformanceMetrics(target_irr=target_irr, moic=moic, mm=mm, tvpi=tvpi)
+model = get_model(
+    initial_investment=initial_investment,
+    currency=Currency(fund_currency),
+    fee_structure=FeeStructure(management_fee, performance_fee, hurdle_rate, performance_fee_timing='harvest'),
+    performance_metrics=performance_metrics,
+    capital_call_schedule=capital_call_schedule
+)
+baseline_model = get_model(
+    initial_investment=initial_investment,
+    currency=Currency(fund_currency),
+    fee_structure=FeeStructure(0.0, 0.0, hurdle_rate, performance_fee_timing='harvest'),
+    performance_metrics=performance_metrics,
+    capital_call_schedule=capital_call_schedule
 )
-baseline_results = baseline_model.results
-baseline_final = baseline_results['Cumulative_Gross'].iloc[-1] * selected_rate 
\ No newline at end of file
+
+results = model.results_in(Currency(currency))
+baseline_final = baseline_model.results_in(Currency(currency))['Cumulative_Gross'].iloc[-1]
+live_final = results['Cumulative_Net'].iloc[-1]
+difference = live_final - baseline_final
+impact_pct = (difference / baseline_final) * 100 if baseline_final != 0 else 0
+
+colA, colB, colC = st.columns(3)
+colA.metric("Baseline Value (No Fees)", f"{baseline_final:,.2f} {currency}")
+colB.metric("Value With Fees", f"{live_final:,.2f} {currency}", f"{difference:,.2f} {currency}")
+colC.metric("Total Fees Impact (vs. Baseline)", f"{abs(impact_pct):.2f}%")
+
+fig = go.Figure()
+fig.add_trace(go.Scatter(x=results['Year'], y=results['Cumulative_Gross'], name='Gross Return'))
+fig.add_trace(go.Scatter(x=results['Year'], y=results['Cumulative_Net'], name='Net Return'))
+fig.add_trace(go.Bar(x=results['Year'], y=results['Performance_Fee'], name='Performance Fee'))
+fig.update_layout(xaxis_title='Year', yaxis_title=f'Value ({currency})', hovermode='x unified')
+st.plotly_chart(fig, use_container_width=True)
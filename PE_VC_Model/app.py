@@ -1,7 +1,8 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-from model.output import FinancialModel, Currency, FeeStructure, PerformanceMetrics, CapitalCallSchedule
+from model import Currency, FeeStructure, PerformanceMetrics, CapitalCallSchedule, get_model
+from model.goal_seek import solve_for
 
 st.set_page_config(
     page_title="PE/VC Investment Calculator",
@@ -37,21 +38,19 @@ st.markdown("""
 # Sidebar inputs
 st.sidebar.header("Investment Parameters")
 
-# Currency selection
+# Currency selection: amounts are entered in the fund currency and reported
+# in the reporting currency, converted at the rates in data/fx_rates.csv
+fund_currency = st.sidebar.selectbox(
+    "Fund Currency",
+    options=[c.value for c in Currency],
+    index=2  # Default to USD
+)
 currency = st.sidebar.selectbox(
-    "Currency",
+    "Reporting Currency",
     options=[c.value for c in Currency],
     index=2  # Default to USD
 )
 
-# --- Currency conversion rates ---
-currency_rates = {
-    'USD': 1.0,
-    'GBP': 0.85,
-    'EUR': 0.93
-}
-selected_rate = currency_rates[currency]
-
 # Capital call parameters
 st.sidebar.subheader("Capital Call Schedule")
 use_capital_calls = st.sidebar.checkbox("Use Capital Calls", value=False)
@@ -154,16 +153,38 @@ tvpi = st.sidebar.slider(
     step=0.1
 )
 
-# Create model instance (in USD)
+# Goal seek: solve for one input instead of stepping its slider by hand.
+# Each entry is the solve_for name and the factor from model units to the sidebar's
+GOAL_SEEK_INPUTS = {
+    'Management Fee (%)': ('management_fee', 100),
+    'Performance Fee (%)': ('performance_fee', 100),
+    'Hurdle Rate (%)': ('hurdle_rate', 100),
+    'Target IRR (%)': ('target_irr', 100),
+    'Commitment / Investment': ('commitment', 1)
+}
+GOAL_SEEK_METRICS = {
+    'Net IRR (%)': ('Final_Net_IRR', 100),
+    'Net MOIC (x)': ('Final_Net_MOIC', 1),
+    'Final Net Return': ('Final_Net_Return', 1)
+}
+st.sidebar.subheader("Goal Seek")
+goal_seek = st.sidebar.checkbox("Solve for a target", value=False,
+                                help="Find the input value that hits a target outcome, all other inputs as set")
+if goal_seek:
+    seek_input = st.sidebar.selectbox("Solve For", options=list(GOAL_SEEK_INPUTS))
+    seek_metric = st.sidebar.selectbox("Target Metric", options=list(GOAL_SEEK_METRICS))
+    seek_target = st.sidebar.number_input("Target Value", value=12.0, step=0.5)
+
+# Create model instance (in the fund currency); get_model reuses the computed model for unchanged inputs
 if use_capital_calls:
     capital_call_schedule = CapitalCallSchedule(
-        total_commitment=total_commitment / selected_rate,
+        total_commitment=total_commitment,
         investment_period_years=investment_period,
         call_frequency=call_frequency
     )
-    model = FinancialModel(
-        initial_investment=total_commitment / selected_rate,  # Use total commitment as initial investment
-        currency=Currency(currency),
+    model = get_model(
+        initial_investment=total_commitment,  # Use total commitment as initial investment
+        currency=Currency(fund_currency),
         fee_structure=FeeStructure(
             management_fee=management_fee,
             performance_fee=performance_fee,
@@ -178,9 +199,9 @@ if use_capital_calls:
         capital_call_schedule=capital_call_schedule
     )
 else:
-    model = FinancialModel(
-        initial_investment=initial_investment / selected_rate,
-        currency=Currency(currency),
+    model = get_model(
+        initial_investment=initial_investment,
+        currency=Currency(fund_currency),
         fee_structure=FeeStructure(
             management_fee=management_fee,
             performance_fee=performance_fee,
@@ -194,18 +215,32 @@ else:
         )
     )
 
-# Get results and convert all monetary columns to selected currency
-results = model.results.copy()
-for col in ['Gross_Return', 'Net_Return', 'Cumulative_Gross', 'Cumulative_Net']:
-    results[col] = results[col] * selected_rate
+if goal_seek:
+    input_name, input_scale = GOAL_SEEK_INPUTS[seek_input]
+    metric, metric_scale = GOAL_SEEK_METRICS[seek_metric]
+    try:
+        solved = solve_for(
+            input_name, metric, seek_target / metric_scale,
+            initial_investment=model.initial_investment,
+            fee_structure=model.fee_structure,
+            performance_metrics=model.performance_metrics,
+            capital_call_schedule=model.capital_call_schedule
+        )
+        st.sidebar.success(f"{seek_input} = {solved * input_scale:,.4f} gives {seek_metric} = {seek_target:,g}")
+    except ValueError:
+        st.sidebar.warning(f"No {seek_input} in its valid range gives {seek_metric} = {seek_target:,g}")
+
+# Results in the reporting currency; the model keeps each conversion, so
+# switching the reporting currency does not recompute anything
+results = model.results_in(Currency(currency))
 
-summary = model.get_summary_metrics()
+summary = model.get_summary_metrics(Currency(currency))
 
-# Calculate Baseline (No Fees) in USD, then convert
+# Calculate Baseline (No Fees) in the fund currency, then convert
 if use_capital_calls:
-    baseline_model = FinancialModel(
-        initial_investment=total_commitment / selected_rate,
-        currency=Currency(currency),
+    baseline_model = get_model(
+        initial_investment=total_commitment,
+        currency=Currency(fund_currency),
         fee_structure=FeeStructure(
             management_fee=0.0,
             performance_fee=0.0,
@@ -218,15 +253,15 @@ if use_capital_calls:
             tvpi=tvpi
         ),
         capital_call_schedule=CapitalCallSchedule(
-            total_commitment=total_commitment / selected_rate,
+            total_commitment=total_commitment,
             investment_period_years=investment_period,
             call_frequency=call_frequency
         )
     )
 else:
-    baseline_model = FinancialModel(
-        initial_investment=initial_investment / selected_rate,
-        currency=Currency(currency),
+    baseline_model = get_model(
+        initial_investment=initial_investment,
+        currency=Currency(fund_currency),
         fee_structure=FeeStructure(
             management_fee=0.0,
             performance_fee=0.0,
@@ -239,8 +274,8 @@ else:
             tvpi=tvpi
         )
     )
-baseline_results = baseline_model.results
-baseline_final = baseline_results['Cumulative_Gross'].iloc[-1] * selected_rate
+baseline_results = baseline_model.results_in(Currency(currency))
+baseline_final = baseline_results['Cumulative_Gross'].iloc[-1]
 
 # Live scenario (with fees)
 live_final = results['Cumulative_Net'].iloc[-1]
@@ -2,7 +2,7 @@ import streamlit as st
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
-from model.output import FinancialModel, Currency, FeeStructure, PerformanceMetrics
+from model import Currency, FeeStructure, PerformanceMetrics, get_model
 
 # Set page config
 st.set_page_config(
@@ -91,14 +91,6 @@ mm = st.sidebar.slider(
     step=0.1
 )
 
-dpi = st.sidebar.slider(
-    "DPI (%)",
-    min_value=0.0,
-    max_value=100.0,
-    value=80.0,
-    step=5.0
-) / 100
-
 moic = st.sidebar.slider(
     "MOIC (x)",
     min_value=0.5,
@@ -115,8 +107,8 @@ tvpi = st.sidebar.slider(
     step=0.1
 )
 
-# Create model instance
-model = FinancialModel(
+# Create model instance (cached: unchanged inputs reuse the computed model)
+model = get_model(
     initial_investment=initial_investment,
     currency=Currency(currency),
     fee_structure=FeeStructure(
@@ -124,10 +116,9 @@ model = FinancialModel(
         performance_fee=performance_fee
     ),
     performance_metrics=PerformanceMetrics(
-        irr=irr,
-        mm=mm,
-        dpi=dpi,
+        target_irr=irr,
         moic=moic,
+        mm=mm,
         tvpi=tvpi
     )
 )
@@ -0,0 +1,26 @@
+"""PE/VC fund model engine shared by app.py, feeapp.py and Ouput_Model/app.py.
+
+Import from the package rather than its modules; the names below are the
+stable API:
+
+    from model import FeeStructure, PerformanceMetrics, get_model
+
+get_model shares models across Streamlit reruns and sessions in one process,
+and model.cache, when PE_VC_CACHE_DIR is set, shares their results across
+processes on disk.
+"""
+from .batch import BatchFinancialModel
+from .fx import FXRates, load_fx_rates
+from .output import (
+    PERFORMANCE_FEE_TIMINGS,
+    CapitalCallSchedule,
+    Currency,
+    FeeStructure,
+    FinancialModel,
+    PerformanceMetrics,
+    get_model
+)
+from .portfolio import FundCommitment, Portfolio
+from .simulation import FundAssumptions, SimulationResult, simulate_funds
+from .waterfall import WATERFALL_STYLES, american_waterfall, european_waterfall, run_waterfall
+
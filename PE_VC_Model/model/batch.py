@@ -0,0 +1,268 @@
+"""Array-backed PE/VC model: many parameter sets evaluated in one pass.
+
+BatchFinancialModel reproduces FinancialModel's results for every model at
+once. Each result column is a (models, years) NumPy array, and DataFrames
+are only built when asked for (frame, to_frame, summary).
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .output import (
+    HARVEST_START,
+    PERFORMANCE_FEE_TIMINGS,
+    WATERFALL_STYLES,
+    CapitalCallSchedule,
+    FeeStructure,
+    PerformanceMetrics,
+    harvest_performance_fees,
+    prefix_irr,
+    waterfall_performance_fees
+)
+
+N_YEARS = 11  # years 0..10
+INVESTMENT_PERIOD = 3  # value build-up years before the harvest period
+
+# Result columns in FinancialModel.results order, mapped to array attributes
+COLUMNS = {
+    'Called_Capital': 'called_capital',
+    'Committed_Capital': 'committed_capital',
+    'Cumulative_Called': 'cumulative_called',
+    'Gross_Return': 'gross_return',
+    'Management_Fee': 'management_fee',
+    'Performance_Fee': 'performance_fee',
+    'Net_Return': 'net_return',
+    'Cumulative_Gross': 'gross_return',
+    'Cumulative_Net': 'net_return',
+    'Gross_IRR': 'gross_irr',
+    'Net_IRR': 'net_irr',
+    'Gross_MOIC': 'gross_moic',
+    'Net_MOIC': 'net_moic',
+    'Gross_MM': 'gross_moic',
+    'Net_MM': 'net_moic',
+    'Gross_TVPI': 'gross_moic',
+    'Net_TVPI': 'net_moic',
+    'Gross_DPI': 'gross_dpi',
+    'Net_DPI': 'net_dpi'
+}
+
+def _column(values, n_models, dtype=np.float64):
+    return np.broadcast_to(np.asarray(values, dtype=dtype), (n_models,)).copy()
+
+class BatchFinancialModel:
+    """FinancialModel for n models, with parameters given as arrays (or scalars shared by all).
+
+    Models without a capital call schedule have NaN total_commitment and are
+    funded by initial_investment up front, as in FinancialModel. Use
+    from_models to build one from the dataclasses the apps already use.
+    """
+
+    def __init__(
+        self,
+        initial_investment,
+        management_fee,
+        performance_fee,
+        hurdle_rate,
+        target_irr,
+        moic,
+        mm,
+        tvpi,
+        total_commitment=np.nan,
+        investment_period_years=3,
+        call_frequency='quarterly',
+        waterfall=None,
+        catch_up=1.0,
+        clawback=True,
+        performance_fee_timing='final'
+    ):
+        sizes = [np.size(v) for v in (initial_investment, management_fee, performance_fee, hurdle_rate, target_irr,
+                                      moic, mm, tvpi, total_commitment, investment_period_years, call_frequency,
+                                      waterfall, catch_up, clawback, performance_fee_timing)]
+        self.n_models = max(sizes)
+        n = self.n_models
+        self.initial_investment = _column(initial_investment, n)
+        self.management_fee_rate = _column(management_fee, n)
+        self.performance_fee_rate = _column(performance_fee, n)
+        self.hurdle_rate = _column(hurdle_rate, n)
+        self.target_irr = _column(target_irr, n)
+        self.moic = _column(moic, n)
+        self.mm = _column(mm, n)
+        self.tvpi = _column(tvpi, n)
+        self.total_commitment = _column(total_commitment, n)
+        self.investment_period_years = _column(investment_period_years, n, dtype=np.int64)
+        self.call_frequency = _column(call_frequency, n, dtype=object)
+        self.waterfall = _column(waterfall, n, dtype=object)
+        self.catch_up = _column(catch_up, n)
+        self.clawback = _column(clawback, n, dtype=bool)
+        self.performance_fee_timing = _column(performance_fee_timing, n, dtype=object)
+        self.has_schedule = ~np.isnan(self.total_commitment)
+
+        self._validate_inputs()
+        self.years = np.arange(N_YEARS)
+        self._calculate()
+
+    @classmethod
+    def from_models(
+        cls,
+        initial_investments,
+        fee_structures: Sequence[FeeStructure],
+        performance_metrics: Sequence[PerformanceMetrics],
+        capital_call_schedules: Optional[Sequence[Optional[CapitalCallSchedule]]] = None
+    ) -> 'BatchFinancialModel':
+        """Build from per-model dataclasses; a None schedule means a single upfront investment."""
+        schedules = capital_call_schedules or [None] * len(fee_structures)
+        return cls(
+            initial_investment=initial_investments,
+            management_fee=[f.management_fee for f in fee_structures],
+            performance_fee=[f.performance_fee for f in fee_structures],
+            hurdle_rate=[f.hurdle_rate for f in fee_structures],
+            target_irr=[p.target_irr for p in performance_metrics],
+            moic=[p.moic for p in performance_metrics],
+            mm=[p.mm for p in performance_metrics],
+            tvpi=[p.tvpi for p in performance_metrics],
+            total_commitment=[s.total_commitment if s else np.nan for s in schedules],
+            investment_period_years=[s.investment_period_years if s else 3 for s in schedules],
+            call_frequency=[s.call_frequency if s else 'quarterly' for s in schedules],
+            waterfall=[f.waterfall for f in fee_structures],
+            catch_up=[f.catch_up for f in fee_structures],
+            clawback=[f.clawback for f in fee_structures],
+            performance_fee_timing=[f.performance_fee_timing for f in fee_structures]
+        )
+
+    def _validate_inputs(self):
+        """FinancialModel's checks, reporting the first offending model."""
+        checks = [
+            (self.has_schedule & ~(self.total_commitment > 0), "Total commitment must be positive"),
+            (self.has_schedule & (self.investment_period_years <= 0), "Investment period must be positive"),
+            (~self.has_schedule & ~(self.initial_investment > 0), "Initial investment must be positive"),
+            (~((0 <= self.management_fee_rate) & (self.management_fee_rate <= 1)), "Management fee must be between 0 and 1"),
+            (~((0 <= self.performance_fee_rate) & (self.performance_fee_rate <= 1)), "Performance fee must be between 0 and 1"),
+            (~((0 <= self.hurdle_rate) & (self.hurdle_rate <= 1)), "Hurdle rate must be between 0 and 1"),
+            (~np.isin(self.waterfall, (None,) + WATERFALL_STYLES), f"Waterfall must be one of {WATERFALL_STYLES} or None"),
+            (~((0 <= self.catch_up) & (self.catch_up <= 1)), "Catch-up must be between 0 and 1"),
+            (~np.isin(self.performance_fee_timing, PERFORMANCE_FEE_TIMINGS),
+             f"Performance fee timing must be one of {PERFORMANCE_FEE_TIMINGS}"),
+            (self.target_irr <= -1, "Target IRR must be greater than -100%"),
+            (self.moic <= 0, "MOIC must be positive"),
+            (self.mm <= 0, "Money Multiple must be positive"),
+            (self.tvpi <= 0, "TVPI must be positive")
+        ]
+        for failed, message in checks:
+            if failed.any():
+                raise ValueError(f"{message} (model {int(np.argmax(failed))})")
+
+    def _calculate(self):
+        n_models, n_years = self.n_models, N_YEARS
+        years = self.years
+        schedule = self.has_schedule[:, None]
+        irr = self.target_irr[:, None]
+
+        # Capital calls: the calls made in a year sum to total_commitment / investment period
+        call_amount = self.total_commitment / self.investment_period_years
+        investment_period = self.investment_period_years[:, None]
+        scheduled_calls = np.where(years < investment_period, call_amount[:, None], 0.0)
+        upfront_calls = np.where(years == 0, self.initial_investment[:, None], 0.0)
+        self.called_capital = np.where(schedule, scheduled_calls, upfront_calls)
+        self.committed_capital = np.where(
+            schedule,
+            np.where(years <= investment_period, self.total_commitment[:, None], 0.0),
+            np.broadcast_to(self.initial_investment[:, None], (n_models, n_years))
+        )
+        cumulative_called = np.cumsum(self.called_capital, axis=1)
+        self.cumulative_called = cumulative_called
+
+        # Gross value: build-up during the investment period, then equal steps to the target final value
+        gross = np.zeros((n_models, n_years))
+        gross[:, 0] = self.called_capital[:, 0]
+        final_value = cumulative_called[:, -1] * (1 + self.target_irr) ** (n_years - 1)
+        build_up = years[1:INVESTMENT_PERIOD + 1]
+        gross[:, 1:INVESTMENT_PERIOD + 1] = cumulative_called[:, build_up] * (1 + irr) ** build_up
+        for year in range(INVESTMENT_PERIOD + 1, n_years):
+            gross[:, year] = gross[:, year - 1] + (final_value - gross[:, year - 1]) / (n_years - year)
+        self.gross_return = gross
+
+        # Management fee on commitments during the investment period, then on called capital
+        management = np.where(
+            schedule,
+            np.where(years <= investment_period,
+                     (self.total_commitment * self.management_fee_rate)[:, None],
+                     np.maximum(cumulative_called, 1e-8) * self.management_fee_rate[:, None]),
+            self.committed_capital * self.management_fee_rate[:, None]
+        )
+        management[:, 0] = 0
+        self.management_fee = management
+
+        # Performance fee on the final-year profit above the hurdle
+        performance = np.zeros((n_models, n_years))
+        hurdle_value = cumulative_called[:, -1] * (1 + self.hurdle_rate) ** (n_years - 1)
+        performance[:, -1] = np.maximum(0, gross[:, -1] - hurdle_value) * self.performance_fee_rate
+
+        # Harvest timing charges the fee on every harvest year's gain instead
+        harvest_timing = self.performance_fee_timing == 'harvest'
+        if harvest_timing.any():
+            hurdle_base = np.where(schedule, cumulative_called, self.initial_investment[:, None])
+            harvest_fees = harvest_performance_fees(gross, hurdle_base, self.hurdle_rate, self.performance_fee_rate)
+            performance = np.where(harvest_timing[:, None], harvest_fees, performance)
+
+        # Models with a waterfall pay carry out of the harvest-year distributions instead
+        uses_waterfall = self.waterfall != None  # noqa: E711 (elementwise on an object array)
+        if uses_waterfall.any():
+            carry = waterfall_performance_fees(self.called_capital, gross[:, -1], self.hurdle_rate,
+                                               self.performance_fee_rate, self.catch_up, self.clawback)
+            performance = np.where(uses_waterfall[:, None], carry, performance)
+        self.performance_fee = performance
+
+        # Performance fees leave the fund as they are paid, so net value is after all fees paid to date
+        # (the same as that year's fee with a single final-year fee)
+        net = gross - management - np.cumsum(performance, axis=1)
+        net[:, 0] = self.called_capital[:, 0]
+        self.net_return = net
+
+        # IRR cash flows: the first call out, the final value less that call spread over the harvest years
+        first_call = cumulative_called[:, :1]
+        harvest_years = n_years - HARVEST_START
+        gross_flows = np.zeros((n_models, n_years))
+        net_flows = np.zeros((n_models, n_years))
+        gross_flows[:, 0] = -first_call[:, 0]
+        net_flows[:, 0] = -first_call[:, 0]
+        gross_flows[:, HARVEST_START:] = ((gross[:, -1] - first_call[:, 0]) / harvest_years)[:, None]
+        net_flows[:, HARVEST_START:] = ((net[:, -1] - first_call[:, 0]) / harvest_years)[:, None]
+        self.gross_irr = prefix_irr(gross_flows)
+        self.net_irr = prefix_irr(net_flows)
+
+        self.gross_moic = gross / first_call
+        self.net_moic = net / first_call
+        self.gross_dpi = (gross - first_call) / first_call
+        self.net_dpi = (net - first_call) / first_call
+
+    def frame(self, index: int) -> pd.DataFrame:
+        """Results of one model, laid out like FinancialModel.results."""
+        data = {'Year': self.years}
+        data.update({column: getattr(self, attr)[index] for column, attr in COLUMNS.items()})
+        return pd.DataFrame(data)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Results of every model in long format, with a leading Model column."""
+        data = {
+            'Model': np.repeat(np.arange(self.n_models), N_YEARS),
+            'Year': np.tile(self.years, self.n_models)
+        }
+        data.update({column: getattr(self, attr).ravel() for column, attr in COLUMNS.items()})
+        return pd.DataFrame(data)
+
+    def summary(self) -> pd.DataFrame:
+        """FinancialModel.get_summary_metrics for every model, one row per model."""
+        return pd.DataFrame({
+            'Final_Gross_Return': self.gross_return[:, -1],
+            'Final_Net_Return': self.net_return[:, -1],
+            'Total_Fees': self.management_fee.sum(axis=1) + self.performance_fee.sum(axis=1),
+            'Final_Gross_IRR': self.gross_irr[:, -1],
+            'Final_Net_IRR': self.net_irr[:, -1],
+            'Final_Gross_MOIC': self.gross_moic[:, -1],
+            'Final_Net_MOIC': self.net_moic[:, -1],
+            'Final_Gross_MM': self.gross_moic[:, -1],
+            'Final_Net_MM': self.net_moic[:, -1],
+            'Final_Gross_TVPI': self.gross_moic[:, -1],
+            'Final_Net_TVPI': self.net_moic[:, -1]
+        })
@@ -0,0 +1,76 @@
+"""Opt-in on-disk cache of FinancialModel results, shared by every app and process.
+
+get_model keeps models in memory within one process; this cache lets the
+other Streamlit apps (each its own process) and later runs reuse results
+computed anywhere. It is off unless PE_VC_CACHE_DIR names a directory.
+
+Entries are Parquet files named by a hash of the model inputs and of the
+engine's source (this package and finance_utils), so any change to the
+code that computes results starts a fresh set of entries. Writes are
+atomic (temporary file plus rename), and any I/O failure, or a missing
+Parquet engine, falls back to computing the results.
+"""
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from typing import Optional
+
+import finance_utils
+import pandas as pd
+
+CACHE_DIR = os.environ.get('PE_VC_CACHE_DIR', '')
+SOURCE_DIRS = (os.path.dirname(os.path.abspath(__file__)), os.path.dirname(os.path.abspath(finance_utils.__file__)))
+
+@lru_cache(maxsize=None)
+def source_hash() -> str:
+    """Hash of every module that can change results: the model package and finance_utils."""
+    digest = hashlib.sha256()
+    for directory in SOURCE_DIRS:
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.py'):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    digest.update(name.encode() + b'\0' + f.read())
+    return digest.hexdigest()
+
+def cache_key(*inputs) -> str:
+    """Key for model inputs; the frozen parameter dataclasses have exact, stable reprs."""
+    return hashlib.sha256(repr((source_hash(),) + inputs).encode()).hexdigest()
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.parquet")
+
+def load(key: str) -> Optional[pd.DataFrame]:
+    """Cached results for key, or None when missing, unreadable or caching is disabled."""
+    if not CACHE_DIR:
+        return None
+    try:
+        return pd.read_parquet(_path(key))
+    except Exception:
+        return None
+
+def store(key: str, results: pd.DataFrame):
+    """Save results under key; a read-only or full disk only costs the cache."""
+    if not CACHE_DIR:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            results.to_parquet(f)
+        os.replace(tmp_path, _path(key))
+    except (OSError, ImportError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def clear():
+    """Delete every cached result."""
+    if CACHE_DIR and os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith('.parquet'):
+                os.remove(os.path.join(CACHE_DIR, name))
@@ -0,0 +1,121 @@
+"""FX rate histories and vectorized currency conversion of cash-flow arrays.
+
+Rates live in a local CSV file (data/fx_rates.csv by default), one row per
+date and one column per currency, quoted as units of that currency per US
+dollar. A rate applies from its date until the next one. Dates before the
+first row use the first rate.
+
+The shipped file holds the fixed rates the apps have always used. To use
+real daily rates, download the ECB reference rate history and convert it:
+
+    python update_fx_rates.py eurofxref-hist.zip
+
+(the zip is ECB_HISTORY_URL; the unzipped CSV works too). Rates from any
+other source work once written in the same layout.
+
+Parsed files are cached in memory and keyed by path and modification time,
+so the file is read once per change and not once per conversion.
+"""
+import os
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+class Currency(Enum):
+    GBP = "GBP"
+    EUR = "EUR"
+    USD = "USD"
+
+# Euro reference rates since 1999, one row per business day, quoted as units per euro
+ECB_HISTORY_URL = 'https://www.ecb.europa.eu/stats/eurofxref/eurofxref-hist.zip'
+
+FX_RATES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'fx_rates.csv')
+
+# Fallback when there is no rate file: the fixed rates the apps have always used
+DEFAULT_RATES_PER_USD = {Currency.USD: 1.0, Currency.GBP: 0.85, Currency.EUR: 0.93}
+
+# Monetary columns of FinancialModel.results; IRRs and multiples are ratios and need no conversion
+MONETARY_COLUMNS = ['Called_Capital', 'Committed_Capital', 'Cumulative_Called', 'Gross_Return', 'Management_Fee',
+                    'Performance_Fee', 'Net_Return', 'Cumulative_Gross', 'Cumulative_Net']
+
+class FXRates:
+    """Rate history as a (dates, currencies) array of units per US dollar."""
+
+    def __init__(self, dates, rates_per_usd: Dict[Currency, np.ndarray]):
+        self.dates = pd.DatetimeIndex(dates)
+        if not self.dates.is_monotonic_increasing:
+            raise ValueError("FX rate dates must be in increasing order")
+        self.currencies = list(rates_per_usd)
+        self.rates = np.column_stack([np.asarray(rates_per_usd[c], dtype=np.float64) for c in self.currencies])
+        if not (self.rates > 0).all():
+            raise ValueError("FX rates must be positive")
+
+    @classmethod
+    def constant(cls, rates_per_usd: Optional[Dict[Currency, float]] = None) -> 'FXRates':
+        rates = rates_per_usd or DEFAULT_RATES_PER_USD
+        return cls([pd.Timestamp('1970-01-01')], {c: [r] for c, r in rates.items()})
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'FXRates':
+        """Rates from a Date column plus one column per currency code."""
+        frame = pd.read_csv(path, parse_dates=['Date']).sort_values('Date')
+        return cls(frame['Date'], {Currency(col): frame[col].to_numpy() for col in frame.columns if col != 'Date'})
+
+    @classmethod
+    def from_ecb_csv(cls, path: str) -> 'FXRates':
+        """Rates from the ECB reference rate history (eurofxref-hist.csv or its zip), rebased to US dollars.
+
+        Days without a rate for one of the model's currencies are dropped.
+        """
+        frame = pd.read_csv(path, parse_dates=['Date'], na_values=['N/A'])
+        codes = [c.value for c in DEFAULT_RATES_PER_USD if c is not Currency.EUR]
+        frame = frame.dropna(subset=codes).sort_values('Date')
+        usd_per_eur = frame['USD'].to_numpy(dtype=np.float64)
+        per_eur = {c: 1.0 if c is Currency.EUR else frame[c.value].to_numpy(dtype=np.float64)
+                   for c in DEFAULT_RATES_PER_USD}
+        return cls(frame['Date'], {c: rate / usd_per_eur for c, rate in per_eur.items()})
+
+    def to_csv(self, path: str):
+        frame = pd.DataFrame(self.rates, columns=[c.value for c in self.currencies])
+        frame.insert(0, 'Date', self.dates)
+        frame.to_csv(path, index=False)
+
+    def _column(self, currency: Currency) -> np.ndarray:
+        try:
+            return self.rates[:, self.currencies.index(currency)]
+        except ValueError:
+            raise ValueError(f"No FX rates for {currency.value}") from None
+
+    def rate(self, from_currency: Currency, to_currency: Currency, dates=None) -> np.ndarray:
+        """Units of to_currency per unit of from_currency at each date (latest rate when dates is None)."""
+        if from_currency == to_currency:
+            return np.ones(1 if dates is None else len(dates))
+        if dates is None:
+            rows = np.array([len(self.dates) - 1])
+        else:
+            rows = np.maximum(self.dates.searchsorted(pd.DatetimeIndex(dates), side='right') - 1, 0)
+        return self._column(to_currency)[rows] / self._column(from_currency)[rows]
+
+    def convert(self, amounts, from_currency: Currency, to_currency: Currency, dates=None) -> np.ndarray:
+        """Convert an array with periods on the last axis, one rate per period (dates), in one multiply."""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if from_currency == to_currency:
+            return amounts
+        return amounts * self.rate(from_currency, to_currency, dates)
+
+@lru_cache(maxsize=8)
+def _load(path: Optional[str], modified: float) -> FXRates:
+    return FXRates.from_csv(path) if path else FXRates.constant()
+
+def load_fx_rates(path: str = FX_RATES_PATH) -> FXRates:
+    """Rates from the local file cache, or the fixed default rates when the file is missing.
+
+    The same FXRates object is returned until the file changes, so it can
+    key caches of converted results.
+    """
+    if not os.path.exists(path):
+        return _load(None, 0.0)
+    return _load(path, os.path.getmtime(path))
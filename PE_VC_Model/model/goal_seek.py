@@ -0,0 +1,74 @@
+"""Solve for the model input that hits a target metric (goal seek).
+
+Every step of the search evaluates a whole grid of candidate inputs as one
+BatchFinancialModel, so a solve is a handful of batched model runs and
+not one run per slider step.
+"""
+from dataclasses import replace
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .batch import BatchFinancialModel
+from .output import CapitalCallSchedule, FeeStructure, PerformanceMetrics
+from finance_utils import goal_seek
+
+# Inputs that can be solved for, with default search bounds. 'commitment' is the
+# initial investment, or the total commitment when there is a call schedule.
+SOLVABLE_INPUTS = {
+    'management_fee': (0.0, 0.10),
+    'performance_fee': (0.0, 0.50),
+    'hurdle_rate': (0.0, 0.50),
+    'target_irr': (-0.50, 1.00),
+    'commitment': None  # 0.1% to 1000x the current commitment
+}
+# Metrics to solve for: BatchFinancialModel.summary columns
+METRICS = ('Final_Net_IRR', 'Final_Net_MOIC', 'Final_Net_Return', 'Final_Gross_IRR', 'Final_Gross_Return',
+           'Total_Fees')
+
+def solve_for(
+    input_name: str,
+    metric: str,
+    target: float,
+    initial_investment: float = 1000,
+    fee_structure: Optional[FeeStructure] = None,
+    performance_metrics: Optional[PerformanceMetrics] = None,
+    capital_call_schedule: Optional[CapitalCallSchedule] = None,
+    bounds: Optional[Tuple[float, float]] = None
+) -> float:
+    """Value of input_name at which metric equals target, all other inputs as given.
+
+    For example, the performance fee giving a 12% net IRR:
+    solve_for('performance_fee', 'Final_Net_IRR', 0.12, fee_structure=fees).
+    Raises ValueError when no value within bounds reaches the target.
+    """
+    if input_name not in SOLVABLE_INPUTS:
+        raise ValueError(f"Cannot solve for {input_name!r}; choose one of {list(SOLVABLE_INPUTS)}")
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; choose one of {list(METRICS)}")
+    fee_structure = fee_structure or FeeStructure()
+    performance_metrics = performance_metrics or PerformanceMetrics(target_irr=0.15, moic=2.0, mm=2.5, tvpi=2.5)
+    if bounds is None:
+        bounds = SOLVABLE_INPUTS[input_name]
+    if bounds is None:
+        commitment = capital_call_schedule.total_commitment if capital_call_schedule else initial_investment
+        bounds = (commitment * 1e-3, commitment * 1e3)
+
+    def evaluate(values):
+        n = len(values)
+        investments = [initial_investment] * n
+        fee_structures = [fee_structure] * n
+        metrics = [performance_metrics] * n
+        schedules = [capital_call_schedule] * n
+        if input_name in ('management_fee', 'performance_fee', 'hurdle_rate'):
+            fee_structures = [replace(fee_structure, **{input_name: v}) for v in values]
+        elif input_name == 'target_irr':
+            metrics = [replace(performance_metrics, target_irr=v) for v in values]
+        elif capital_call_schedule:
+            schedules = [replace(capital_call_schedule, total_commitment=v) for v in values]
+        else:
+            investments = values
+        summary = BatchFinancialModel.from_models(investments, fee_structures, metrics, schedules).summary()
+        return summary[metric].to_numpy(np.float64)
+
+    return goal_seek(evaluate, target, *bounds)
@@ -1,53 +1,68 @@
 import pandas as pd
 import numpy as np
-import numpy_financial as npf
 import matplotlib.pyplot as plt
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from enum import Enum
+from functools import cached_property, lru_cache
 
-class Currency(Enum):
-    GBP = "GBP"
-    EUR = "EUR"
-    USD = "USD"
+# The IRR solver is shared with the hedge fund model (the repository root package, see requirements.txt)
+from finance_utils import irr, prefix_irr
 
-@dataclass
+from . import cache
+from .fx import MONETARY_COLUMNS, Currency, FXRates, load_fx_rates
+from .waterfall import WATERFALL_STYLES, european_waterfall
+
+# First year of harvest-period distributions (the IRR cash flows and the waterfall use it)
+HARVEST_START = 4
+# Resolution of the dated cash-flow timeline (FinancialModel.timeline)
+TIMELINE_PERIODS_PER_YEAR = 4
+# Date of the first cash flow when none is given: fixed, so models are the same whenever they are built
+DEFAULT_START_DATE = pd.Timestamp('2025-01-01')
+PERIODS_PER_YEAR = {'quarterly': 4, 'semi-annual': 2, 'annual': 1}
+# When the performance fee is charged without a waterfall: once on the final
+# value, or every harvest year on that year's gain above the annual hurdle
+PERFORMANCE_FEE_TIMINGS = ('final', 'harvest')
+
+# Parameter classes are frozen so they are hashable and can key the model cache
+@dataclass(frozen=True)
 class FeeStructure:
     management_fee: float = 0.02  # 2%
     performance_fee: float = 0.20  # 20%
     hurdle_rate: float = 0.08  # 8%
+    # Optional distribution waterfall ('european' or 'american'); None keeps the
+    # single final-year performance fee. hurdle_rate is then the preferred
+    # return and performance_fee the carried interest.
+    waterfall: Optional[str] = None
+    catch_up: float = 1.0  # GP share of the catch-up tier
+    clawback: bool = True
+    performance_fee_timing: str = 'final'  # see PERFORMANCE_FEE_TIMINGS
 
-@dataclass
+@dataclass(frozen=True)
 class PerformanceMetrics:
     target_irr: float
     moic: float
     mm: float
     tvpi: float
 
-@dataclass
+@dataclass(frozen=True)
 class CapitalCallSchedule:
     total_commitment: float
     investment_period_years: int = 3
     call_frequency: str = 'quarterly'  # 'quarterly', 'semi-annual', 'annual'
     
-    def get_call_schedule(self) -> List[Tuple[int, float]]:
+    @property
+    def periods_per_year(self) -> int:
+        return PERIODS_PER_YEAR.get(self.call_frequency, 1)  # anything else is annual
+
+    def call_times(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Call times in years since the first call, and the amount called at each."""
+        total_periods = self.investment_period_years * self.periods_per_year
+        times = np.arange(total_periods) / self.periods_per_year
+        return times, np.full(total_periods, self.total_commitment / total_periods)
+
+    def get_call_schedule(self) -> List[Tuple[float, float]]:
         """Generate capital call schedule based on parameters."""
-        if self.call_frequency == 'quarterly':
-            periods_per_year = 4
-        elif self.call_frequency == 'semi-annual':
-            periods_per_year = 2
-        else:  # annual
-            periods_per_year = 1
-            
-        total_periods = self.investment_period_years * periods_per_year
-        call_amount = self.total_commitment / total_periods
-        
-        schedule = []
-        for period in range(total_periods):
-            year = period / periods_per_year
-            schedule.append((year, call_amount))
-            
-        return schedule
+        return list(zip(*(values.tolist() for values in self.call_times())))
 
 class FinancialModel:
     def __init__(
@@ -56,10 +71,11 @@ class FinancialModel:
         currency: Currency = Currency.USD,
         fee_structure: Optional[FeeStructure] = None,
         performance_metrics: Optional[PerformanceMetrics] = None,
-        capital_call_schedule: Optional[CapitalCallSchedule] = None
+        capital_call_schedule: Optional[CapitalCallSchedule] = None,
+        start_date: Optional[pd.Timestamp] = None
     ):
         self.initial_investment = initial_investment
-        self.currency = currency
+        self.currency = currency  # currency of every amount in the model
         self.fee_structure = fee_structure or FeeStructure()
         self.performance_metrics = performance_metrics or PerformanceMetrics(
             target_irr=0.15,  # 15% IRR
@@ -68,12 +84,65 @@ class FinancialModel:
             tvpi=2.5     # 2.5x TVPI
         )
         self.capital_call_schedule = capital_call_schedule
+        # Date of the first cash flow (timeline dates and FX conversion)
+        self.start_date = pd.Timestamp(start_date) if start_date is not None else DEFAULT_START_DATE
+        # Converted results and timelines, keyed by (view, currency, rates)
+        self._converted = {}
         
         # Validate inputs
         self._validate_inputs()
-        
-        # Initialize results DataFrame
-        self.results = self._calculate_results()
+
+    @cached_property
+    def results(self) -> pd.DataFrame:
+        """Results DataFrame, computed on first access and kept for the life of the model.
+
+        Shared by every caller of get_model with the same inputs, so copy it
+        before modifying it. When the on-disk cache is enabled (model.cache),
+        other apps and processes with the same inputs load them from there.
+        """
+        # Results do not depend on the currency or start date
+        key = cache.cache_key(self.initial_investment, self.fee_structure, self.performance_metrics,
+                              self.capital_call_schedule)
+        results = cache.load(key)
+        if results is None:
+            results = self._calculate_results()
+            cache.store(key, results)
+        return results
+
+    @cached_property
+    def timeline(self) -> pd.DataFrame:
+        """Dated quarterly cash flows, computed on first access like results."""
+        return self._calculate_timeline()
+
+    def results_in(self, currency: Currency, fx: Optional[FXRates] = None) -> pd.DataFrame:
+        """results with the monetary columns in currency, at each year's rate from start_date.
+
+        IRRs and multiples are left as computed in the model's currency.
+        Conversions are kept per currency and rate set, so switching back and
+        forth between currencies does no further work.
+        """
+        fx = fx or load_fx_rates()
+        key = ('results', currency, fx)
+        if key not in self._converted:
+            results = self.results.copy()
+            dates = pd.date_range(self.start_date, periods=len(results), freq=pd.DateOffset(years=1))
+            results[MONETARY_COLUMNS] = fx.convert(results[MONETARY_COLUMNS].to_numpy().T, self.currency,
+                                                   currency, dates).T
+            self._converted[key] = results
+        return self._converted[key]
+
+    def timeline_in(self, currency: Currency, fx: Optional[FXRates] = None) -> pd.DataFrame:
+        """timeline with every cash flow converted at its own date's rate."""
+        fx = fx or load_fx_rates()
+        key = ('timeline', currency, fx)
+        if key not in self._converted:
+            timeline = self.timeline.copy()
+            columns = [col for col in timeline.columns if col not in ('Date', 'Year')]
+            timeline[columns] = fx.convert(timeline[columns].to_numpy().T, self.currency, currency,
+                                           timeline['Date']).T
+            timeline['Cumulative_Net_Cash_Flow'] = timeline['Net_Cash_Flow'].cumsum()
+            self._converted[key] = timeline
+        return self._converted[key]
 
     def _validate_inputs(self):
         """Validate all input parameters."""
@@ -94,6 +163,15 @@ class FinancialModel:
         
         if not 0 <= self.fee_structure.hurdle_rate <= 1:
             raise ValueError("Hurdle rate must be between 0 and 1")
+
+        if self.fee_structure.waterfall not in (None,) + WATERFALL_STYLES:
+            raise ValueError(f"Waterfall must be one of {WATERFALL_STYLES} or None")
+
+        if not 0 <= self.fee_structure.catch_up <= 1:
+            raise ValueError("Catch-up must be between 0 and 1")
+
+        if self.fee_structure.performance_fee_timing not in PERFORMANCE_FEE_TIMINGS:
+            raise ValueError(f"Performance fee timing must be one of {PERFORMANCE_FEE_TIMINGS}")
         
         if self.performance_metrics.target_irr <= -1:
             raise ValueError("Target IRR must be greater than -100%")
@@ -123,11 +201,11 @@ class FinancialModel:
         
         # Handle capital calls if schedule exists
         if self.capital_call_schedule:
-            call_schedule = self.capital_call_schedule.get_call_schedule()
-            for year, amount in call_schedule:
-                year_idx = int(year)
-                if year_idx < n_years:
-                    called_capital[year_idx] = amount
+            # Sum every call into the year it falls in
+            call_times, call_amounts = self.capital_call_schedule.call_times()
+            in_horizon = call_times < n_years
+            called_capital = np.bincount(call_times[in_horizon].astype(int), weights=call_amounts[in_horizon],
+                                         minlength=n_years)
             # Set committed capital to total commitment for investment period, then zero (or could be cumulative called for post-investment period)
             investment_period = self.capital_call_schedule.investment_period_years
             committed_capital[:investment_period+1] = self.capital_call_schedule.total_commitment
@@ -184,6 +262,19 @@ class FinancialModel:
             
             # Calculate net value
             net_value[year] = investment_value[year] - management_fees[year] - performance_fees[year]
+
+        # With a waterfall, carry is paid out of the harvest-year distributions instead
+        fees = self.fee_structure
+        if fees.waterfall:
+            performance_fees = waterfall_performance_fees(called_capital, investment_value[-1], fees.hurdle_rate,
+                                                          fees.performance_fee, fees.catch_up, fees.clawback)
+        elif fees.performance_fee_timing == 'harvest':
+            hurdle_base = cumulative_called if self.capital_call_schedule else np.full(n_years, self.initial_investment)
+            performance_fees = harvest_performance_fees(investment_value, hurdle_base, fees.hurdle_rate,
+                                                        fees.performance_fee)
+        if fees.waterfall or fees.performance_fee_timing != 'final':
+            # Fees paid in earlier years have left the fund, so net value is after all performance fees to date
+            net_value[1:] = investment_value[1:] - management_fees[1:] - np.cumsum(performance_fees)[1:]
         
         # Create DataFrame with all metrics
         df = pd.DataFrame({
@@ -207,7 +298,7 @@ class FinancialModel:
         gross_cash_flows[0] = -cumulative_called[0]
         net_cash_flows[0] = -cumulative_called[0]
         # Distribute final value over harvest years (years 4-10)
-        harvest_start = 4
+        harvest_start = HARVEST_START
         harvest_years = n_years - harvest_start
         if harvest_years > 0:
             gross_dist = (investment_value[-1] - cumulative_called[0]) / harvest_years
@@ -215,20 +306,9 @@ class FinancialModel:
             for i in range(harvest_start, n_years):
                 gross_cash_flows[i] = gross_dist
                 net_cash_flows[i] = net_dist
-        # Calculate IRR for each year using cash flows up to that year
-        gross_irr = []
-        net_irr = []
-        for year in range(n_years):
-            try:
-                gross_irr.append(npf.irr(gross_cash_flows[:year+1]))
-            except:
-                gross_irr.append(np.nan)
-            try:
-                net_irr.append(npf.irr(net_cash_flows[:year+1]))
-            except:
-                net_irr.append(np.nan)
-        df['Gross_IRR'] = gross_irr
-        df['Net_IRR'] = net_irr
+        # Calculate IRR for each year using cash flows up to that year (NaN where none exists)
+        df['Gross_IRR'] = prefix_irr(gross_cash_flows)
+        df['Net_IRR'] = prefix_irr(net_cash_flows)
         
         # Calculate MOIC
         df['Gross_MOIC'] = df['Cumulative_Gross'] / cumulative_called[0]
@@ -248,13 +328,100 @@ class FinancialModel:
         
         return df
 
-    def get_summary_metrics(self) -> Dict[str, float]:
-        """Get summary metrics for the investment."""
-        final_row = self.results.iloc[-1]
+    def _calculate_timeline(self) -> pd.DataFrame:
+        """Quarterly LP cash flows of results, dated from start_date.
+
+        Calls land in the quarter they are made (several calls in one quarter
+        are summed). Everything else is results' annual amounts spread evenly
+        over the quarters of their year: the harvest distributions of the
+        final gross value (the same distributions the waterfall is run on),
+        management fees, paid on top of the calls, and performance fees, paid
+        out of the distributions. So per year the two agree on distributions,
+        fees and carry. A final-year performance fee larger than that year's
+        distributions makes its net distributions negative.
+
+        Gross NAV is the capital called to date plus results' gain on it
+        (interpolated linearly between year ends), less the distributions to
+        date. Carry accrues in proportion to the gain earned so far, and
+        Net NAV is Gross NAV less the accrued carry not yet paid; it goes
+        negative when a final performance fee is owed on value that has
+        already been distributed. Management fees are paid as they fall due,
+        so none are accrued in the NAV.
+        """
+        ppy = TIMELINE_PERIODS_PER_YEAR
+        results = self.results
+        n_years = len(results) - 1
+        n_periods = n_years * ppy + 1
+        periods = np.arange(n_periods)
+        dates = pd.date_range(self.start_date, periods=n_periods, freq=pd.DateOffset(months=12 // ppy))
+
+        if self.capital_call_schedule:
+            call_times, call_amounts = self.capital_call_schedule.call_times()
+            call_periods = np.rint(call_times * ppy).astype(int)
+            in_horizon = call_periods < n_periods
+            calls = np.bincount(call_periods[in_horizon], weights=call_amounts[in_horizon], minlength=n_periods)
+        else:
+            calls = np.where(periods == 0, float(self.initial_investment), 0.0)
+
+        def quarterly(annual):
+            # Year y's amount over periods (y - 1) * ppy + 1 to y * ppy; year 0 has none
+            amounts = np.zeros(n_periods)
+            amounts[1:] = np.repeat(np.asarray(annual, dtype=np.float64)[1:] / ppy, ppy)
+            return amounts
+
+        gross_value = results['Gross_Return'].to_numpy()
+        annual_distributions = np.where(results['Year'] >= HARVEST_START,
+                                        gross_value[-1] / (n_years + 1 - HARVEST_START), 0.0)
+        gross_distributions = quarterly(annual_distributions)
+        management_fees = quarterly(results['Management_Fee'])
+        carry = quarterly(results['Performance_Fee'])
+        net_distributions = gross_distributions - carry
+
+        # Gain over the capital called, interpolated between results' year ends
+        gain = np.interp(periods / ppy, results['Year'], gross_value - results['Cumulative_Called'])
+        nav = np.cumsum(calls) + gain - np.cumsum(gross_distributions)
+        # Carry accrues with the gain; what has not been paid yet is still owed out of the NAV
+        total_gain = gain[-1]
+        earned = np.clip(gain / total_gain, 0.0, 1.0) if total_gain > 0 else np.zeros(n_periods)
+        accrued_carry = np.maximum(carry.sum() * earned - np.cumsum(carry), 0.0)
+
+        timeline = pd.DataFrame({
+            'Date': dates,
+            'Year': periods / ppy,
+            'Called_Capital': calls,
+            'Management_Fee': management_fees,
+            'Gross_Distribution': gross_distributions,
+            'Performance_Fee': carry,
+            'Net_Distribution': net_distributions,
+            'Gross_NAV': nav,
+            'Accrued_Carry': accrued_carry,
+            'Net_NAV': nav - accrued_carry,
+            'Gross_Cash_Flow': gross_distributions - calls,
+            'Net_Cash_Flow': net_distributions - calls - management_fees
+        })
+        timeline['Cumulative_Net_Cash_Flow'] = timeline['Net_Cash_Flow'].cumsum()
+        return timeline
+
+    def get_xirr(self, currency: Optional[Currency] = None, fx: Optional[FXRates] = None) -> Dict[str, float]:
+        """Gross and net IRR of the dated timeline (XIRR convention: actual days / 365).
+
+        With a currency, the flows are converted at their dates first, so the
+        result includes the FX gains or losses of an investor in that currency.
+        """
+        timeline = self.timeline if currency is None else self.timeline_in(currency, fx)
+        times = (timeline['Date'] - timeline['Date'].iloc[0]).dt.days.to_numpy() / 365.0
+        flows = timeline[['Gross_Cash_Flow', 'Net_Cash_Flow']].to_numpy().T
+        gross_xirr, net_xirr = irr(flows, times)
+        return {'Gross_XIRR': float(gross_xirr), 'Net_XIRR': float(net_xirr)}
+
+    def get_summary_metrics(self, currency: Optional[Currency] = None, fx: Optional[FXRates] = None) -> Dict[str, float]:
+        """Get summary metrics for the investment (amounts in currency when given)."""
+        results = self.results if currency is None else self.results_in(currency, fx)
+        final_row = results.iloc[-1]
         return {
             'Final_Gross_Return': final_row['Cumulative_Gross'],
             'Final_Net_Return': final_row['Cumulative_Net'],
-            'Total_Fees': self.results['Management_Fee'].sum() + self.results['Performance_Fee'].sum(),
+            'Total_Fees': results['Management_Fee'].sum() + results['Performance_Fee'].sum(),
             'Final_Gross_IRR': final_row['Gross_IRR'],
             'Final_Net_IRR': final_row['Net_IRR'],
             'Final_Gross_MOIC': final_row['Gross_MOIC'],
@@ -315,6 +482,54 @@ class FinancialModel:
         plt.tight_layout()
         plt.show()
 
+def waterfall_performance_fees(called_capital, final_value, preferred_return, carried_interest,
+                               catch_up=1.0, clawback=True):
+    """Carry per year when the final value is distributed evenly over the harvest years.
+
+    called_capital has years on the last axis (leading axes are models);
+    final_value and the rates broadcast against the leading axes. The model
+    has a single investment, so the european and american waterfalls give
+    the same carry and the whole-fund calculation is used for both.
+    """
+    called_capital = np.asarray(called_capital, dtype=np.float64)
+    n_years = called_capital.shape[-1]
+    distributions = np.zeros_like(called_capital)
+    distributions[..., HARVEST_START:] = (np.asarray(final_value) / (n_years - HARVEST_START))[..., None]
+    _, carry = european_waterfall(called_capital, distributions, preferred_return, carried_interest, catch_up)
+    _, clawed_back = european_waterfall(called_capital, distributions, preferred_return, carried_interest, catch_up,
+                                        clawback=True)
+    return np.where(np.asarray(clawback)[..., None], clawed_back, carry)
+
+def harvest_performance_fees(gross_value, hurdle_base, hurdle_rate, performance_fee):
+    """Performance fee on each harvest year's gain above hurdle_rate * hurdle_base.
+
+    Years are on the last axis of gross_value and hurdle_base; the rates
+    broadcast against the leading (model) axes.
+    """
+    gross_value = np.asarray(gross_value, dtype=np.float64)
+    hurdle = np.asarray(hurdle_base) * np.asarray(hurdle_rate)[..., None]
+    gain = np.diff(gross_value, axis=-1, prepend=0.0)
+    fees = np.maximum(0, gain - hurdle) * np.asarray(performance_fee)[..., None]
+    fees[..., :HARVEST_START] = 0
+    return fees
+
+@lru_cache(maxsize=128)
+def get_model(
+    initial_investment: float = 1000,
+    currency: Currency = Currency.USD,
+    fee_structure: Optional[FeeStructure] = None,
+    performance_metrics: Optional[PerformanceMetrics] = None,
+    capital_call_schedule: Optional[CapitalCallSchedule] = None,
+    start_date: Optional[pd.Timestamp] = None
+) -> FinancialModel:
+    """FinancialModel shared across Streamlit reruns and sessions for identical inputs.
+
+    Every argument is hashable, so an unchanged parameter set returns the
+    same model, whose results are already computed.
+    """
+    return FinancialModel(initial_investment, currency, fee_structure, performance_metrics, capital_call_schedule,
+                          start_date)
+
 def main():
     # Example usage
     model = FinancialModel(
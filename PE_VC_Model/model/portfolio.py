@@ -0,0 +1,189 @@
+"""Portfolio of LP fund commitments on one dated quarterly timeline.
+
+Each commitment is modelled with FinancialModel's quarterly timeline, which
+is linear in the commitment. So the flows come from a cached per-unit model
+and are scaled. Every fund is a row of a (funds, periods) array aligned on
+vintage and converted to the base currency. Pooled metrics come from the
+column sums, which update_commitment adjusts in place when one fund
+changes.
+
+Metrics are as of each quarter on the pooled book: IRR, DPI, RVPI and TVPI.
+NAV is net of the carry each fund has accrued but not yet paid, so RVPI and
+TVPI are what the LP holds. PME is the Kaplan-Schoar public market
+equivalent against an index.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .output import CapitalCallSchedule, Currency, FeeStructure, PerformanceMetrics, TIMELINE_PERIODS_PER_YEAR, get_model
+from finance_utils import irr
+
+# Fixed date for the per-unit models, so funds with the same terms share one cached model
+_UNIT_START = pd.Timestamp('2000-01-01')
+
+@dataclass(frozen=True)
+class FundCommitment:
+    """One LP commitment; amounts are in the fund's currency."""
+    name: str
+    vintage: int  # year of the first capital call (calls start on 1 January)
+    commitment: float
+    currency: Currency = Currency.GBP
+    fee_structure: FeeStructure = field(default_factory=FeeStructure)
+    performance_metrics: PerformanceMetrics = field(
+        default_factory=lambda: PerformanceMetrics(target_irr=0.15, moic=2.0, mm=2.5, tvpi=2.5))
+    investment_period_years: int = 3
+    call_frequency: str = 'quarterly'
+
+def unit_cash_flows(fund: FundCommitment) -> np.ndarray:
+    """(contributions, distributions, net NAV) per quarter for a commitment of 1, stacked as rows."""
+    model = get_model(1.0, fund.currency, fund.fee_structure, fund.performance_metrics,
+                      CapitalCallSchedule(1.0, fund.investment_period_years, fund.call_frequency), _UNIT_START)
+    timeline = model.timeline
+    contributions = timeline['Called_Capital'] + timeline['Management_Fee']
+    return np.vstack([contributions, timeline['Net_Distribution'], timeline['Net_NAV']])
+
+class Portfolio:
+    """Pooled cash flows and metrics for many commitments, in base_currency.
+
+    fx_rates maps each fund currency to base-currency units per unit of that
+    currency; the base currency itself does not need an entry.
+    """
+
+    def __init__(self, commitments: Sequence[FundCommitment], base_currency: Currency = Currency.GBP,
+                 fx_rates: Optional[Dict[Currency, float]] = None):
+        self.base_currency = base_currency
+        self.fx_rates = dict(fx_rates or {})
+        self.fx_rates[base_currency] = 1.0
+        self._build(list(commitments))
+
+    def _fx_rate(self, currency: Currency) -> float:
+        try:
+            return self.fx_rates[currency]
+        except KeyError:
+            raise ValueError(f"No FX rate from {currency.value} to {self.base_currency.value}") from None
+
+    def _fund_flows(self, fund: FundCommitment) -> np.ndarray:
+        if fund.commitment <= 0:
+            raise ValueError(f"Commitment to {fund.name} must be positive")
+        return unit_cash_flows(fund) * (fund.commitment * self._fx_rate(fund.currency))
+
+    def _build(self, commitments):
+        if not commitments:
+            raise ValueError("A portfolio needs at least one commitment")
+        self.commitments = commitments
+        flows = [self._fund_flows(fund) for fund in commitments]
+        fund_periods = flows[0].shape[1]
+        self.start_year = min(fund.vintage for fund in commitments)
+        self.offsets = np.array([(fund.vintage - self.start_year) * TIMELINE_PERIODS_PER_YEAR for fund in commitments])
+        n_periods = self.offsets.max() + fund_periods
+
+        # (flow type, fund, period): each fund's timeline placed at its vintage offset
+        self.fund_flows = np.zeros((3, len(commitments), n_periods))
+        rows = np.arange(len(commitments))[:, None]
+        columns = self.offsets[:, None] + np.arange(fund_periods)
+        self.fund_flows[:, rows, columns] = np.stack(flows, axis=1)
+        self.pooled_flows = self.fund_flows.sum(axis=1)
+
+        self.dates = pd.date_range(pd.Timestamp(year=self.start_year, month=1, day=1), periods=n_periods,
+                                   freq=pd.DateOffset(months=12 // TIMELINE_PERIODS_PER_YEAR))
+        # Years since the first date, actual days / 365 as in FinancialModel.get_xirr
+        self.times = (self.dates - self.dates[0]).days.to_numpy() / 365.0
+
+    def update_commitment(self, index: int, fund: FundCommitment):
+        """Replace one commitment, adjusting the pooled flows instead of rebuilding the book."""
+        offset = (fund.vintage - self.start_year) * TIMELINE_PERIODS_PER_YEAR
+        flows = self._fund_flows(fund)
+        if offset < 0 or offset + flows.shape[1] > self.fund_flows.shape[2]:
+            # Outside the current timeline: rebuild on a new one
+            commitments = list(self.commitments)
+            commitments[index] = fund
+            self._build(commitments)
+            return
+        self.pooled_flows -= self.fund_flows[:, index]
+        self.fund_flows[:, index] = 0.0
+        self.fund_flows[:, index, offset:offset + flows.shape[1]] = flows
+        self.pooled_flows += self.fund_flows[:, index]
+        self.commitments[index] = fund
+        self.offsets[index] = offset
+
+    @property
+    def contributions(self) -> np.ndarray:
+        return self.pooled_flows[0]
+
+    @property
+    def distributions(self) -> np.ndarray:
+        return self.pooled_flows[1]
+
+    @property
+    def nav(self) -> np.ndarray:
+        """Net NAV: gross NAV less accrued, unpaid carry."""
+        return self.pooled_flows[2]
+
+    def timeline(self) -> pd.DataFrame:
+        """Pooled flows and multiples as of each quarter."""
+        paid_in = np.cumsum(self.contributions)
+        distributed = np.cumsum(self.distributions)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dpi = np.where(paid_in > 0, distributed / paid_in, np.nan)
+            rvpi = np.where(paid_in > 0, self.nav / paid_in, np.nan)
+        return pd.DataFrame({
+            'Date': self.dates,
+            'Contributions': self.contributions,
+            'Distributions': self.distributions,
+            'NAV': self.nav,
+            'Paid_In': paid_in,
+            'Distributed': distributed,
+            'DPI': dpi,
+            'RVPI': rvpi,
+            'TVPI': dpi + rvpi
+        })
+
+    def pooled_irr(self) -> float:
+        """IRR of the pooled flows, with the final NAV as a terminal distribution."""
+        flows = self.distributions - self.contributions
+        flows[-1] += self.nav[-1]
+        return float(irr(flows, self.times))
+
+    def fund_irrs(self) -> np.ndarray:
+        """IRR of every fund on its own flows, solved for all funds at once."""
+        contributions, distributions, nav = self.fund_flows
+        flows = distributions - contributions
+        flows[:, -1] += nav[:, -1]
+        return irr(flows, self.times)
+
+    def pme(self, index_levels) -> float:
+        """Kaplan-Schoar PME of the pooled book against index levels.
+
+        index_levels is a Series indexed by date (forward-filled onto the
+        timeline) or an array with one level per period. Above 1 means the
+        book beat the index.
+        """
+        if isinstance(index_levels, pd.Series):
+            levels = index_levels.sort_index().reindex(self.dates, method='ffill').to_numpy(np.float64)
+        else:
+            levels = np.asarray(index_levels, dtype=np.float64)
+        if levels.shape != self.dates.shape or np.isnan(levels).any():
+            raise ValueError("Index levels must cover every date of the portfolio timeline")
+        growth = levels[-1] / levels
+        return float((np.sum(self.distributions * growth) + self.nav[-1]) / np.sum(self.contributions * growth))
+
+    def summary(self, index_levels=None) -> Dict[str, float]:
+        """Pooled metrics as of the last date; PME only when index levels are given."""
+        final = self.timeline().iloc[-1]
+        metrics = {
+            'Total_Commitment': float(sum(fund.commitment * self._fx_rate(fund.currency)
+                                          for fund in self.commitments)),
+            'Paid_In': final['Paid_In'],
+            'Distributed': final['Distributed'],
+            'NAV': final['NAV'],
+            'IRR': self.pooled_irr(),
+            'DPI': final['DPI'],
+            'RVPI': final['RVPI'],
+            'TVPI': final['TVPI']
+        }
+        if index_levels is not None:
+            metrics['PME'] = self.pme(index_levels)
+        return metrics
@@ -0,0 +1,155 @@
+"""Stochastic PE/VC fund simulator: J-curves and TVPI/DPI/IRR ranges instead of one path.
+
+Each simulated fund makes n_deals equal-sized investments at random times
+in its investment period. Each deal is written off with probability
+loss_rate, otherwise it exits at a lognormal multiple of cost after a random
+holding period. Capital is called when a deal is made and management fees
+are called on top. Exit proceeds go through the fund's waterfall
+(FeeStructure.waterfall, european when unset; performance_fee is the carry,
+hurdle_rate the preferred return). Every fund, deal and period is an array
+axis, so thousands of funds take a few seconds.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .output import FeeStructure
+from .waterfall import cumulative_carry, preferred_return_accrued, run_waterfall
+from finance_utils import irr
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+@dataclass(frozen=True)
+class FundAssumptions:
+    """Deal-level assumptions shared by every simulated fund (times in years)."""
+    years: int = 12
+    periods_per_year: int = 4
+    investment_period_years: int = 4
+    n_deals: int = 15
+    loss_rate: float = 0.25
+    median_multiple: float = 2.2
+    multiple_volatility: float = 0.8  # sigma of log(multiple) for surviving deals
+    min_holding_years: float = 3.0
+    max_holding_years: float = 7.0
+
+@dataclass
+class SimulationResult:
+    """Per-fund LP cash flows and metrics; arrays are (funds, periods) unless noted.
+
+    Amounts are in units of commitment. Period k ends at times[k] years.
+    """
+    times: np.ndarray                 # (periods,)
+    contributions: np.ndarray         # deal calls plus management fees
+    management_fees: np.ndarray
+    gross_distributions: np.ndarray
+    lp_distributions: np.ndarray
+    carry: np.ndarray
+    nav: np.ndarray                   # gross NAV of unrealized deals
+    dpi: np.ndarray
+    tvpi: np.ndarray                  # LP share of distributions plus NAV, net of accrued carry
+    irr: np.ndarray                   # (funds,) annual net IRR, NaN where undefined
+
+    @property
+    def net_cash_flows(self):
+        return self.lp_distributions - self.contributions
+
+    @property
+    def j_curve(self):
+        """Cumulative LP net cash flow, as a fraction of commitment."""
+        return np.cumsum(self.net_cash_flows, axis=-1)
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """Percentile bands of the J-curve, DPI and TVPI over time, and of the final IRR."""
+        return {
+            'j_curve': np.percentile(self.j_curve, percentiles, axis=0).T,
+            'dpi': np.percentile(self.dpi, percentiles, axis=0).T,
+            'tvpi': np.percentile(self.tvpi, percentiles, axis=0).T,
+            'irr': np.nanpercentile(self.irr, percentiles)
+        }
+
+def simulate_funds(n_funds: int = 5000, fee_structure: Optional[FeeStructure] = None,
+                   assumptions: Optional[FundAssumptions] = None, commitment: float = 1.0,
+                   seed: Optional[int] = None) -> SimulationResult:
+    """Simulate n_funds independent funds; the same seed gives the same funds."""
+    fee_structure = fee_structure or FeeStructure()
+    a = assumptions or FundAssumptions()
+    rng = np.random.default_rng(seed)
+    ppy = a.periods_per_year
+    n_periods = a.years * ppy + 1
+    times = np.arange(n_periods) / ppy
+    shape = (n_funds, a.n_deals)
+
+    # Deal timing and outcomes
+    deal_cost = commitment / a.n_deals
+    entry = rng.integers(0, a.investment_period_years * ppy, shape)
+    holding = np.maximum(np.rint(rng.uniform(a.min_holding_years, a.max_holding_years, shape) * ppy), 1).astype(int)
+    exit_ = np.minimum(entry + holding, n_periods - 1)
+    survives = rng.random(shape) >= a.loss_rate
+    multiple = np.where(survives, a.median_multiple * np.exp(a.multiple_volatility * rng.standard_normal(shape)), 0.0)
+
+    # Sum deal cash flows into (fund, period) buckets in one pass
+    fund = np.arange(n_funds)[:, None]
+    calls = np.bincount((fund * n_periods + entry).ravel(), minlength=n_funds * n_periods)
+    proceeds = np.bincount((fund * n_periods + exit_).ravel(), weights=(deal_cost * multiple).ravel(),
+                           minlength=n_funds * n_periods)
+    deal_calls = (calls * deal_cost).reshape(n_funds, n_periods)
+    gross_distributions = proceeds.reshape(n_funds, n_periods)
+
+    # Unrealized deals are marked from cost towards their exit value geometrically
+    t = np.arange(n_periods)
+    alive = (entry[..., None] <= t) & (t < exit_[..., None])
+    progress = np.clip((t - entry[..., None]) / (exit_ - entry)[..., None], 0, 1)
+    deal_nav = np.where(alive, deal_cost * multiple[..., None] ** progress, 0.0)
+    nav = deal_nav.sum(axis=1)
+    invested_cost = alive.sum(axis=1) * deal_cost
+
+    # Management fee on commitments in the investment period, then on invested cost
+    in_investment_period = times < a.investment_period_years
+    fee_base = np.where(in_investment_period, commitment, invested_cost)
+    management_fees = fee_base * fee_structure.management_fee / ppy
+    contributions = deal_calls + management_fees
+
+    # Deal-level flows for the waterfall; management fees are shared equally by the deals
+    t = t[None, None, :]
+    deal_contributions = (np.where(entry[..., None] == t, deal_cost, 0.0)
+                          + (management_fees / a.n_deals)[:, None, :])
+    deal_distributions = np.where(exit_[..., None] == t, (deal_cost * multiple)[..., None], 0.0)
+    lp_distributions, carry = run_waterfall(
+        fee_structure.waterfall or 'european', deal_contributions, deal_distributions,
+        fee_structure.hurdle_rate, fee_structure.performance_fee, fee_structure.catch_up,
+        periods_per_year=ppy, clawback=fee_structure.clawback
+    )
+
+    # Value the NAV as if liquidated today, so TVPI is net of carry that would be due on it
+    contributed = np.cumsum(contributions, axis=1)
+    distributed = np.cumsum(gross_distributions, axis=1)
+    accrued = preferred_return_accrued(contributions, gross_distributions, fee_structure.hurdle_rate, ppy)
+    carry_on_liquidation = cumulative_carry(distributed + nav, contributed, accrued, fee_structure.performance_fee,
+                                            fee_structure.catch_up)
+    if fee_structure.waterfall == 'american':
+        # Deal by deal, each deal's NAV earns carry only on that deal; clawback caps the total at the whole fund's
+        deal_accrued = preferred_return_accrued(deal_contributions, deal_distributions, fee_structure.hurdle_rate, ppy)
+        deal_carry = cumulative_carry(np.cumsum(deal_distributions, axis=-1) + deal_nav,
+                                      np.cumsum(deal_contributions, axis=-1), deal_accrued,
+                                      fee_structure.performance_fee, fee_structure.catch_up).sum(axis=1)
+        carry_on_liquidation = (np.minimum(deal_carry, carry_on_liquidation) if fee_structure.clawback
+                                else deal_carry)
+    lp_value = np.maximum(distributed + nav - np.maximum(carry_on_liquidation, np.cumsum(carry, axis=1)), 0)
+    lp_distributed = np.cumsum(lp_distributions, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dpi = np.where(contributed > 0, lp_distributed / contributed, 0.0)
+        tvpi = np.where(contributed > 0, lp_value / contributed, 0.0)
+
+    return SimulationResult(
+        times=times,
+        contributions=contributions,
+        management_fees=management_fees,
+        gross_distributions=gross_distributions,
+        lp_distributions=lp_distributions,
+        carry=carry,
+        nav=nav,
+        dpi=dpi,
+        tvpi=tvpi,
+        irr=irr(lp_distributions - contributions, times)
+    )
@@ -0,0 +1,119 @@
+"""Distribution waterfall between LPs and the GP, vectorized over funds and periods.
+
+Tiers, in order: return of contributed capital, a simple preferred return on
+unreturned capital, the GP catch-up and the carried-interest split. Each
+tier is applied to cumulative distributions, so a whole (funds, periods)
+array is allocated without looping over periods.
+
+Two styles:
+
+* european (whole fund): carry is earned on the fund's aggregate flows;
+* american (deal by deal): carry is earned on each deal's own flows, so a
+  winning deal pays carry even while other deals lose money. With clawback
+  the GP returns, at the end of the fund, any carry above its whole-fund
+  entitlement.
+"""
+import numpy as np
+
+WATERFALL_STYLES = ('european', 'american')
+
+def preferred_return_accrued(contributions, distributions, preferred_return, periods_per_year=1):
+    """Cumulative simple preferred return owed at the end of each period.
+
+    The return accrues on capital not yet returned (cumulative contributions
+    less the return-of-capital tier) at preferred_return per year.
+    """
+    contributed = np.cumsum(contributions, axis=-1)
+    returned = np.minimum(np.cumsum(distributions, axis=-1), contributed)
+    outstanding = contributed - returned
+    accrued = np.cumsum(outstanding, axis=-1) * (np.asarray(preferred_return)[..., None] / periods_per_year)
+    # Capital outstanding during a period earns the return from the next period on
+    return np.concatenate([np.zeros_like(accrued[..., :1]), accrued[..., :-1]], axis=-1)
+
+def cumulative_carry(cumulative_distributions, cumulative_contributions, preferred_accrued,
+                     carried_interest, catch_up=1.0):
+    """GP share of cumulative distributions under the waterfall tiers.
+
+    catch_up is the GP's share of the catch-up tier (1.0 is a full catch-up,
+    0 means no catch-up). Rates broadcast against the leading axes.
+    """
+    carried_interest = np.asarray(carried_interest, dtype=np.float64)[..., None]
+    catch_up = np.asarray(catch_up, dtype=np.float64)[..., None]
+
+    above_capital = np.maximum(cumulative_distributions - cumulative_contributions, 0)
+    preferred_paid = np.minimum(above_capital, preferred_accrued)
+    above_preferred = above_capital - preferred_paid
+
+    # The catch-up ends once the GP holds carried_interest of all profit paid out
+    with np.errstate(divide='ignore', invalid='ignore'):
+        catch_up_size = np.where(catch_up > carried_interest,
+                                 carried_interest * preferred_paid / (catch_up - carried_interest), 0.0)
+    caught_up = np.minimum(above_preferred, catch_up_size)
+    return catch_up * caught_up + carried_interest * (above_preferred - caught_up)
+
+def _paid_carry(contributions, distributions, preferred_return, carried_interest, catch_up, periods_per_year):
+    """Carry paid per period when every entitlement is paid as soon as it arises (and kept)."""
+    accrued = preferred_return_accrued(contributions, distributions, preferred_return, periods_per_year)
+    entitled = cumulative_carry(np.cumsum(distributions, axis=-1), np.cumsum(contributions, axis=-1),
+                                accrued, carried_interest, catch_up)
+    paid = np.maximum.accumulate(entitled, axis=-1)
+    return np.diff(paid, axis=-1, prepend=0.0), entitled[..., -1]
+
+def _claw_back(carry, entitlement):
+    """Return carry above the final whole-fund entitlement in the last period."""
+    excess = np.maximum(carry.sum(axis=-1) - entitlement, 0)
+    carry = carry.copy()
+    carry[..., -1] -= excess
+    return carry
+
+def european_waterfall(contributions, distributions, preferred_return, carried_interest, catch_up=1.0,
+                       periods_per_year=1, clawback=False):
+    """Split per-period gross distributions into LP distributions and GP carry (whole-fund basis).
+
+    contributions and distributions have periods on the last axis; the rates
+    broadcast against the leading (fund) axes. Carry is paid as soon as the
+    cumulative tiers allow. Without clawback it is never returned; with
+    clawback any excess over the final entitlement (e.g. after later
+    contributions) is repaid in the last period.
+    """
+    contributions = np.asarray(contributions, dtype=np.float64)
+    distributions = np.asarray(distributions, dtype=np.float64)
+    carry, entitlement = _paid_carry(contributions, distributions, preferred_return, carried_interest,
+                                     catch_up, periods_per_year)
+    if clawback:
+        carry = _claw_back(carry, entitlement)
+    return distributions - carry, carry
+
+def american_waterfall(deal_contributions, deal_distributions, preferred_return, carried_interest, catch_up=1.0,
+                       periods_per_year=1, clawback=True):
+    """Deal-by-deal waterfall; deals are on the second-to-last axis, periods on the last.
+
+    Returns fund-level (LP distributions, carry) with the deal axis summed
+    out. Rates broadcast against the fund axes. With clawback, total carry is
+    capped at the european entitlement of the fund's combined flows, and the
+    excess is repaid in the last period.
+    """
+    deal_contributions = np.asarray(deal_contributions, dtype=np.float64)
+    deal_distributions = np.asarray(deal_distributions, dtype=np.float64)
+    # Fund-level rates get a deal axis so they broadcast against (funds, deals)
+    deal_rates = [np.asarray(rate, dtype=np.float64)[..., None]
+                  for rate in (preferred_return, carried_interest, catch_up)]
+    deal_carry, _ = _paid_carry(deal_contributions, deal_distributions, *deal_rates, periods_per_year)
+    carry = deal_carry.sum(axis=-2)
+    distributions = deal_distributions.sum(axis=-2)
+    if clawback:
+        _, entitlement = _paid_carry(deal_contributions.sum(axis=-2), distributions, preferred_return,
+                                     carried_interest, catch_up, periods_per_year)
+        carry = _claw_back(carry, entitlement)
+    return distributions - carry, carry
+
+def run_waterfall(style, deal_contributions, deal_distributions, preferred_return, carried_interest,
+                  catch_up=1.0, periods_per_year=1, clawback=True):
+    """Either waterfall on deal-level flows (deals on the second-to-last axis)."""
+    if style == 'american':
+        return american_waterfall(deal_contributions, deal_distributions, preferred_return, carried_interest,
+                                  catch_up, periods_per_year, clawback)
+    if style == 'european':
+        return european_waterfall(np.sum(deal_contributions, axis=-2), np.sum(deal_distributions, axis=-2),
+                                  preferred_return, carried_interest, catch_up, periods_per_year, clawback)
+    raise ValueError(f"Unknown waterfall style {style!r}; expected one of {WATERFALL_STYLES}")
@@ -0,0 +1,8 @@
+import pytest
+
+from model import cache
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    """Compute every model afresh instead of loading results cached by the apps."""
+    monkeypatch.setattr(cache, 'CACHE_DIR', '')
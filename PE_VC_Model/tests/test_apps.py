@@ -0,0 +1,77 @@
+"""The Streamlit apps under streamlit's AppTest, and the get_model cache they share."""
+import os
+
+import pytest
+
+from model import CapitalCallSchedule, FeeStructure, FinancialModel, PerformanceMetrics, cache, get_model
+
+testing = pytest.importorskip('streamlit.testing.v1')
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _run(app, **checkboxes):
+    at = testing.AppTest.from_file(os.path.join(APP_DIR, app), default_timeout=120).run()
+    for label, value in checkboxes.items():
+        next(c for c in at.sidebar.checkbox if c.label == label).set_value(value)
+        at.run()
+    return at
+
+def _metrics(at):
+    return {metric.label: metric.value for metric in at.metric}
+
+def test_app_metrics_match_default_model():
+    at = _run('app.py')
+    assert not at.exception
+    summary = FinancialModel().get_summary_metrics()
+    metrics = _metrics(at)
+    assert metrics['Final Gross Return'] == f"{summary['Final_Gross_Return']:,.2f} USD"
+    assert metrics['Final Net Return'] == f"{summary['Final_Net_Return']:,.2f} USD"
+    assert metrics['Total Fees Paid'] == f"{summary['Total_Fees']:,.2f} USD"
+    assert metrics['Final IRR'] == f"{summary['Final_Gross_IRR'] * 100:.2f}%"
+
+def test_feeapp_metrics_match_default_model():
+    at = _run('feeapp.py')
+    assert not at.exception
+    results = FinancialModel().results
+    metrics = _metrics(at)
+    assert metrics['Final Gross Return'] == f"{results['Gross_Return'].iloc[-1]:,.2f} USD"
+    assert metrics['Final Net Return'] == f"{results['Net_Return'].iloc[-1]:,.2f} USD"
+
+def test_output_app_value_matches_harvest_timed_model():
+    at = _run(os.path.join('Ouput_Model', 'app.py'))
+    assert not at.exception
+    results = FinancialModel(fee_structure=FeeStructure(performance_fee_timing='harvest')).results
+    assert _metrics(at)['Value With Fees'] == f"{results['Net_Return'].iloc[-1]:,.2f} USD"
+
+@pytest.mark.parametrize('app', ['app.py', 'feeapp.py', os.path.join('Ouput_Model', 'app.py')])
+def test_apps_show_the_same_metrics_from_a_cold_and_a_warm_disk_cache(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path))
+    get_model.cache_clear()
+    cold = _metrics(_run(app))
+    assert os.listdir(tmp_path)
+    get_model.cache_clear()
+    warm = _metrics(_run(app))
+    assert warm == cold
+
+@pytest.mark.parametrize('checkboxes', [
+    {'Use Capital Calls': True},
+    {'Solve for a target': True},
+    {'Use Capital Calls': True, 'Solve for a target': True},
+], ids=str)
+def test_app_modes_run_without_exceptions(checkboxes):
+    assert not _run('app.py', **checkboxes).exception
+
+def test_get_model_shares_models_for_identical_inputs():
+    fees = FeeStructure(0.015, 0.25, 0.06)
+    metrics = PerformanceMetrics(0.2, 2.0, 2.5, 2.5)
+    schedule = CapitalCallSchedule(1000, 3, 'annual')
+    model = get_model(1000, fee_structure=fees, performance_metrics=metrics, capital_call_schedule=schedule)
+    assert get_model(1000, fee_structure=FeeStructure(0.015, 0.25, 0.06), performance_metrics=metrics,
+                     capital_call_schedule=CapitalCallSchedule(1000, 3, 'annual')) is model
+    assert get_model(1000, fee_structure=FeeStructure(0.02, 0.25, 0.06), performance_metrics=metrics,
+                     capital_call_schedule=schedule) is not model
+
+def test_results_are_computed_once_per_model():
+    model = get_model(2500, performance_metrics=PerformanceMetrics(0.1, 2.0, 2.5, 2.5))
+    assert model.results is model.results
+    assert get_model(2500, performance_metrics=PerformanceMetrics(0.1, 2.0, 2.5, 2.5)).results is model.results
@@ -0,0 +1,48 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from model import BatchFinancialModel, CapitalCallSchedule, FeeStructure, FinancialModel, PerformanceMetrics
+
+FEES = [FeeStructure(management_fee, 0.2, hurdle, waterfall=waterfall, performance_fee_timing=timing)
+        for management_fee, hurdle, waterfall, timing in itertools.product(
+            [0.0, 0.02], [0.0, 0.08], [None, 'european'], ['final', 'harvest'])]
+METRICS = [PerformanceMetrics(target_irr, 2.0, 2.5, 2.5) for target_irr in (-0.1, 0.15, 0.4)]
+SCHEDULES = [None, CapitalCallSchedule(1000, 3, 'annual')]
+# Both waterfall styles with every catch-up and clawback setting: 576 cases with METRICS and SCHEDULES
+WATERFALL_FEES = [FeeStructure(management_fee, performance_fee, hurdle, waterfall=waterfall, catch_up=catch_up,
+                               clawback=clawback)
+                  for waterfall, catch_up, clawback, management_fee, performance_fee, hurdle in itertools.product(
+                      ['european', 'american'], [0.0, 0.5, 1.0], [True, False], [0.0, 0.02], [0.2, 0.3], [0.0, 0.08])]
+# Fee levels against every call frequency and investment period: 1,296 cases with METRICS
+LEVEL_FEES = [FeeStructure(management_fee, performance_fee, hurdle)
+              for management_fee, performance_fee, hurdle in itertools.product(
+                  [0.0, 0.015, 0.03], [0.0, 0.2, 0.3], [0.0, 0.06, 0.1])]
+CALL_SCHEDULES = [None] + [CapitalCallSchedule(1000, period, frequency)
+                           for frequency in ('annual', 'semi-annual', 'quarterly') for period in range(1, 6)]
+
+def assert_batch_matches_financial_model(fee_structures, schedule):
+    cases = list(itertools.product(fee_structures, METRICS))
+    batch = BatchFinancialModel.from_models([1000] * len(cases), [f for f, _ in cases], [m for _, m in cases],
+                                            [schedule] * len(cases))
+    for index, (fees, metrics) in enumerate(cases):
+        expected = FinancialModel(1000, fee_structure=fees, performance_metrics=metrics,
+                                  capital_call_schedule=schedule, start_date='2025-01-01').results
+        actual = batch.frame(index)
+        for column in expected.columns:
+            np.testing.assert_allclose(actual[column], expected[column], rtol=1e-9, atol=1e-9, err_msg=column)
+
+@pytest.mark.parametrize('schedule', SCHEDULES)
+def test_batch_matches_financial_model(schedule):
+    assert_batch_matches_financial_model(FEES, schedule)
+
+@pytest.mark.parametrize('schedule', SCHEDULES)
+def test_batch_matches_financial_model_with_waterfalls(schedule):
+    assert len(WATERFALL_FEES) * len(METRICS) * len(SCHEDULES) == 576
+    assert_batch_matches_financial_model(WATERFALL_FEES, schedule)
+
+@pytest.mark.parametrize('schedule', CALL_SCHEDULES)
+def test_batch_matches_financial_model_for_every_call_schedule(schedule):
+    assert len(LEVEL_FEES) * len(METRICS) * len(CALL_SCHEDULES) == 1296
+    assert_batch_matches_financial_model(LEVEL_FEES, schedule)
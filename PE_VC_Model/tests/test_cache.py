@@ -0,0 +1,33 @@
+import importlib
+import os
+
+import pandas as pd
+
+from model import FeeStructure, FinancialModel, cache
+
+def _model(**fee_options):
+    return FinancialModel(fee_structure=FeeStructure(**fee_options), start_date='2025-01-01')
+
+def test_cache_is_off_unless_cache_dir_is_set(monkeypatch):
+    monkeypatch.delenv('PE_VC_CACHE_DIR', raising=False)
+    importlib.reload(cache)
+    assert cache.CACHE_DIR == ''
+    assert cache.load(cache.cache_key(1000, FeeStructure())) is None
+
+def test_cached_results_round_trip_exactly(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path))
+    computed = _model(waterfall='european').results
+    assert [name.endswith('.parquet') for name in os.listdir(tmp_path)] == [True]
+    loaded = _model(waterfall='european').results
+    pd.testing.assert_frame_equal(loaded, computed, check_exact=True)
+
+def test_cache_is_keyed_by_engine_source(monkeypatch):
+    key = cache.cache_key(1000, FeeStructure())
+    monkeypatch.setattr(cache, 'source_hash', lambda: 'edited engine')
+    assert cache.cache_key(1000, FeeStructure()) != key
+
+def test_clear_removes_cached_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path))
+    _model().results
+    cache.clear()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,114 @@
+"""FX rate histories and the per-period conversion of FinancialModel amounts."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model import CapitalCallSchedule, Currency, FeeStructure, FinancialModel, FXRates, load_fx_rates
+from model.fx import DEFAULT_RATES_PER_USD, MONETARY_COLUMNS
+
+# One euro rate per model year, so a conversion at the wrong date shows up as a wrong value
+YEAR_STARTS = pd.date_range('2025-01-01', periods=11, freq=pd.DateOffset(years=1))
+EUR_PER_USD = 0.80 + 0.02 * np.arange(11)
+FX = FXRates(YEAR_STARTS, {Currency.USD: np.ones(11), Currency.EUR: EUR_PER_USD,
+                           Currency.GBP: np.linspace(0.70, 0.90, 11)})
+
+ECB_HISTORY = """Date,USD,JPY,GBP,CYP,
+2025-01-03,1.0299,162.88,0.82940,N/A,
+2025-01-02,1.0321,163.11,0.82923,N/A,
+1999-01-05,1.1790,130.96,N/A,0.58230,
+1999-01-04,1.1789,133.73,0.71110,0.58231,
+"""
+
+def _model(**options):
+    return FinancialModel(fee_structure=FeeStructure(performance_fee_timing='harvest'), start_date='2025-01-01',
+                          **options)
+
+def test_rate_applies_from_its_date_until_the_next():
+    dates = ['2024-06-30', '2025-01-01', '2025-07-01', '2026-01-01', '2040-01-01']
+    np.testing.assert_allclose(FX.rate(Currency.USD, Currency.EUR, dates), [0.80, 0.80, 0.80, 0.82, 1.0])
+    np.testing.assert_allclose(FX.rate(Currency.USD, Currency.EUR), [1.0])
+
+def test_cross_rates_go_through_the_dollar():
+    np.testing.assert_allclose(FX.rate(Currency.GBP, Currency.EUR, YEAR_STARTS),
+                               EUR_PER_USD / np.linspace(0.70, 0.90, 11))
+
+def test_unsorted_or_non_positive_rates_are_rejected():
+    with pytest.raises(ValueError, match='increasing order'):
+        FXRates(['2026-01-01', '2025-01-01'], {Currency.USD: [1.0, 1.0]})
+    with pytest.raises(ValueError, match='positive'):
+        FXRates(['2025-01-01'], {Currency.USD: [1.0], Currency.EUR: [0.0]})
+
+def test_csv_round_trip(tmp_path):
+    path = tmp_path / 'rates.csv'
+    FX.to_csv(path)
+    loaded = FXRates.from_csv(path)
+    assert loaded.currencies == FX.currencies
+    pd.testing.assert_index_equal(loaded.dates, FX.dates, check_names=False)
+    np.testing.assert_allclose(loaded.rates, FX.rates)
+
+def test_ecb_history_is_rebased_to_dollars(tmp_path):
+    path = tmp_path / 'eurofxref-hist.csv'
+    path.write_text(ECB_HISTORY)
+    rates = FXRates.from_ecb_csv(path)
+    assert list(rates.dates.strftime('%Y-%m-%d')) == ['1999-01-04', '2025-01-02', '2025-01-03']
+    usd_per_eur = np.array([1.1789, 1.0321, 1.0299])
+    np.testing.assert_allclose(rates.rate(Currency.USD, Currency.EUR, rates.dates), 1 / usd_per_eur)
+    np.testing.assert_allclose(rates.rate(Currency.USD, Currency.GBP, rates.dates),
+                               np.array([0.71110, 0.82923, 0.82940]) / usd_per_eur)
+    np.testing.assert_allclose(rates.rate(Currency.USD, Currency.USD, rates.dates), 1.0)
+
+def test_load_fx_rates_rereads_only_a_changed_file(tmp_path):
+    path = str(tmp_path / 'rates.csv')
+    FX.to_csv(path)
+    first = load_fx_rates(path)
+    assert load_fx_rates(path) is first
+    FXRates.constant().to_csv(path)
+    os.utime(path, (0, os.path.getmtime(path) + 10))
+    assert load_fx_rates(path) is not first
+    np.testing.assert_allclose(load_fx_rates(path).rate(Currency.USD, Currency.EUR), [0.93])
+
+def test_missing_rate_file_falls_back_to_the_fixed_rates(tmp_path):
+    rates = load_fx_rates(str(tmp_path / 'missing.csv'))
+    for currency, rate in DEFAULT_RATES_PER_USD.items():
+        np.testing.assert_allclose(rates.rate(Currency.USD, currency), [rate])
+
+@pytest.mark.parametrize('schedule', [None, CapitalCallSchedule(1000, 3, 'quarterly')])
+def test_results_in_converts_each_year_at_its_own_rate(schedule):
+    model = _model(capital_call_schedule=schedule)
+    converted = model.results_in(Currency.EUR, FX)
+    np.testing.assert_allclose(converted[MONETARY_COLUMNS], model.results[MONETARY_COLUMNS] * EUR_PER_USD[:, None])
+    pd.testing.assert_series_equal(converted['Net_IRR'], model.results['Net_IRR'])
+
+def test_results_in_is_kept_per_currency_and_rates():
+    model = _model()
+    assert model.results_in(Currency.EUR, FX) is model.results_in(Currency.EUR, FX)
+    assert model.results_in(Currency.GBP, FX) is not model.results_in(Currency.EUR, FX)
+
+def test_timeline_in_converts_each_quarter_at_its_year_rate():
+    model = _model()
+    converted = model.timeline_in(Currency.EUR, FX)
+    rates = EUR_PER_USD[converted['Date'].dt.year - 2025]
+    np.testing.assert_allclose(converted['Net_Cash_Flow'], model.timeline['Net_Cash_Flow'] * rates)
+    np.testing.assert_allclose(converted['Cumulative_Net_Cash_Flow'], converted['Net_Cash_Flow'].cumsum())
+
+def test_summary_metrics_sum_fees_at_each_year_rate():
+    model = _model()
+    summary = model.get_summary_metrics(Currency.EUR, FX)
+    results = model.results
+    fees = (results['Management_Fee'] + results['Performance_Fee']).to_numpy()
+    assert summary['Total_Fees'] == pytest.approx((fees * EUR_PER_USD).sum())
+    assert summary['Total_Fees'] != pytest.approx(fees.sum() * EUR_PER_USD[-1])
+    assert summary['Final_Net_Return'] == pytest.approx(results['Cumulative_Net'].iloc[-1] * EUR_PER_USD[-1])
+    assert summary['Final_Net_IRR'] == model.get_summary_metrics()['Final_Net_IRR']
+
+def test_start_date_moves_the_rates_applied():
+    model = FinancialModel(start_date='2026-01-01')
+    converted = model.results_in(Currency.EUR, FX)
+    np.testing.assert_allclose(converted['Gross_Return'],
+                               model.results['Gross_Return'] * np.append(EUR_PER_USD[1:], EUR_PER_USD[-1]))
+
+def test_xirr_in_a_weakening_currency_is_higher():
+    model = _model()
+    assert model.get_xirr(Currency.EUR, FX)['Net_XIRR'] > model.get_xirr()['Net_XIRR']
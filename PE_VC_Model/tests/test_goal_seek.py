@@ -0,0 +1,57 @@
+"""solve_for: the solved input, run through FinancialModel, hits the target metric."""
+from dataclasses import replace
+
+import pytest
+
+from model import CapitalCallSchedule, FeeStructure, FinancialModel, PerformanceMetrics
+from model.goal_seek import SOLVABLE_INPUTS, solve_for
+
+FEES = FeeStructure(0.02, 0.2, 0.08)
+METRICS = PerformanceMetrics(0.15, 2.0, 2.5, 2.5)
+SCHEDULE = CapitalCallSchedule(1000, 3, 'quarterly')
+# (input, metric it moves, input value the target is taken from)
+CASES = [
+    ('management_fee', 'Final_Net_IRR', 0.035),
+    ('performance_fee', 'Final_Net_Return', 0.3),
+    ('hurdle_rate', 'Final_Net_Return', 0.12),
+    ('target_irr', 'Final_Net_IRR', 0.22),
+    ('target_irr', 'Final_Gross_Return', -0.05),
+    ('commitment', 'Total_Fees', 2500.0),
+]
+
+def _model(input_name, value, schedule):
+    fees, metrics, investment = FEES, METRICS, 1000
+    if input_name in ('management_fee', 'performance_fee', 'hurdle_rate'):
+        fees = replace(FEES, **{input_name: value})
+    elif input_name == 'target_irr':
+        metrics = replace(METRICS, target_irr=value)
+    elif schedule:
+        schedule = replace(schedule, total_commitment=value)
+    else:
+        investment = value
+    return FinancialModel(investment, fee_structure=fees, performance_metrics=metrics,
+                          capital_call_schedule=schedule, start_date='2025-01-01')
+
+def test_every_solvable_input_is_covered():
+    assert {input_name for input_name, _, _ in CASES} == set(SOLVABLE_INPUTS)
+
+@pytest.mark.parametrize('schedule', [None, SCHEDULE])
+@pytest.mark.parametrize('input_name, metric, value', CASES)
+def test_solved_input_hits_the_target(input_name, metric, value, schedule):
+    target = _model(input_name, value, schedule).get_summary_metrics()[metric]
+    solved = solve_for(input_name, metric, target, 1000, FEES, METRICS, schedule)
+    assert solved == pytest.approx(value, rel=1e-6)
+    achieved = _model(input_name, solved, schedule).get_summary_metrics()[metric]
+    assert achieved == pytest.approx(target, rel=1e-7, abs=1e-9)
+
+def test_target_out_of_range_raises():
+    with pytest.raises(ValueError, match='No input in'):
+        solve_for('management_fee', 'Final_Net_IRR', 0.5, 1000, FEES, METRICS)
+    with pytest.raises(ValueError, match='No input in'):
+        solve_for('target_irr', 'Final_Net_IRR', 0.2, 1000, FEES, METRICS, bounds=(-0.5, 0.1))
+
+def test_unknown_input_or_metric_raises():
+    with pytest.raises(ValueError, match='Cannot solve for'):
+        solve_for('moic', 'Final_Net_IRR', 0.1)
+    with pytest.raises(ValueError, match='Unknown metric'):
+        solve_for('management_fee', 'Final_DPI', 0.1)
@@ -0,0 +1,54 @@
+"""Gross_IRR and Net_IRR against the numpy_financial loop the model used before finance_utils.prefix_irr.
+
+The original model called npf.irr once per year on the cash flows up to that
+year and wrote NaN where it failed. The grid below is the 432 parameter
+combinations the solver swap was checked on.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from model import CapitalCallSchedule, FeeStructure, FinancialModel, PerformanceMetrics
+from model.output import HARVEST_START
+
+npf = pytest.importorskip('numpy_financial')
+
+FEES = [FeeStructure(management_fee, performance_fee, hurdle)
+        for management_fee, performance_fee, hurdle in itertools.product(
+            [0.0, 0.015, 0.03], [0.0, 0.2, 0.3], [0.0, 0.06, 0.1])]
+TARGET_IRRS = [-0.2, 0.0, 0.15, 0.4]
+SCHEDULES = [None, CapitalCallSchedule(1000, 3, 'annual'), CapitalCallSchedule(1000, 4, 'semi-annual'),
+             CapitalCallSchedule(1000, 5, 'quarterly')]
+
+def _irr_cash_flows(results, value_column):
+    """The cash flows the model builds for its IRR columns: the first call out, the final value back over the harvest."""
+    called = results['Cumulative_Called'].iloc[0]
+    flows = np.zeros(len(results))
+    flows[0] = -called
+    flows[HARVEST_START:] = (results[value_column].iloc[-1] - called) / (len(results) - HARVEST_START)
+    return flows
+
+def _npf_prefix_irr(flows):
+    irrs = []
+    for year in range(len(flows)):
+        try:
+            irrs.append(npf.irr(flows[:year + 1]))
+        except Exception:
+            irrs.append(np.nan)
+    return np.array(irrs, dtype=float)
+
+def test_grid_has_432_cases():
+    assert len(FEES) * len(TARGET_IRRS) * len(SCHEDULES) == 432
+
+@pytest.mark.parametrize('schedule', SCHEDULES)
+@pytest.mark.parametrize('target_irr', TARGET_IRRS)
+def test_irr_columns_match_numpy_financial_loop(target_irr, schedule):
+    metrics = PerformanceMetrics(target_irr, 2.0, 2.5, 2.5)
+    for fees in FEES:
+        results = FinancialModel(1000, fee_structure=fees, performance_metrics=metrics,
+                                 capital_call_schedule=schedule, start_date='2025-01-01').results
+        for irr_column, value_column in [('Gross_IRR', 'Gross_Return'), ('Net_IRR', 'Net_Return')]:
+            expected = _npf_prefix_irr(_irr_cash_flows(results, value_column))
+            np.testing.assert_allclose(results[irr_column], expected, rtol=1e-9, atol=1e-12,
+                                       err_msg=f'{irr_column} {fees}')
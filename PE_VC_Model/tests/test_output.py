@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from model import CapitalCallSchedule, FeeStructure, FinancialModel, PerformanceMetrics
+
+START_DATE = '2025-01-01'
+SCHEDULES = [None, CapitalCallSchedule(1000, 3, 'quarterly'), CapitalCallSchedule(5000, 5, 'annual')]
+# Fee options that charge performance fees before the final year
+EARLY_FEES = [{'waterfall': 'european'}, {'performance_fee_timing': 'harvest'}]
+
+def _results(fees, target_irr=0.15, schedule=None):
+    metrics = PerformanceMetrics(target_irr=target_irr, moic=2.0, mm=2.5, tvpi=2.5)
+    return FinancialModel(1000, fee_structure=fees, performance_metrics=metrics, capital_call_schedule=schedule,
+                          start_date=START_DATE).results
+
+def test_waterfall_example_net_return():
+    with_waterfall = _results(FeeStructure(0.02, 0.2, 0.08, waterfall='european'))
+    without = _results(FeeStructure(0.02, 0.2, 0.08))
+    assert with_waterfall['Net_Return'].iloc[-1] == pytest.approx(3416.4, abs=0.05)
+    assert without['Net_Return'].iloc[-1] == pytest.approx(3648.2, abs=0.05)
+
+def test_harvest_timing_example_net_return():
+    results = _results(FeeStructure(0.02, 0.2, 0.08, performance_fee_timing='harvest'))
+    assert results['Net_Return'].iloc[-1] == pytest.approx(3632.6, abs=0.05)
+
+@pytest.mark.parametrize('early_fees, target_irr, hurdle, catch_up, schedule', list(itertools.product(
+    EARLY_FEES, [0.0, 0.05, 0.15, 0.3], [0.0, 0.08, 0.2], [0.0, 1.0], SCHEDULES)))
+def test_early_fee_net_not_above_final_fee_net_when_fees_are_larger(early_fees, target_irr, hurdle, catch_up,
+                                                                    schedule):
+    early = _results(FeeStructure(0.02, 0.2, hurdle, catch_up=catch_up, **early_fees), target_irr, schedule)
+    final = _results(FeeStructure(0.02, 0.2, hurdle), target_irr, schedule)
+    if early['Performance_Fee'].sum() >= final['Performance_Fee'].sum():
+        assert early['Net_Return'].iloc[-1] <= final['Net_Return'].iloc[-1] + 1e-9
+
+@pytest.mark.parametrize('early_fees, schedule', list(itertools.product(EARLY_FEES, SCHEDULES)))
+def test_net_is_after_cumulative_performance_fees(early_fees, schedule):
+    results = _results(FeeStructure(0.02, 0.2, 0.08, **early_fees), 0.2, schedule)
+    expected = results['Gross_Return'] - results['Management_Fee'] - results['Performance_Fee'].cumsum()
+    np.testing.assert_allclose(results['Net_Return'].iloc[1:], expected.iloc[1:])
+
+@pytest.mark.parametrize('fee_options, schedule', list(itertools.product(
+    [{}] + EARLY_FEES + [{'hurdle_rate': 0.0}], SCHEDULES)))
+def test_timeline_agrees_with_results_per_year(fee_options, schedule):
+    model = FinancialModel(1000, fee_structure=FeeStructure(**fee_options), capital_call_schedule=schedule,
+                           start_date=START_DATE)
+    quarters = model.timeline.iloc[1:]
+    by_year = quarters.drop(columns='Date').groupby(np.ceil(quarters['Year'])).sum()
+    for column in ('Management_Fee', 'Performance_Fee'):
+        np.testing.assert_allclose(by_year[column], model.results[column].iloc[1:], rtol=1e-12)
+    assert model.timeline['Gross_Distribution'].sum() == pytest.approx(model.results['Gross_Return'].iloc[-1])
+    assert model.timeline['Called_Capital'].sum() == pytest.approx(model.results['Cumulative_Called'].iloc[-1])
+
+def test_default_start_date_is_fixed():
+    assert FinancialModel().start_date == FinancialModel(start_date=START_DATE).start_date
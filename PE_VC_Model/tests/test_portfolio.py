@@ -0,0 +1,34 @@
+"""Pooled portfolio metrics on net NAV."""
+import numpy as np
+import pytest
+
+from model import CapitalCallSchedule, Currency, FeeStructure, FinancialModel, FundCommitment, Portfolio
+
+FEES = [FeeStructure(), FeeStructure(waterfall='european'), FeeStructure(performance_fee_timing='harvest')]
+
+@pytest.mark.parametrize('fees', FEES)
+def test_net_nav_is_after_unpaid_carry(fees):
+    timeline = FinancialModel(1000, fee_structure=fees, capital_call_schedule=CapitalCallSchedule(1000),
+                              start_date='2025-01-01').timeline
+    np.testing.assert_allclose(timeline['Net_NAV'], timeline['Gross_NAV'] - timeline['Accrued_Carry'])
+    assert (timeline['Accrued_Carry'] >= 0).all()
+    assert timeline['Accrued_Carry'].max() > 0
+    assert timeline['Accrued_Carry'].iloc[-1] == pytest.approx(0.0, abs=1e-9)
+    assert timeline['Gross_NAV'].iloc[0] == pytest.approx(timeline['Called_Capital'].iloc[0])
+
+@pytest.mark.parametrize('fees', FEES)
+def test_rvpi_and_tvpi_use_net_nav(fees):
+    funds = [FundCommitment('A', 2018, 100, fee_structure=fees),
+             FundCommitment('B', 2020, 50, Currency.USD, fee_structure=fees)]
+    portfolio = Portfolio(funds, fx_rates={Currency.USD: 0.8})
+    book = portfolio.timeline()
+    unit = FinancialModel(1.0, Currency.GBP, fees, funds[0].performance_metrics, CapitalCallSchedule(1.0),
+                          start_date='2000-01-01').timeline
+    # Fund A alone until fund B's vintage, 8 quarters later
+    np.testing.assert_allclose(book['NAV'].iloc[:8], 100 * unit['Net_NAV'].iloc[:8])
+    np.testing.assert_allclose(book['RVPI'], book['NAV'] / book['Paid_In'])
+    np.testing.assert_allclose(book['TVPI'], book['DPI'] + book['RVPI'])
+    # Carry still owed keeps TVPI below its gross NAV equivalent until it is all paid
+    gross_tvpi = book['DPI'].iloc[6] + 100 * unit['Gross_NAV'].iloc[6] / book['Paid_In'].iloc[6]
+    assert book['TVPI'].iloc[6] < gross_tvpi
+    assert book['TVPI'].iloc[-1] == pytest.approx(book['DPI'].iloc[-1])
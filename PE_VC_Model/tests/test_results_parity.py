@@ -0,0 +1,51 @@
+"""FinancialModel.results pinned to the values the model gave before it moved to the shared engine.
+
+data/results_before_shared_engine.csv holds the results of 24 parameter
+sets with the single final-year performance fee, recorded from the model
+before get_model, the disk cache and the batch engine were added. Later
+changes must leave them unchanged.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model import BatchFinancialModel, CapitalCallSchedule, FeeStructure, FinancialModel, PerformanceMetrics
+
+PINNED = pd.read_csv(os.path.join(os.path.dirname(__file__), 'data', 'results_before_shared_engine.csv'),
+                     keep_default_na=False, na_values=[''])
+RESULT_COLUMNS = list(PINNED.columns[PINNED.columns.get_loc('Year'):])
+CASES = sorted(PINNED['Case'].unique())
+
+def _inputs(case):
+    row = PINNED[PINNED['Case'] == case].iloc[0]
+    fees = FeeStructure(row['management_fee'], row['performance_fee'], row['hurdle_rate'])
+    metrics = PerformanceMetrics(row['target_irr'], 2.0, 2.5, 2.5)
+    schedule = None if np.isnan(row['total_commitment']) else CapitalCallSchedule(
+        row['total_commitment'], int(row['investment_period_years']), row['call_frequency'])
+    return fees, metrics, schedule
+
+def _pinned(case):
+    return PINNED.loc[PINNED['Case'] == case, RESULT_COLUMNS].reset_index(drop=True)
+
+@pytest.mark.parametrize('case', CASES)
+def test_results_match_pinned_values(case):
+    fees, metrics, schedule = _inputs(case)
+    results = FinancialModel(1000, fee_structure=fees, performance_metrics=metrics, capital_call_schedule=schedule,
+                             start_date='2025-01-01').results
+    pd.testing.assert_frame_equal(results[RESULT_COLUMNS], _pinned(case), check_exact=False, rtol=1e-10, atol=1e-12)
+
+def test_default_model_matches_pinned_values():
+    default_case = next(case for case in CASES
+                        if _inputs(case) == (FeeStructure(), PerformanceMetrics(0.15, 2.0, 2.5, 2.5), None))
+    results = FinancialModel(start_date='2025-01-01').results
+    pd.testing.assert_frame_equal(results[RESULT_COLUMNS], _pinned(default_case), check_exact=False, rtol=1e-10,
+                                  atol=1e-12)
+
+def test_batch_matches_pinned_values():
+    inputs = [_inputs(case) for case in CASES]
+    batch = BatchFinancialModel.from_models([1000] * len(CASES), *zip(*inputs))
+    for index, case in enumerate(CASES):
+        pd.testing.assert_frame_equal(batch.frame(index)[RESULT_COLUMNS], _pinned(case), check_exact=False,
+                                      rtol=1e-10, atol=1e-12)
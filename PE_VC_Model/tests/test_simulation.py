@@ -0,0 +1,60 @@
+"""simulate_funds: seeded, internally consistent, and shaped like a J-curve."""
+import dataclasses
+
+import numpy as np
+import pytest
+
+from model import FeeStructure, FundAssumptions, simulate_funds
+
+FEES = {
+    'european': FeeStructure(),
+    'european no clawback': FeeStructure(0.015, 0.25, 0.06, clawback=False, catch_up=0.5),
+    'american': FeeStructure(0.015, 0.25, 0.06, waterfall='american'),
+    'american no clawback': FeeStructure(waterfall='american', clawback=False, catch_up=0.5),
+}
+
+@pytest.fixture(scope='module', params=list(FEES.values()), ids=list(FEES))
+def result(request):
+    return simulate_funds(500, request.param, seed=3)
+
+def test_same_seed_gives_the_same_funds():
+    first, second = simulate_funds(200, seed=11), simulate_funds(200, seed=11)
+    for field in dataclasses.fields(first):
+        np.testing.assert_array_equal(getattr(first, field.name), getattr(second, field.name), err_msg=field.name)
+    assert not np.array_equal(simulate_funds(200, seed=12).tvpi, first.tvpi)
+
+def test_dpi_never_exceeds_tvpi(result):
+    assert (result.dpi <= result.tvpi + 1e-12).all()
+    assert (result.dpi >= 0).all()
+
+def test_lp_distributions_and_carry_add_up_to_gross(result):
+    np.testing.assert_allclose(result.lp_distributions + result.carry, result.gross_distributions, atol=1e-12)
+
+@pytest.mark.parametrize('waterfall', ['european', 'american'])
+def test_final_tvpi_is_dpi_once_everything_is_realized(waterfall):
+    result = simulate_funds(500, FeeStructure(waterfall=waterfall), seed=3)
+    np.testing.assert_array_equal(result.nav[:, -1], 0.0)
+    np.testing.assert_allclose(result.tvpi[:, -1], result.dpi[:, -1], atol=1e-12)
+
+def test_j_curve_falls_before_the_first_exit_and_ends_positive(result):
+    j_curve = result.j_curve
+    before_exits = result.times < FundAssumptions().min_holding_years
+    # Only capital calls and fees before the first possible exit
+    assert (j_curve[:, before_exits][:, 1:] < 0).all()
+    assert (np.diff(j_curve[:, before_exits], axis=1) <= 0).all()
+    median = np.median(j_curve, axis=0)
+    trough = median.argmin()
+    assert 0 < trough < len(median) - 1
+    assert median[trough] < 0 < median[-1]
+
+def test_no_fees_means_lp_gets_everything():
+    result = simulate_funds(200, FeeStructure(0.0, 0.0, 0.08), seed=5)
+    np.testing.assert_array_equal(result.carry, 0.0)
+    np.testing.assert_array_equal(result.management_fees, 0.0)
+    np.testing.assert_allclose(result.lp_distributions, result.gross_distributions)
+
+def test_percentile_bands_are_ordered():
+    bands = simulate_funds(300, seed=7).percentiles()
+    for name in ('j_curve', 'dpi', 'tvpi'):
+        assert (np.diff(bands[name], axis=-1) >= 0).all()
+    assert (np.diff(bands['irr']) >= 0).all()
@@ -0,0 +1,101 @@
+"""Waterfall tiers on hand-worked flows, both styles on multi-deal flows, and clawback."""
+import itertools
+
+import numpy as np
+import pytest
+
+from model import american_waterfall, european_waterfall, run_waterfall
+from model.waterfall import preferred_return_accrued
+
+# 100 called, 200 back a year later: 100 of profit, 8 of it the preferred return at 8%
+CONTRIBUTIONS = [100.0, 0.0]
+
+def _carry(distribution, catch_up=1.0, preferred_return=0.08, carried_interest=0.2):
+    _, carry = european_waterfall(CONTRIBUTIONS, [0.0, distribution], preferred_return, carried_interest, catch_up)
+    return carry.sum()
+
+def test_preferred_return_accrues_on_unreturned_capital():
+    accrued = preferred_return_accrued([100.0, 0.0, 0.0, 0.0], [0.0, 50.0, 0.0, 0.0], 0.08)
+    np.testing.assert_allclose(accrued, [0.0, 8.0, 12.0, 16.0])
+
+@pytest.mark.parametrize('catch_up', [1.0, 0.5, 0.3])
+def test_catch_up_brings_carry_to_exactly_the_carried_interest_of_profit(catch_up):
+    assert _carry(200.0, catch_up) == pytest.approx(0.2 * 100.0)
+
+def test_carry_inside_the_catch_up_tier():
+    # 1 above the preferred return, all of it inside a full catch-up tier of 2
+    assert _carry(109.0) == pytest.approx(1.0)
+    assert _carry(109.0, catch_up=0.5) == pytest.approx(0.5)
+
+def test_no_carry_until_the_preferred_return_is_paid():
+    assert _carry(100.0) == 0.0
+    assert _carry(108.0) == 0.0
+
+def test_without_catch_up_carry_is_on_profit_above_the_preferred_return():
+    assert _carry(200.0, catch_up=0.0) == pytest.approx(0.2 * (100.0 - 8.0))
+
+def test_lp_and_carry_add_up_to_the_distributions():
+    rng = np.random.default_rng(1)
+    contributions = rng.uniform(0, 50, (20, 12)) * (rng.random((20, 12)) < 0.4)
+    distributions = rng.uniform(0, 80, (20, 12)) * (rng.random((20, 12)) < 0.5)
+    for clawback in (False, True):
+        lp, carry = european_waterfall(contributions, distributions, 0.08, 0.2, 1.0, 4, clawback)
+        np.testing.assert_allclose(lp + carry, distributions)
+
+def test_rates_broadcast_over_funds():
+    lp, carry = european_waterfall([CONTRIBUTIONS] * 2, [[0.0, 200.0]] * 2, [0.08, 0.0], [0.2, 0.3])
+    np.testing.assert_allclose(carry.sum(axis=-1), [20.0, 30.0])
+
+# Two deals of 100 each: deal A returns 300 in period 1, deal B is written off
+DEAL_CONTRIBUTIONS = [[100.0, 0.0, 0.0], [100.0, 0.0, 0.0]]
+DEAL_DISTRIBUTIONS = [[0.0, 300.0, 0.0], [0.0, 0.0, 0.0]]
+
+def test_european_carry_is_on_the_whole_fund():
+    lp, carry = run_waterfall('european', DEAL_CONTRIBUTIONS, DEAL_DISTRIBUTIONS, 0.08, 0.2)
+    np.testing.assert_allclose(carry, [0.0, 20.0, 0.0])
+    np.testing.assert_allclose(lp, [0.0, 280.0, 0.0])
+
+def test_american_carry_is_on_each_deal():
+    _, carry = american_waterfall(DEAL_CONTRIBUTIONS, DEAL_DISTRIBUTIONS, 0.08, 0.2, clawback=False)
+    np.testing.assert_allclose(carry, [0.0, 40.0, 0.0])
+
+def test_clawback_returns_american_carry_above_the_whole_fund_entitlement():
+    lp, carry = american_waterfall(DEAL_CONTRIBUTIONS, DEAL_DISTRIBUTIONS, 0.08, 0.2, clawback=True)
+    np.testing.assert_allclose(carry, [0.0, 40.0, -20.0])
+    np.testing.assert_allclose(lp, [0.0, 260.0, 20.0])
+
+def test_european_clawback_returns_carry_paid_before_later_losses():
+    # Carry is paid on an early exit, then a second call is never recovered
+    contributions = [100.0, 0.0, 100.0, 0.0]
+    distributions = [0.0, 150.0, 0.0, 60.0]
+    _, kept = european_waterfall(contributions, distributions, 0.0, 0.2, clawback=False)
+    _, clawed = european_waterfall(contributions, distributions, 0.0, 0.2, clawback=True)
+    np.testing.assert_allclose(kept, [0.0, 10.0, 0.0, 0.0])
+    np.testing.assert_allclose(clawed, [0.0, 10.0, 0.0, -8.0])
+    assert clawed.sum() == pytest.approx(0.2 * (210.0 - 200.0))
+
+@pytest.mark.parametrize('catch_up, clawback', list(itertools.product([0.0, 0.5, 1.0], [False, True])))
+def test_styles_agree_on_a_single_deal(catch_up, clawback):
+    rng = np.random.default_rng(2)
+    contributions = rng.uniform(0, 50, (5, 1, 10)) * (rng.random((5, 1, 10)) < 0.4)
+    distributions = rng.uniform(0, 80, (5, 1, 10)) * (rng.random((5, 1, 10)) < 0.5)
+    european = run_waterfall('european', contributions, distributions, 0.08, 0.2, catch_up, 4, clawback)
+    american = run_waterfall('american', contributions, distributions, 0.08, 0.2, catch_up, 4, clawback)
+    np.testing.assert_allclose(american, european)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_american_clawback_caps_carry_at_the_european_entitlement(seed):
+    rng = np.random.default_rng(seed)
+    contributions = np.zeros((50, 6, 16))
+    contributions[..., 0] = 10.0
+    distributions = np.zeros((50, 6, 16))
+    exits = rng.integers(1, 16, (50, 6))
+    distributions[np.arange(50)[:, None], np.arange(6), exits] = rng.lognormal(0, 1, (50, 6)) * 10
+    _, european = run_waterfall('european', contributions, distributions, 0.08, 0.2, 1.0, 4, clawback=True)
+    _, kept = run_waterfall('american', contributions, distributions, 0.08, 0.2, 1.0, 4, clawback=False)
+    _, clawed = run_waterfall('american', contributions, distributions, 0.08, 0.2, 1.0, 4, clawback=True)
+    np.testing.assert_allclose(clawed.sum(axis=-1), np.minimum(kept.sum(axis=-1), european.sum(axis=-1)), atol=1e-9)
+
+def test_unknown_style_raises():
+    with pytest.raises(ValueError, match='Unknown waterfall style'):
+        run_waterfall('asian', DEAL_CONTRIBUTIONS, DEAL_DISTRIBUTIONS, 0.08, 0.2)
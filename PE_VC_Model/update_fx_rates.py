@@ -0,0 +1,21 @@
+"""Write data/fx_rates.csv from the ECB euro reference rate history.
+
+Download ECB_HISTORY_URL (see model/fx.py) and run:
+
+    python update_fx_rates.py eurofxref-hist.zip
+"""
+import argparse
+
+from model.fx import ECB_HISTORY_URL, FX_RATES_PATH, FXRates
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the FX rate file from the ECB reference rate history")
+    parser.add_argument('ecb_history', help=f"eurofxref-hist.csv or .zip, downloaded from {ECB_HISTORY_URL}")
+    parser.add_argument('--output', default=FX_RATES_PATH, help="rate file to write (default: %(default)s)")
+    args = parser.parse_args()
+    rates = FXRates.from_ecb_csv(args.ecb_history)
+    rates.to_csv(args.output)
+    print(f"Wrote {len(rates.dates)} dates ({rates.dates[0]:%Y-%m-%d} to {rates.dates[-1]:%Y-%m-%d}) to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""Numerical helpers shared by the modelling apps in this repository."""
+from .goal_seek import goal_seek
+from .irr import irr, irr_from_values, npv, prefix_irr
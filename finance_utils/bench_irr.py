@@ -0,0 +1,89 @@
+"""Benchmark the vectorized IRR solver against a numpy_financial.irr loop.
+
+Each case computes what the apps compute (prefix IRRs of a PE/VC cash-flow
+vector, per-year IRRs of hedge fund value paths) for a batch of rows, checks
+that both give the same answers and reports the speed-up.
+
+Examples:
+    python -m finance_utils.bench_irr
+    python -m finance_utils.bench_irr --rows 500 --periods 40 --min-speedup 50
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import numpy_financial as npf
+
+from .irr import irr, irr_from_values, prefix_irr
+
+def _pe_cash_flows(rows, periods, rng):
+    # Capital calls in the first years, then noisy distributions
+    flows = np.zeros((rows, periods))
+    calls = min(3, periods - 1)
+    flows[:, :calls] = -rng.uniform(50, 150, (rows, calls))
+    flows[:, calls:] = rng.uniform(0, 120, (rows, periods - calls))
+    return flows
+
+def _hedge_values(rows, periods, rng):
+    returns = rng.normal(0.08, 0.15, (rows, periods - 1))
+    values = np.empty((rows, periods))
+    values[:, 0] = 1000.0
+    values[:, 1:] = 1000.0 * np.cumprod(1 + returns, axis=1)
+    return values
+
+def _npf_prefix(flows):
+    return np.array([[npf.irr(row[:k + 1]) for k in range(len(row))] for row in flows])
+
+def _npf_hedge(values):
+    years = values.shape[1] - 1
+    return np.array([[npf.irr([-row[0]] + [0] * (i - 1) + [row[i]]) for i in range(1, years + 1)] for row in values])
+
+def _hedge_general(values):
+    # Same cash flows as the loop, through the general solver instead of irr_from_values
+    rows, periods = values.shape
+    flows = np.zeros((rows, periods - 1, periods))
+    flows[:, :, 0] = -values[:, :1]
+    idx = np.arange(1, periods)
+    flows[:, idx - 1, idx] = values[:, 1:]
+    return irr(flows)
+
+CASES = {
+    'prefix_irr (PE/VC cash flows)': (_pe_cash_flows, _npf_prefix, prefix_irr),
+    'per-year IRR (hedge fund, general solver)': (_hedge_values, _npf_hedge, _hedge_general),
+    'per-year IRR (hedge fund, closed form)': (_hedge_values, _npf_hedge, lambda v: irr_from_values(v[:, 0:1], v)),
+}
+
+def _timed(func, *args, repeat=3):
+    best, result = np.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the vectorized IRR solver with numpy_financial.irr.")
+    parser.add_argument('--rows', type=int, default=200, help="Cash-flow vectors / value paths per case")
+    parser.add_argument('--periods', type=int, default=30, help="Periods per vector")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--min-speedup', type=float, default=0.0,
+                        help="Exit with status 1 if any case is slower than this multiple of the loop")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    failed = False
+    for name, (make, reference, vectorized) in CASES.items():
+        data = make(args.rows, args.periods, rng)
+        # Best of several runs on both sides, so a busy machine doesn't skew the ratio
+        loop_time, expected = _timed(reference, data)
+        fast_time, actual = _timed(vectorized, data, repeat=10)
+        matches = np.isclose(expected, actual, rtol=1e-7, atol=1e-9) | (np.isnan(expected) & np.isnan(actual))
+        speedup = loop_time / fast_time
+        failed |= speedup < args.min_speedup or not matches.all()
+        print(f"{name}: npf loop {loop_time * 1000:,.1f} ms, vectorized {fast_time * 1000:,.2f} ms, "
+              f"{speedup:,.0f}x, {matches.mean():.2%} of {matches.size:,} IRRs match")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
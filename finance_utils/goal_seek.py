@@ -0,0 +1,55 @@
+"""Goal seek: the input value at which a vectorized model hits a target output.
+
+The model is a function from an array of candidate inputs to one output
+per candidate, so each step of the search is a single batched call. The
+search first scans a grid over the bounds to bracket the target. It then
+repeatedly lays a finer grid across the bracket, shrinking it by a factor
+of grid_points - 1 per call until it is narrower than xtol. The answer is
+interpolated linearly inside the last bracket. With the default 64 points,
+a bracket of width 1 is narrower than 1e-9 after five refinements.
+"""
+import numpy as np
+
+GRID_POINTS = 64
+
+def _first_crossing(values):
+    """Index i of the first pair (values[i], values[i + 1]) that brackets zero, or None."""
+    crossing = np.sign(values[:-1]) * np.sign(values[1:]) <= 0  # NaN compares False
+    hits = np.flatnonzero(crossing)
+    return int(hits[0]) if hits.size else None
+
+def goal_seek(func, target, lower, upper, xtol=1e-9, grid_points=GRID_POINTS, max_calls=50):
+    """Input x in [lower, upper] with func(x) == target.
+
+    When several inputs hit the target, the lowest is returned. Raises
+    ValueError when no input in the bounds reaches the target.
+    """
+    if not lower < upper:
+        raise ValueError("lower must be below upper")
+    x = np.linspace(lower, upper, grid_points)
+    outputs = np.asarray(func(x), dtype=np.float64)
+    i = _first_crossing(outputs - target)
+    if i is None:
+        if np.isnan(outputs).all():
+            raise ValueError(f"No input in [{lower:g}, {upper:g}] reaches {target:g}; every output is NaN")
+        raise ValueError(f"No input in [{lower:g}, {upper:g}] reaches {target:g}; "
+                         f"outputs range from {np.nanmin(outputs):g} to {np.nanmax(outputs):g}")
+
+    lo, hi, f_lo, f_hi = x[i], x[i + 1], outputs[i] - target, outputs[i + 1] - target
+    for _ in range(max_calls):
+        # Keep refining when only the upper end hits the target, to find the lowest input that does
+        if hi - lo <= xtol or f_lo == 0:
+            break
+        x = np.linspace(lo, hi, grid_points)
+        f = np.asarray(func(x), dtype=np.float64) - target
+        # The endpoints bracket zero, so a crossing exists unless func is noisy
+        i = _first_crossing(f)
+        if i is None:
+            break
+        lo, hi, f_lo, f_hi = x[i], x[i + 1], f[i], f[i + 1]
+
+    if f_lo == 0:
+        return float(lo)
+    if f_hi == 0 or f_hi == f_lo:
+        return float(hi)
+    return float(lo - f_lo * (hi - lo) / (f_hi - f_lo))
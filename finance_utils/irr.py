@@ -0,0 +1,282 @@
+"""Vectorized IRR solver shared by the hedge fund and PE/VC models.
+
+numpy_financial.irr finds the roots of one polynomial per call, so computing
+the IRR of every prefix of a cash-flow vector (or of thousands of paths) means
+thousands of eigenvalue problems in a Python loop. Here all rows are solved
+together:
+
+* rows with exactly one outflow and one inflow use the closed form
+  (inflow / outflow) ** (1 / periods) - 1;
+* rows with one sign change (outflows, then inflows) have a single root,
+  bracketed by a coarse scan of -99.99%..+100,000% that is densest near 0%;
+* rows with several sign changes can have several roots, so a grid of rates
+  is scanned for brackets and the root closest to 0% (the one
+  numpy_financial.irr returns) is refined.
+
+Roots are refined by Newton steps on log(PV of inflows / PV of outflows),
+safeguarded by bisection. That function has the same root as the NPV but is
+close to linear in log(1 + r), so a few steps from the secant root of the
+bracket converge.
+
+prefix_irr keeps running counts of sign changes and non-zero flows along
+each vector, so prefixes with one outflow and one inflow take the closed
+form and only the rest reach the solver.
+
+Rows without a solution (no sign change, all zeros, a single flow) give NaN
+instead of raising.
+"""
+import numpy as np
+
+# Rates are searched on log(1 + r) in [-9.2, 6.9], i.e. -99.99% to ~+100,000%
+GRID_POINTS = 257
+COARSE_GRID_POINTS = 33  # brackets the single root of one-sign-change rows
+COARSE_GRID_SCALE = 0.1  # spacing of the coarse grid near 0% is about a third of this
+LOG_RATE_BOUNDS = (np.log1p(-0.9999), np.log1p(1000.0))
+TOLERANCE = 1e-12
+# Newton converges quadratically, so a step this small leaves an error of about its square
+NEWTON_TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+
+def _as_times(times, n_periods):
+    if times is None:
+        return np.arange(n_periods, dtype=np.float64)
+    return np.asarray(times, dtype=np.float64)
+
+def npv(rate, cash_flows, times=None):
+    """Net present value of cash flows (last axis) at `rate`, broadcasting over rows."""
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    times = _as_times(times, cash_flows.shape[-1])
+    rate = np.asarray(rate, dtype=np.float64)[..., None]
+    return (cash_flows * (1 + rate) ** -times).sum(axis=-1)
+
+def _closed_form(cash_flows, times):
+    """IRR for rows holding exactly one outflow and one inflow (NaN elsewhere)."""
+    nonzero = cash_flows != 0
+    two_flows = nonzero.sum(axis=-1) == 2
+    first = np.argmax(nonzero, axis=-1)
+    last = cash_flows.shape[-1] - 1 - np.argmax(nonzero[..., ::-1], axis=-1)
+    first_flow = np.take_along_axis(cash_flows, first[..., None], axis=-1)[..., 0]
+    last_flow = np.take_along_axis(cash_flows, last[..., None], axis=-1)[..., 0]
+    periods = np.broadcast_to(times, cash_flows.shape)
+    periods = (np.take_along_axis(periods, last[..., None], axis=-1)
+               - np.take_along_axis(periods, first[..., None], axis=-1))[..., 0]
+    valid = two_flows & (first_flow * last_flow < 0) & (periods > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = (-last_flow / first_flow) ** (1 / periods) - 1
+    return np.where(valid, rate, np.nan), two_flows
+
+def _refine(flows, times, lo, hi, f_lo, f_hi):
+    """Newton steps safeguarded by bisection inside [lo, hi] (in log(1 + r) space).
+
+    Starts from the secant root of the bracket.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        start = np.where(f_hi != f_lo, lo - f_lo * (hi - lo) / (f_hi - f_lo), (lo + hi) / 2)
+    u = np.clip(np.nan_to_num(start), lo, hi)
+    u = np.where(f_lo == 0, lo, np.where(f_hi == 0, hi, u))
+    # Sums and time-weighted sums of each row in one matrix product, much faster than sum() on short rows
+    moments = np.column_stack([np.ones(len(times)), times])
+
+    # Iterate on compacted copies of the rows still running, writing each row back once it is done.
+    # The NPV keeps its sign at lo as the bracket shrinks.
+    idx = np.flatnonzero((f_lo != 0) & (f_hi != 0))
+    flows, lo, hi, x = flows[idx], lo[idx], hi[idx], u[idx]
+    negative_at_lo = np.signbit(f_lo[idx])
+    for _ in range(MAX_ITERATIONS):
+        if not len(idx):
+            break
+        discounted = flows * np.exp(-np.outer(x, times))
+        value, duration = (discounted @ moments).T
+        pv_in, duration_in = (np.maximum(discounted, 0) @ moments).T
+        pv_out, duration_out = pv_in - value, duration_in - duration
+
+        # Shrink the bracket towards the side that still contains the root
+        same_side = np.signbit(value) == negative_at_lo
+        lo = np.where(same_side, x, lo)
+        hi = np.where(same_side, hi, x)
+
+        # Newton step on log(PV of inflows / PV of outflows), which has the NPV's root and sign but
+        # is close to linear in log(1 + r), falling back to the bracket midpoint when it leaves the bracket
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = x + np.log(pv_in / pv_out) / (duration_in / pv_in - duration_out / pv_out)
+        bisect = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+
+        # A tiny Newton correction means converged even if rounding put it just outside the bracket
+        converged = np.abs(step - x) < NEWTON_TOLERANCE
+        x = np.where(value == 0, x, np.where(converged, step, np.where(bisect, (lo + hi) / 2, step)))
+        done = (value == 0) | converged | (hi - lo < TOLERANCE)
+        if done.any():
+            u[idx[done]] = x[done]
+            running = ~done
+            idx, flows, lo, hi, x = idx[running], flows[running], lo[running], hi[running], x[running]
+            negative_at_lo = negative_at_lo[running]
+    u[idx] = x
+    return u
+
+def _rate_grid(times):
+    """Grid of log(1 + r) values used to bracket roots; 0% is always a grid point."""
+    # Keep exp(-u * t) finite for the longest horizon
+    horizon = max(float(np.abs(times).max()), 1.0)
+    lo_bound = max(LOG_RATE_BOUNDS[0], -600 / horizon)
+    hi_bound = min(LOG_RATE_BOUNDS[1], 600 / horizon)
+    return np.union1d(np.linspace(lo_bound, hi_bound, GRID_POINTS), [0.0])
+
+def _unit_scale(cash_flows):
+    # Rows are scaled to unit size so the NPV evaluation cannot overflow
+    scale = np.abs(cash_flows).max(axis=-1, keepdims=True)
+    scale[scale == 0] = 1
+    return scale
+
+def _sign_change_flags(flows):
+    """True at each non-zero flow whose sign differs from the previous non-zero flow."""
+    signs = np.sign(flows)
+    positions = np.arange(flows.shape[-1])
+    last_nonzero = np.maximum.accumulate(np.where(signs != 0, positions, -1), axis=-1)
+    previous = np.concatenate([np.full(flows.shape[:-1] + (1,), -1), last_nonzero[..., :-1]], axis=-1)
+    previous_sign = np.take_along_axis(signs, np.maximum(previous, 0), axis=-1)
+    return (signs != 0) & (previous >= 0) & (signs != previous_sign)
+
+def _sign_changes(flows):
+    """Number of sign changes between consecutive non-zero flows of each row."""
+    return _sign_change_flags(flows).sum(axis=-1)
+
+def _coarse_grid(grid):
+    """COARSE_GRID_POINTS rates spanning grid, dense near 0% where most IRRs are and sparse towards the ends."""
+    scale = COARSE_GRID_SCALE
+    points = scale * np.sinh(np.linspace(np.arcsinh(grid[0] / scale), np.arcsinh(grid[-1] / scale),
+                                         COARSE_GRID_POINTS))
+    return np.clip(points, grid[0], grid[-1])
+
+def _solve_single_root(flows, times, grid, values):
+    """IRR of rows with one sign change, given their NPVs (rows, rates) on grid.
+
+    The NPV has a single root, so its one sign change on the grid brackets it.
+    """
+    result = np.full(flows.shape[0], np.nan)
+    negative = np.signbit(values)
+    crossing = negative[:, :-1] != negative[:, 1:]
+    rows = np.flatnonzero(crossing.any(axis=-1))
+    interval = np.argmax(crossing[rows], axis=-1)
+    u = _refine(flows[rows], times, grid[interval], grid[interval + 1], values[rows, interval],
+                values[rows, interval + 1])
+    result[rows] = np.expm1(u)
+    return result
+
+def _solve(flows, times, changes=None):
+    """Bracket-and-refine solver for unit-scaled 2-D (rows, periods) flows.
+
+    changes is the number of sign changes of each row, when already known.
+    """
+    n_rows = flows.shape[0]
+    result = np.full(n_rows, np.nan)
+    if n_rows == 0:
+        return result
+    grid = _rate_grid(times)
+    if changes is None:
+        changes = _sign_changes(flows)
+
+    # One sign change: a single root (Descartes), bracketed on a coarse grid
+    single = np.flatnonzero(changes == 1)
+    if len(single):
+        coarse = _coarse_grid(grid)
+        values = flows[single] @ np.exp(-np.outer(times, coarse))
+        result[single] = _solve_single_root(flows[single], times, coarse, values)
+
+    # Several sign changes: scan the grid for brackets
+    multiple = np.flatnonzero(changes > 1)
+    if len(multiple):
+        result[multiple] = _solve_multiple_roots(flows[multiple], times, grid)
+    return result
+
+def _solve_multiple_roots(flows, times, grid):
+    n_rows = flows.shape[0]
+    result = np.full(n_rows, np.nan)
+    values = flows @ np.exp(-np.outer(times, grid))
+
+    negative = np.signbit(values)
+    sign_change = (negative[:, :-1] != negative[:, 1:]) | (values[:, :-1] == 0) | (values[:, 1:] == 0)
+    sign_change &= (values[:, :-1] != 0) | (values[:, 1:] != 0)
+    distance = np.minimum(np.abs(np.expm1(grid[:-1])), np.abs(np.expm1(grid[1:])))
+
+    # Refine the bracket closest to 0% on each side of zero and keep the
+    # root nearest to 0%, which is the one numpy_financial.irr returns
+    candidates = []
+    for side in (grid[1:] <= 0, grid[:-1] >= 0):
+        side_distance = np.where(sign_change[:, side], distance[side], np.inf)
+        interval = np.flatnonzero(side)[np.argmin(side_distance, axis=-1)]
+        rows = np.flatnonzero(np.isfinite(side_distance.min(axis=-1)))
+        interval = interval[rows]
+        u = _refine(flows[rows], times, grid[interval], grid[interval + 1],
+                    values[rows, interval].copy(), values[rows, interval + 1].copy())
+        candidates.append((rows, np.expm1(u)))
+
+    for rows, rate in candidates:
+        closer = np.isnan(result[rows]) | (np.abs(rate) < np.abs(result[rows]))
+        result[rows[closer]] = rate[closer]
+    return result
+
+def irr(cash_flows, times=None):
+    """IRR of each row of cash_flows (periods on the last axis).
+
+    times gives the period of each column (default 0, 1, 2, ...); fractional
+    values are allowed, which makes this an XIRR when they are year fractions.
+    Returns an array of the leading shape (a float for 1-D input), with NaN
+    where no IRR exists.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    times = _as_times(times, cash_flows.shape[-1])
+    batch_shape = cash_flows.shape[:-1]
+    flat = cash_flows.reshape(-1, cash_flows.shape[-1])
+
+    result, two_flows = _closed_form(flat, times)
+    rest = np.flatnonzero(~two_flows)
+    if len(rest):
+        result[rest] = _solve(flat[rest] / _unit_scale(flat[rest]), times)
+    result = result.reshape(batch_shape)
+    return float(result) if result.ndim == 0 else result
+
+def prefix_irr(cash_flows, times=None):
+    """IRR of every prefix cash_flows[..., :k + 1], solved in one batch.
+
+    Returns an array shaped like cash_flows whose k-th entry matches
+    numpy_financial.irr(cash_flows[:k + 1]) (the root closest to 0%).
+    Sign changes and flow counts are running totals over each row, so only
+    the prefixes that need the iterative solver are built.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    n_periods = cash_flows.shape[-1]
+    times = _as_times(times, n_periods)
+    flows = cash_flows.reshape(-1, n_periods)
+    flows = flows / _unit_scale(flows)
+    result = np.full(flows.shape, np.nan)
+
+    changes = np.cumsum(_sign_change_flags(flows), axis=-1)
+    n_nonzero = np.cumsum(flows != 0, axis=-1)
+
+    # One outflow and one inflow: the closed form, from the first and the latest non-zero flow
+    rows, ends = np.nonzero((n_nonzero == 2) & (changes == 1))
+    if len(rows):
+        first = np.argmax(flows[rows] != 0, axis=-1)
+        positions = np.arange(n_periods)
+        last = np.max(np.where((flows[rows] != 0) & (positions <= ends[:, None]), positions, -1), axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = (-flows[rows, last] / flows[rows, first]) ** (1 / (times[last] - times[first])) - 1
+        result[rows, ends] = np.where(times[last] > times[first], rate, np.nan)
+
+    rows, ends = np.nonzero((n_nonzero > 2) & (changes >= 1))
+    if len(rows):
+        prefixes = np.where(np.arange(n_periods) <= ends[:, None], flows[rows], 0.0)
+        result[rows, ends] = _solve(prefixes, times, changes[rows, ends])
+    return result.reshape(cash_flows.shape)
+
+def irr_from_values(initial_investment, values):
+    """IRR of investing initial_investment at year 0 and holding to each year.
+
+    values has shape (..., years + 1) with year 0 first; the result drops year 0.
+    For this single-outflow, single-inflow case the IRR has a closed form.
+    """
+    values = np.asarray(values, dtype=np.float64)[..., 1:]
+    periods = np.arange(1, values.shape[-1] + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = (values / initial_investment) ** (1 / periods) - 1
+    return np.where((values > 0) & (initial_investment > 0), rate, np.nan)
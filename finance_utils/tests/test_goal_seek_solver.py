@@ -0,0 +1,42 @@
+"""finance_utils.goal_seek bracketing and failure modes."""
+import numpy as np
+import pytest
+
+from finance_utils import goal_seek
+
+def test_solves_monotone_function():
+    assert goal_seek(lambda x: x ** 3, 8.0, 0.0, 10.0) == pytest.approx(2.0, abs=1e-9)
+
+def test_solves_decreasing_function():
+    assert goal_seek(lambda x: np.exp(-x), 0.5, 0.0, 5.0) == pytest.approx(np.log(2), abs=1e-9)
+
+def test_returns_lowest_input_that_hits_target():
+    # sin(x) = 0.5 at pi / 6 and 5 pi / 6 in [0, pi]
+    assert goal_seek(np.sin, 0.5, 0.0, np.pi) == pytest.approx(np.pi / 6, abs=1e-9)
+
+def test_target_on_bound_and_grid_point():
+    assert goal_seek(lambda x: 2 * x, 0.0, 0.0, 1.0) == 0.0
+    assert goal_seek(lambda x: 2 * x, 2.0, 0.0, 1.0) == pytest.approx(1.0)
+
+def test_calls_func_with_arrays():
+    calls = []
+
+    def func(x):
+        calls.append(np.shape(x))
+        return x
+
+    goal_seek(func, 0.3, 0.0, 1.0, grid_points=16)
+    assert all(shape == (16,) for shape in calls)
+    assert len(calls) <= 10
+
+def test_no_root_in_bounds_raises():
+    with pytest.raises(ValueError, match='No input in'):
+        goal_seek(lambda x: x ** 2, -1.0, -3.0, 3.0)
+
+def test_nan_outputs_are_not_brackets():
+    with pytest.raises(ValueError, match='every output is NaN'):
+        goal_seek(lambda x: np.full_like(x, np.nan), 1.0, 0.0, 1.0)
+
+def test_bounds_must_be_ordered():
+    with pytest.raises(ValueError, match='lower must be below upper'):
+        goal_seek(lambda x: x, 0.5, 1.0, 1.0)
@@ -0,0 +1,90 @@
+"""finance_utils.irr against numpy_financial.irr and a per-prefix loop."""
+import warnings
+
+import numpy as np
+import pytest
+
+from finance_utils import irr, irr_from_values, npv, prefix_irr
+
+npf = pytest.importorskip('numpy_financial')
+
+def _npf_irr(flows):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return npf.irr(flows)
+
+def _real_roots(flows):
+    """Every real IRR above -100% of one cash-flow vector, from its polynomial in 1 / (1 + r)."""
+    roots = np.roots(np.trim_zeros(flows[::-1], 'f'))
+    discount = roots[np.isclose(roots.imag, 0) & (roots.real > 0)].real
+    return 1 / discount - 1
+
+def test_matches_numpy_financial_on_one_sign_change_flows():
+    rng = np.random.default_rng(0)
+    flows = np.hstack([-rng.uniform(10, 100, (500, 3)), rng.uniform(0, 80, (500, 9))])
+    expected = np.array([_npf_irr(row) for row in flows])
+    np.testing.assert_allclose(irr(flows), expected, rtol=0, atol=1e-9)
+
+def test_matches_numpy_financial_on_random_sign_flows():
+    rng = np.random.default_rng(1)
+    flows = rng.normal(0, 1, (2000, 8))
+    flows[:, 0] = -np.abs(flows[:, 0])
+    expected = np.array([_npf_irr(row) for row in flows])
+    result = irr(flows)
+
+    solved = ~np.isnan(result)
+    np.testing.assert_allclose(result[solved], expected[solved], rtol=0, atol=1e-6)
+    # The only misses are roots within 1% of another root, which the rate grid cannot separate
+    for row in np.flatnonzero(~solved & ~np.isnan(expected)):
+        roots = _real_roots(flows[row])
+        assert np.sum(np.abs(roots - expected[row]) < 0.01) >= 2
+
+@pytest.mark.parametrize('flows', [
+    [100.0, 50.0, 25.0],
+    [-100.0, -50.0, -25.0],
+    [0.0, 0.0, 0.0],
+    [-100.0],
+    [0.0, -100.0, 0.0]
+], ids=['all positive', 'all negative', 'zeros', 'single flow', 'single non-zero flow'])
+def test_no_solution_is_nan(flows):
+    assert np.isnan(irr(flows))
+    assert np.isnan(prefix_irr(flows)).all()
+
+def test_batch_keeps_nan_rows_apart():
+    flows = np.array([[-100.0, 110.0], [100.0, 110.0], [0.0, 0.0]])
+    result = irr(flows)
+    assert result[0] == pytest.approx(0.1)
+    assert np.isnan(result[1:]).all()
+
+def test_multiple_sign_changes_return_root_closest_to_zero():
+    # NPV proportional to (v - 1 / 1.1) * (v - 1 / 1.5) in v = 1 / (1 + r): IRRs of 10% and 50%
+    flows = -np.polynomial.polynomial.polyfromroots([1 / 1.1, 1 / 1.5])
+    assert flows[0] < 0 < flows[1] and flows[2] < 0
+    assert irr(flows) == pytest.approx(0.1, abs=1e-9)
+    assert irr(flows) == pytest.approx(_npf_irr(flows), abs=1e-9)
+    assert npv(irr(flows), flows) == pytest.approx(0.0, abs=1e-12)
+
+def test_closed_form_and_fractional_times():
+    assert irr([-100.0, 0.0, 121.0]) == pytest.approx(0.1)
+    # XIRR convention: one flow half a year later
+    assert irr([-100.0, 105.0], times=[0.0, 0.5]) == pytest.approx(1.05 ** 2 - 1)
+    np.testing.assert_allclose(irr_from_values(100.0, [100.0, 110.0, 121.0]), [0.1, 0.1])
+
+def test_prefix_irr_matches_per_prefix_loop():
+    rng = np.random.default_rng(2)
+    flows = np.hstack([-rng.uniform(50, 150, (50, 3)), rng.uniform(-20, 120, (50, 9))])
+    flows[::7, 4] = 0.0  # some prefixes end on a zero flow
+    result = prefix_irr(flows)
+    assert result.shape == flows.shape
+    for row, expected_row in zip(flows, result):
+        loop = np.array([irr(row[:k + 1]) for k in range(len(row))])
+        np.testing.assert_allclose(expected_row, loop, rtol=0, atol=1e-9)
+        finite = ~np.isnan(loop)
+        npf_loop = np.array([_npf_irr(row[:k + 1]) for k in range(len(row))])
+        np.testing.assert_allclose(loop[finite], npf_loop[finite], rtol=0, atol=1e-6)
+
+def test_prefix_irr_with_dated_flows():
+    times = np.array([0.0, 0.25, 1.0, 2.5])
+    flows = np.array([-100.0, -50.0, 20.0, 180.0])
+    expected = [irr(flows[:k + 1], times[:k + 1]) for k in range(4)]
+    np.testing.assert_allclose(prefix_irr(flows, times), expected, equal_nan=True)
@@ -2,12 +2,21 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import webbrowser
-import threading
-import time
-import os
-import numpy_financial as npf
+from hedge_engine import (
+    FREQUENCIES,
+    GRID_SHAPE,
+    annualized_returns,
+    draw_returns,
+    evaluate_fee_grid,
+    fee_grid,
+    multiples,
+    run_fee_comparison,
+    simulate_fee_structures,
+    solve_for
+)
+
+# The IRR solver is shared with the PE/VC model (the repository root package, see requirements.txt)
+from finance_utils import irr_from_values
 
 # Set page config FIRST
 st.set_page_config(
@@ -31,17 +40,6 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-def open_browser():
-    """Open the browser after a short delay to ensure Streamlit has started."""
-    if not os.environ.get('BROWSER_OPENED'):
-        time.sleep(1.5)  # Wait for Streamlit to start
-        webbrowser.open('http://localhost:8501')
-        os.environ['BROWSER_OPENED'] = '1'
-
-# Start the browser in a separate thread only if it hasn't been opened yet
-if not os.environ.get('BROWSER_OPENED'):
-    threading.Thread(target=open_browser, daemon=True).start()
-
 # Add a clean, professional divider function
 def section_divider():
     st.markdown(
@@ -100,6 +98,21 @@ if use_volatility:
         step=0.1
     )
 
+# Random seed and Monte Carlo mode (only meaningful with volatility)
+seed = None
+monte_carlo = False
+if use_volatility:
+    seed = int(st.sidebar.number_input("Random Seed", min_value=0, value=42, step=1))
+    monte_carlo = st.sidebar.checkbox("Monte Carlo Mode", value=False,
+                                      help="Simulate many return paths and show the distribution of outcomes")
+    if monte_carlo:
+        n_paths = st.sidebar.select_slider(
+            "Simulated Paths",
+            options=[1_000, 5_000, 10_000, 50_000, 100_000, 250_000, 1_000_000],
+            value=10_000,
+            help="Runs too large for an instant rerun wait for the Run Simulation button"
+        )
+
 # Investment period
 years = st.sidebar.number_input(
     "Investment Period (years)",
@@ -121,6 +134,21 @@ hurdle_rate = st.sidebar.number_input(
     step=0.1
 )
 
+# Fee granularity: every setting, annual included, uses the NAV-based period engine
+accrual = st.sidebar.selectbox(
+    "Management Fee Accrual",
+    options=list(FREQUENCIES),
+    index=0,
+    format_func=str.capitalize
+)
+crystallization = st.sidebar.selectbox(
+    "Performance Fee Crystallization",
+    options=[name for name, per_year in FREQUENCIES.items() if FREQUENCIES[accrual] % per_year == 0],
+    index=0,
+    format_func=str.capitalize,
+    help="Crystallization can be no more frequent than accrual"
+)
+
 # --- Sidebar inputs for fee structure comparison ---
 st.sidebar.markdown("---")
 st.sidebar.header("Fee Structure Comparison")
@@ -133,81 +161,109 @@ st.sidebar.markdown("**Fee Structure 2**")
 user2_mgmt = st.sidebar.number_input("Management Fee 2 (%)", min_value=0.0, max_value=10.0, value=1.5, step=0.1, key='mgmt2')
 user2_perf = st.sidebar.number_input("Performance Fee 2 (%)", min_value=0.0, max_value=100.0, value=15.0, step=1.0, key='perf2')
 
-def calculate_portfolio_values(initial_investment, annual_return, volatility, years,
-                             management_fee, performance_fee, hurdle_rate, high_water_mark):
-    # Initialize arrays
-    years_array = np.arange(years + 1)
-    gross_values = np.zeros(years + 1)
-    net_values = np.zeros(years + 1)
-    management_fees = np.zeros(years + 1)
-    performance_fees = np.zeros(years + 1)
-    
-    # Set initial values
-    gross_values[0] = initial_investment
-    net_values[0] = initial_investment
-    high_water = initial_investment
-    
-    # Calculate values for each year
-    for year in range(1, years + 1):
-        # Calculate gross return with volatility if enabled
-        if use_volatility:
-            random_return = np.random.normal(annual_return, volatility)
-            gross_return = 1 + (random_return / 100)
-        else:
-            gross_return = 1 + (annual_return / 100)
-        
-        # Calculate gross value
-        gross_values[year] = gross_values[year-1] * gross_return
-        
-        # Calculate management fee
-        management_fee_amount = net_values[year-1] * (management_fee / 100)
-        management_fees[year] = management_fee_amount
-        
-        # Calculate net value before performance fee
-        net_before_perf = gross_values[year] - management_fee_amount
-        
-        # Calculate performance fee
-        if high_water_mark:
-            performance_fee_base = max(0, net_before_perf - high_water)
-        else:
-            performance_fee_base = max(0, net_before_perf - net_values[year-1])
-        
-        if performance_fee_base > 0 and (net_before_perf - net_values[year-1]) > (hurdle_rate / 100 * net_values[year-1]):
-            performance_fee_amount = performance_fee_base * (performance_fee / 100)
-        else:
-            performance_fee_amount = 0
-            
-        performance_fees[year] = performance_fee_amount
-        
-        # Calculate final net value
-        net_values[year] = net_before_perf - performance_fee_amount
-        
-        # Update high water mark
-        if high_water_mark:
-            high_water = max(high_water, net_values[year])
-    
-    return years_array, gross_values, net_values, management_fees, performance_fees
-
-def calculate_scenario(initial_investment, return_rate, volatility, years,
-                      management_fee, performance_fee, hurdle_rate, high_water_mark):
-    """Calculate a single scenario with given parameters."""
-    _, _, net_values, _, _ = calculate_portfolio_values(
-        initial_investment, return_rate, volatility, years,
-        management_fee, performance_fee, hurdle_rate, high_water_mark
+# Sensitivity mode: every management x performance x hurdle combination on the same return path
+sensitivity = st.sidebar.checkbox("Sensitivity Mode", value=False,
+                                  help="Evaluate a full grid of fee structures and show heatmaps")
+if sensitivity:
+    max_grid_mgmt = st.sidebar.number_input("Max Management Fee (%)", min_value=0.1, max_value=10.0, value=5.0, step=0.1)
+    max_grid_perf = st.sidebar.number_input("Max Performance Fee (%)", min_value=1.0, max_value=100.0, value=50.0, step=1.0)
+    max_grid_hurdle = st.sidebar.number_input("Max Hurdle Rate (%)", min_value=0.0, max_value=100.0, value=10.0, step=0.5)
+
+# Goal seek: solve for one input of Fee Structure 1 instead of stepping its slider by hand
+GOAL_SEEK_INPUTS = {
+    'Management Fee 1 (%)': 'management_fee',
+    'Performance Fee 1 (%)': 'performance_fee',
+    'Hurdle Rate (%)': 'hurdle_rate',
+    'Annual Return (%)': 'annual_return'
+}
+GOAL_SEEK_METRICS = {
+    'Net Annualized Return (%)': 'net_annualized_return_pct',
+    'Final Net Value': 'final_net_value',
+    'Net MOIC (x)': 'net_moic',
+    'Fee Drag (%)': 'fee_drag_pct'
+}
+goal_seek = st.sidebar.checkbox("Goal Seek", value=False,
+                                help="Find the input value that hits a target outcome for Fee Structure 1")
+if goal_seek:
+    seek_input = st.sidebar.selectbox("Solve For", options=list(GOAL_SEEK_INPUTS))
+    seek_metric = st.sidebar.selectbox("Target Metric", options=list(GOAL_SEEK_METRICS))
+    seek_target = st.sidebar.number_input("Target Value", value=8.0, step=0.5)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_fee_comparison(initial_investment, annual_return, volatility, years,
+                           management_fees, performance_fees, hurdle_rate, high_water_mark, seed,
+                           accrual, crystallization):
+    """Fee paths for several fee structures on one return path, cached per sidebar state."""
+    return run_fee_comparison(
+        initial_investment, annual_return, volatility, years,
+        management_fees, performance_fees, hurdle_rate, high_water_mark, seed=seed,
+        accrual=accrual, crystallization=crystallization
     )
-    return net_values[-1]
 
-# Calculate portfolio values for main outputs using Fee Structure 1
-# Gross (no fees)
-years_array, gross_values, _, _, _ = calculate_portfolio_values(
-    initial_investment, annual_return, volatility, years,
-    0, 0, hurdle_rate, high_water_mark
-)
-# Net (Fee Structure 1)
-_, _, net_values, management_fees, performance_fees = calculate_portfolio_values(
+@st.cache_data(max_entries=16, show_spinner="Evaluating fee grid...")
+def compute_sensitivity_grid(annual_return, volatility, years, seed, high_water_mark, accrual, crystallization,
+                             max_management_fee, max_performance_fee, max_hurdle_rate):
+    """Fee grid for one unit invested; the investment amount only rescales it, so it is not a cache key."""
+    return evaluate_fee_grid(
+        1.0, draw_returns(annual_return, volatility, years, seed),
+        *fee_grid(max_management_fee, max_performance_fee, max_hurdle_rate),
+        high_water_mark=high_water_mark, accrual=accrual, crystallization=crystallization
+    )
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_goal_seek(input_name, metric, target, initial_investment, annual_return, years, management_fee,
+                      performance_fee, hurdle_rate, high_water_mark, volatility, seed, accrual, crystallization):
+    """Solved input value, or the reason there is none, cached per sidebar state."""
+    try:
+        return solve_for(input_name, metric, target, initial_investment, annual_return, years, management_fee,
+                         performance_fee, hurdle_rate, high_water_mark, volatility, seed, accrual, crystallization), None
+    except ValueError as e:
+        return None, str(e)
+
+# Measured simulation cost per path-year in microseconds: a fixed part plus a part per crystallization
+PATH_YEAR_US = 0.5
+CRYSTALLIZATION_US = 0.07
+# Runs estimated above this compute only on request; the rest of the 300 ms rerun is left for the charts
+RERUN_BUDGET_MS = 200
+
+def monte_carlo_ms(n_paths, years, crystallization):
+    """Estimated simulation time, e.g. 57 ms for 10,000 annual paths over 10 years."""
+    return n_paths * years * (PATH_YEAR_US + CRYSTALLIZATION_US * FREQUENCIES[crystallization]) / 1000
+
+@st.cache_data(max_entries=32, show_spinner="Simulating return paths...")
+def run_monte_carlo(initial_investment, annual_return, volatility, years, n_paths, seed,
+                    management_fees, performance_fees, hurdle_rate, high_water_mark, accrual, crystallization):
+    """Monte Carlo summary for several fee structures, cached per sidebar state."""
+    return simulate_fee_structures(
+        initial_investment, annual_return, volatility, years, n_paths,
+        list(management_fees), list(performance_fees), hurdle_rate, high_water_mark, seed=seed,
+        accrual=accrual, crystallization=crystallization
+    )
+
+if goal_seek:
+    solved, reason = compute_goal_seek(
+        GOAL_SEEK_INPUTS[seek_input], GOAL_SEEK_METRICS[seek_metric], seek_target, initial_investment,
+        annual_return, years, user1_mgmt, user1_perf, hurdle_rate, high_water_mark, volatility, seed,
+        accrual, crystallization
+    )
+    if solved is None:
+        st.sidebar.warning(reason)
+    else:
+        st.sidebar.success(f"{seek_input} = {solved:.4f} gives {seek_metric} = {seek_target:,g}")
+
+# Evaluate every fee structure on the same return path in one batched call:
+# index 0 is no fees, 1 is Fee Structure 1 (main outputs) and 2 is Fee Structure 2
+fee_paths = compute_fee_comparison(
     initial_investment, annual_return, volatility, years,
-    user1_mgmt, user1_perf, hurdle_rate, high_water_mark
+    (0.0, user1_mgmt, user2_mgmt), (0.0, user1_perf, user2_perf),
+    hurdle_rate, high_water_mark, seed, accrual, crystallization
 )
+years_array = fee_paths.years
+# The gross path carries no fees, so it is the same for every structure
+gross_values = fee_paths.gross_values[0]
+net_values = fee_paths.net_values[1]
+management_fees = fee_paths.management_fees[1]
+performance_fees = fee_paths.performance_fees[1]
 
 # Create DataFrame for results
 results_df = pd.DataFrame({
@@ -228,12 +284,8 @@ total_fees = total_management_fees + total_performance_fees
 gross_mm = gross_values[-1] / initial_investment
 net_mm = net_values[-1] / initial_investment
 
-# Calculate Baseline (No Fees) scenario
-_, gross_values_baseline, _, _, _ = calculate_portfolio_values(
-    initial_investment, annual_return, volatility, years,
-    management_fee=0, performance_fee=0, hurdle_rate=0, high_water_mark=False
-)
-baseline_final = gross_values_baseline[-1]
+# Baseline (No Fees) scenario
+baseline_final = gross_values[-1]
 live_final = net_values[-1]
 fees_impact_pct = (baseline_final - live_final) / baseline_final * 100 if baseline_final > 0 else 0
 
@@ -293,15 +345,10 @@ fig2.update_layout(
 )
 
 # IRR and MOIC Over Time Figures
-irr_gross = []
-irr_net = []
-moic_gross = []
-moic_net = []
-for i in range(1, years + 1):
-    irr_gross.append((gross_values[i] / initial_investment) ** (1/i) - 1)
-    irr_net.append((net_values[i] / initial_investment) ** (1/i) - 1)
-    moic_gross.append(gross_values[i] / initial_investment)
-    moic_net.append(net_values[i] / initial_investment)
+irr_gross = annualized_returns(gross_values, initial_investment)
+irr_net = annualized_returns(net_values, initial_investment)
+moic_gross = multiples(gross_values, initial_investment)
+moic_net = multiples(net_values, initial_investment)
 
 fig_irr = go.Figure()
 fig_irr.add_trace(go.Scatter(x=years_array[1:], y=irr_gross, name="Gross IRR", line=dict(color='#0066FF', width=2)))
@@ -334,22 +381,10 @@ fig_moic.update_layout(
 )
 
 # --- True IRR (Cash Flow IRR) Over Time ---
-true_irr_gross = []
-true_irr_net = []
-for i in range(1, years + 1):
-    # Gross IRR: cash flows are -initial_investment at t=0, 0 for years 1..i-1, gross_values[i] at year i
-    gross_cf = [-initial_investment] + [0]*(i-1) + [gross_values[i]]
-    net_cf = [-initial_investment] + [0]*(i-1) + [net_values[i]]
-    try:
-        gross_irr_val = npf.irr(gross_cf)
-    except Exception:
-        gross_irr_val = np.nan
-    try:
-        net_irr_val = npf.irr(net_cf)
-    except Exception:
-        net_irr_val = np.nan
-    true_irr_gross.append(gross_irr_val)
-    true_irr_net.append(net_irr_val)
+# Cash flows are -initial_investment at t=0 and the portfolio value at year i,
+# which the shared solver handles in closed form for every year at once
+true_irr_gross = irr_from_values(initial_investment, gross_values)
+true_irr_net = irr_from_values(initial_investment, net_values)
 
 fig_true_irr = go.Figure()
 fig_true_irr.add_trace(go.Scatter(x=years_array[1:], y=true_irr_gross, name="Gross IRR (True)", line=dict(color='#0066FF', width=2)))
@@ -400,6 +435,80 @@ st.markdown("This chart compares how the investment grows with and without hedge
 
 section_divider()
 
+# --- Monte Carlo Distribution Section ---
+if monte_carlo:
+    structure_names = ["No Fees", f"{user1_mgmt:.2f}% / {user1_perf:.2f}%", f"{user2_mgmt:.2f}% / {user2_perf:.2f}%"]
+    mc_args = (initial_investment, annual_return, volatility, years, n_paths, seed,
+               (0.0, user1_mgmt, user2_mgmt), (0.0, user1_perf, user2_perf), hurdle_rate, high_water_mark,
+               accrual, crystallization)
+    st.markdown("## Monte Carlo Distribution")
+    # Large runs stay off the rerun path: they run on request and are kept for reruns with the same inputs
+    last_args, mc = st.session_state.get('monte_carlo', (None, None))
+    if last_args != mc_args:
+        mc = None
+        estimate_ms = monte_carlo_ms(n_paths, years, crystallization)
+        if estimate_ms <= RERUN_BUDGET_MS or st.button("Run Simulation", key='run_monte_carlo'):
+            mc = run_monte_carlo(*mc_args)
+            st.session_state['monte_carlo'] = (mc_args, mc)
+        else:
+            st.info(f"{n_paths:,} paths over {years} years take about {estimate_ms / 1000:,.1f} s, "
+                    "so they are simulated only when you press Run Simulation.")
+            section_divider()
+
+if monte_carlo and mc is not None:
+    low, mid, high = mc.percentiles
+
+    colA, colB, colC, colD = st.columns(4)
+    with colA:
+        st.metric(f"P{low} Net Value", f"{mc.terminal_net[1, 0]:,.2f} {currency}")
+    with colB:
+        st.metric(f"P{mid} Net Value", f"{mc.terminal_net[1, 1]:,.2f} {currency}")
+    with colC:
+        st.metric(f"P{high} Net Value", f"{mc.terminal_net[1, 2]:,.2f} {currency}")
+    with colD:
+        st.metric("Ends Below High-Water Mark", f"{mc.hwm_breach_probability[1]:.1%}")
+
+    fig_mc = go.Figure()
+    fan_colors = ['#0066FF', '#FF2222', '#00CC44']
+    fan_fills = ['rgba(0,102,255,0.15)', 'rgba(255,34,34,0.15)', 'rgba(0,204,68,0.15)']
+    for i, name in enumerate(structure_names):
+        fig_mc.add_trace(go.Scatter(x=mc.years, y=mc.net_fan[i, :, 2], line=dict(width=0),
+                                    showlegend=False, hoverinfo='skip'))
+        fig_mc.add_trace(go.Scatter(x=mc.years, y=mc.net_fan[i, :, 0], line=dict(width=0), fill='tonexty',
+                                    fillcolor=fan_fills[i], name=f"{name} P{low}-P{high}"))
+        fig_mc.add_trace(go.Scatter(x=mc.years, y=mc.net_fan[i, :, 1], name=f"{name} Median",
+                                    line=dict(color=fan_colors[i], width=2)))
+    fig_mc.update_layout(
+        plot_bgcolor="#000000",
+        paper_bgcolor="#000000",
+        font_color="#FFFFFF",
+        title=f"Net Portfolio Value Distribution ({mc.n_paths:,} paths)",
+        xaxis_title="Year",
+        yaxis_title=f"Net Portfolio Value ({currency})",
+        hovermode='x unified',
+        showlegend=True
+    )
+    st.plotly_chart(fig_mc, use_container_width=True, key='monte_carlo_chart')
+
+    mc_df = pd.DataFrame({
+        'Fee Structure': structure_names,
+        f'P{low} Net Value': mc.terminal_net[:, 0],
+        f'P{mid} Net Value': mc.terminal_net[:, 1],
+        f'P{high} Net Value': mc.terminal_net[:, 2],
+        'Mean Net Value': mc.mean_terminal_net,
+        'P(Below HWM)': mc.hwm_breach_probability * 100,
+        f'Fee Drag P{low} (%)': mc.fee_drag[:, 0],
+        f'Fee Drag P{mid} (%)': mc.fee_drag[:, 1],
+        f'Fee Drag P{high} (%)': mc.fee_drag[:, 2]
+    })
+    st.dataframe(mc_df.style.format({col: '{:,.2f}' for col in mc_df.columns if col != 'Fee Structure'}),
+                 hide_index=True)
+    st.info(f"All fee structures are applied to the same {mc.n_paths:,} simulated return paths (seed {seed}). "
+            "Fee drag is the share of the gross final value lost to fees; a path is below its high-water mark "
+            "when it ends under its own peak net value.")
+
+    section_divider()
+
 # --- Tabbed Metrics Section (IRR, MOIC, Detailed Data) ---
 st.markdown("## Key Performance Metrics")
 tabs = st.tabs(["IRR", "MOIC", "Detailed Data"])
@@ -428,16 +537,7 @@ for i, tab in enumerate(tabs):
 section_divider()
 
 # --- Returns Comparison Calculation ---
-def calc_net_curve(mgmt_fee, perf_fee):
-    _, _, net_curve, _, _ = calculate_portfolio_values(
-        initial_investment, annual_return, volatility, years,
-        mgmt_fee, perf_fee, hurdle_rate, high_water_mark
-    )
-    return net_curve
-
-net_no_fee = calc_net_curve(0, 0)
-net_user1 = calc_net_curve(user1_mgmt, user1_perf)
-net_user2 = calc_net_curve(user2_mgmt, user2_perf)
+net_no_fee, net_user1, net_user2 = fee_paths.net_values
 
 # --- Returns Comparison Chart ---
 section_divider()
@@ -477,15 +577,60 @@ This chart compares the net portfolio value over time for three fee structures:
 """)
 section_divider()
 
-# --- Calculate annual fees for both user-defined fee structures ---
-_, _, _, mgmt_fees_1, perf_fees_1 = calculate_portfolio_values(
-    initial_investment, annual_return, volatility, years,
-    user1_mgmt, user1_perf, hurdle_rate, high_water_mark
-)
-_, _, _, mgmt_fees_2, perf_fees_2 = calculate_portfolio_values(
-    initial_investment, annual_return, volatility, years,
-    user2_mgmt, user2_perf, hurdle_rate, high_water_mark
-)
+# --- Fee Sensitivity Section ---
+if sensitivity:
+    grid = compute_sensitivity_grid(
+        annual_return, volatility, years, seed, high_water_mark, accrual, crystallization,
+        max_grid_mgmt, max_grid_perf, max_grid_hurdle
+    ).scaled(initial_investment)
+    n_mgmt, n_perf, n_hurdle = GRID_SHAPE
+
+    st.markdown("## Fee Sensitivity")
+    # Picking a hurdle only selects a slice of the cached grid
+    hurdle_index = st.select_slider(
+        "Hurdle Rate Slice (%)",
+        options=list(range(n_hurdle)),
+        value=0,
+        format_func=lambda i: f"{grid.hurdle_rates[i]:.2f}"
+    )
+    user_points = dict(x=[user1_perf, user2_perf], y=[user1_mgmt, user2_mgmt], mode='markers+text',
+                       text=["FS1", "FS2"], textposition='top center', textfont=dict(color="#FFFFFF"),
+                       marker=dict(color="#FFFFFF", size=10, symbol='x'), showlegend=False)
+
+    col_net, col_drag = st.columns(2)
+    heatmaps = [
+        (col_net, grid.terminal_net, "Final Net Value", f"Final Net Value ({currency})", 'Viridis'),
+        (col_drag, grid.fee_drag, "Fee Drag", "Fee Drag (%)", 'Reds')
+    ]
+    for col, values, title, colorbar_title, colorscale in heatmaps:
+        fig_heat = go.Figure()
+        fig_heat.add_trace(go.Heatmap(
+            x=grid.performance_fees,
+            y=grid.management_fees,
+            z=values[:, :, hurdle_index],
+            colorscale=colorscale,
+            colorbar=dict(title=colorbar_title),
+            hovertemplate="Perf %{x:.2f}% / Mgmt %{y:.2f}%<br>%{z:,.2f}<extra></extra>"
+        ))
+        fig_heat.add_trace(go.Scatter(**user_points))
+        fig_heat.update_layout(
+            plot_bgcolor="#000000",
+            paper_bgcolor="#000000",
+            font_color="#FFFFFF",
+            title=f"{title} (Hurdle {grid.hurdle_rates[hurdle_index]:.2f}%)",
+            xaxis_title="Performance Fee (%)",
+            yaxis_title="Management Fee (%)"
+        )
+        with col:
+            st.plotly_chart(fig_heat, use_container_width=True, key=f'sensitivity_{title}')
+    st.info(f"{n_mgmt} x {n_perf} x {n_hurdle} fee structures evaluated on the same return path "
+            f"(gross final value {grid.terminal_gross:,.2f} {currency}). The markers show Fee Structures 1 and 2; "
+            "the hurdle slider switches between precomputed slices.")
+    section_divider()
+
+# --- Annual fees for both user-defined fee structures ---
+mgmt_fees_1, mgmt_fees_2 = fee_paths.management_fees[1:]
+perf_fees_1, perf_fees_2 = fee_paths.performance_fees[1:]
 
 # --- Fees Section ---
 st.markdown("## Fee Breakdown (Comparison)")
@@ -0,0 +1,178 @@
+"""Headless batch runner: price fee terms for many investor scenarios without the UI.
+
+Reads a CSV or Parquet file with one scenario per row, evaluates every row
+with the vectorized fee engine across a process pool and writes one result
+row per scenario to Parquet (or CSV).
+
+Required columns: initial_investment, annual_return, years, management_fee,
+performance_fee (returns and fees in %, as in the app; years a whole number). Optional columns:
+volatility (default 0), hurdle_rate (0), high_water_mark (False; true/false,
+1/0 or yes/no, any case), seed, accrual and crystallization ('annual',
+'quarterly' or 'monthly'). Rows with
+volatility draw their own return path from their seed, so a row gives the
+same answer as the app with the same inputs; without a seed column row i
+uses --seed + i.
+
+Examples:
+    python batch.py scenarios.csv --output results.parquet
+    python batch.py accounts.parquet --output results.csv --workers 4
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Make hedge_engine importable when run from another directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from hedge_engine import FREQUENCIES, apply_fees, draw_returns
+
+REQUIRED_COLUMNS = ['initial_investment', 'annual_return', 'years', 'management_fee', 'performance_fee']
+DEFAULTS = {
+    'volatility': 0.0,
+    'hurdle_rate': 0.0,
+    'high_water_mark': False,
+    'accrual': 'annual',
+    'crystallization': 'annual'
+}
+# Spellings accepted for high_water_mark; anything else is rejected rather than read as True
+FLAG_VALUES = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+# Rows per task sent to a worker
+CHUNK_ROWS = 5_000
+
+def parse_flags(values, col):
+    """Booleans from a column of bools or FLAG_VALUES literals; raises ValueError on anything else."""
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    # Numeric columns hold 1.0/0.0 once a blank cell has made them float
+    text = values.astype(str).str.strip().str.lower().replace({'1.0': '1', '0.0': '0'})
+    flags = text.map(FLAG_VALUES)
+    unknown = flags.isna()
+    if unknown.any():
+        raise ValueError(f"unknown {col} values: {', '.join(sorted(set(values[unknown].astype(str))))} "
+                         f"(use true/false, 1/0 or yes/no)")
+    return flags.astype(bool)
+
+def parse_years(values):
+    """Horizons as ints; raises ValueError naming rows that are blank, fractional or below 1."""
+    years = pd.to_numeric(values, errors='coerce')
+    bad = years.isna() | (years % 1 != 0) | (years < 1)
+    if bad.any():
+        rows = ', '.join(f"{row} ({value})" for row, value in values[bad].head(10).items())
+        more = f" and {bad.sum() - 10} more" if bad.sum() > 10 else ""
+        raise ValueError(f"years must be a whole number of at least 1; bad rows: {rows}{more}")
+    return years.astype(int)
+
+def read_scenarios(path, base_seed=0):
+    """Load and validate a scenario file, filling optional columns with their defaults."""
+    scenarios = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+    missing = [col for col in REQUIRED_COLUMNS if col not in scenarios.columns]
+    if missing:
+        raise ValueError(f"{path} is missing required columns: {', '.join(missing)}")
+
+    scenarios = scenarios.reset_index(drop=True)
+    for col, default in DEFAULTS.items():
+        scenarios[col] = scenarios[col].fillna(default) if col in scenarios.columns else default
+    if 'seed' not in scenarios.columns:
+        scenarios['seed'] = base_seed + np.arange(len(scenarios))
+    scenarios['years'] = parse_years(scenarios['years'])
+    scenarios['high_water_mark'] = parse_flags(scenarios['high_water_mark'], 'high_water_mark')
+
+    for col in ('accrual', 'crystallization'):
+        unknown = set(scenarios[col]) - set(FREQUENCIES)
+        if unknown:
+            raise ValueError(f"unknown {col} values: {', '.join(map(str, sorted(unknown)))}")
+    periods = scenarios['accrual'].map(FREQUENCIES) % scenarios['crystallization'].map(FREQUENCIES)
+    if (periods != 0).any():
+        raise ValueError("crystallization can be no more frequent than accrual")
+    return scenarios
+
+def evaluate_scenarios(scenarios):
+    """Result columns for a frame of validated scenarios (same index as the input).
+
+    Rows sharing a horizon and fee granularity go through the engine in one
+    call. Every fee rule is proportional to the amount invested, so paths are
+    computed per unit invested and scaled by each row's investment.
+    """
+    results = pd.DataFrame(index=scenarios.index, dtype=np.float64)
+    for (years, accrual, crystallization), group in scenarios.groupby(['years', 'accrual', 'crystallization']):
+        returns = np.empty((len(group), years))
+        for i, (annual_return, volatility, seed) in enumerate(
+                zip(group['annual_return'], group['volatility'], group['seed'])):
+            returns[i] = draw_returns(annual_return, volatility, years, None if pd.isna(seed) else int(seed))
+
+        paths = apply_fees(
+            1.0, returns,
+            management_fee=group['management_fee'].to_numpy(np.float64),
+            performance_fee=group['performance_fee'].to_numpy(np.float64),
+            hurdle_rate=group['hurdle_rate'].to_numpy(np.float64),
+            high_water_mark=group['high_water_mark'].to_numpy(bool),
+            accrual=accrual,
+            crystallization=crystallization
+        )
+        investment = group['initial_investment'].to_numpy(np.float64)
+        final_gross = paths.gross_values[:, -1] * investment
+        final_net = paths.net_values[:, -1] * investment
+        management = paths.management_fees.sum(axis=-1) * investment
+        performance = paths.performance_fees.sum(axis=-1) * investment
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results.loc[group.index, 'final_gross_value'] = final_gross
+            results.loc[group.index, 'final_net_value'] = final_net
+            results.loc[group.index, 'total_management_fees'] = management
+            results.loc[group.index, 'total_performance_fees'] = performance
+            results.loc[group.index, 'total_fees'] = management + performance
+            results.loc[group.index, 'fee_drag_pct'] = np.where(
+                final_gross > 0, (final_gross - final_net) / final_gross * 100, np.nan)
+            results.loc[group.index, 'net_annualized_return_pct'] = ((final_net / investment) ** (1 / years) - 1) * 100
+            results.loc[group.index, 'net_moic'] = final_net / investment
+    return results
+
+def run_batch(scenarios, workers=None):
+    """Evaluate scenarios in chunks across a process pool and append the result columns."""
+    chunks = [scenarios.iloc[start:start + CHUNK_ROWS] for start in range(0, len(scenarios), CHUNK_ROWS)]
+    workers = min(workers or max(1, multiprocessing.cpu_count() - 1), max(len(chunks), 1))
+    if workers == 1:
+        results = [evaluate_scenarios(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(evaluate_scenarios, chunks))
+    if not results:
+        return scenarios.copy()
+    return pd.concat([scenarios, pd.concat(results)], axis=1)
+
+def write_results(results, path):
+    if path.endswith('.csv'):
+        results.to_csv(path, index=False)
+    else:
+        results.to_parquet(path, index=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate hedge fund fee terms for many scenarios without the UI.")
+    parser.add_argument('scenarios', help="CSV or Parquet file with one scenario per row")
+    parser.add_argument('--output', default='hedge_fund_results.parquet',
+                        help="Result file; .csv writes CSV, anything else Parquet")
+    parser.add_argument('--workers', type=int, help="Number of worker processes (default: CPUs - 1)")
+    parser.add_argument('--seed', type=int, default=0, help="Base seed for rows without a seed column")
+    args = parser.parse_args(argv)
+
+    if not args.output.endswith('.csv'):
+        # Fail before any work if no Parquet engine (pyarrow/fastparquet) is installed
+        pd.DataFrame({'x': []}).to_parquet(io.BytesIO())
+    try:
+        scenarios = read_scenarios(args.scenarios, args.seed)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    results = run_batch(scenarios, workers=args.workers)
+    write_results(results, args.output)
+    print(f"Evaluated {len(results):,} scenarios -> {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""Fee and return engine behind the hedge fund performance app.
+
+Pure numpy functions with no Streamlit dependency, so they can be imported,
+cached, tested and benchmarked on their own.
+"""
+from .fees import (
+    FREQUENCIES,
+    FeePaths,
+    apply_fees,
+    compute_fee_paths,
+    compute_periodic_fee_paths,
+    constant_returns
+)
+from .goal_seek import solve_for, terminal_metrics
+from .monte_carlo import MonteCarloSummary, simulate_fee_structures
+from .scenario import (
+    annualized_returns,
+    calculate_portfolio_values,
+    draw_returns,
+    multiples,
+    run_fee_comparison
+)
+from .sensitivity import GRID_SHAPE, SensitivityGrid, evaluate_fee_grid, fee_grid
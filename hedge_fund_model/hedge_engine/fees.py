@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Accrual / crystallization frequencies, in periods per year
+FREQUENCIES = {'annual': 1, 'quarterly': 4, 'monthly': 12}
+
+@dataclass
+class FeePaths:
+    """Year-by-year values for a batch of fee structures and return paths.
+
+    Every array has the broadcast batch shape followed by a year axis of
+    length years + 1 (year 0 is the initial investment).
+    """
+    years: np.ndarray
+    gross_values: np.ndarray
+    net_values: np.ndarray
+    management_fees: np.ndarray
+    performance_fees: np.ndarray
+
+    @property
+    def total_fees(self):
+        return self.management_fees.sum(axis=-1) + self.performance_fees.sum(axis=-1)
+
+def constant_returns(annual_return, years):
+    """Return path (in %) with the same return every year."""
+    return np.full(years, float(annual_return))
+
+def compute_fee_paths(initial_investment, gross_returns, management_fee, performance_fee,
+                      hurdle_rate=0.0, high_water_mark=False):
+    """Legacy annual fee model of the original app; apply_fees does not use it.
+
+    Kept to reproduce figures from the original per-year loop. Net value is
+    the gross (fee-free) value less only the current year's fees, so fees
+    paid in earlier years never compound out of the investment; use
+    apply_fees for every current result.
+
+    gross_returns holds annual returns in percent with years on the last axis,
+    e.g. shape (years,) for one path or (paths, years) for many. The fee terms
+    (all in percent) and high_water_mark may be scalars or arrays; they are
+    broadcast against the leading axes of gross_returns, so passing fees of
+    shape (structures, 1) with returns of shape (paths, years) evaluates every
+    structure on every path in one call.
+
+    The rules match the original per-year loop of the app: the management fee
+    is charged on the previous net value, the performance fee is charged on
+    the gain over the previous net value (or over the high-water mark) when
+    the year's gain beats the hurdle, and the gross path carries no fees.
+    """
+    gross_returns = np.asarray(gross_returns, dtype=np.float64)
+    n_years = gross_returns.shape[-1]
+    management_fee = np.asarray(management_fee, dtype=np.float64) / 100
+    performance_fee = np.asarray(performance_fee, dtype=np.float64) / 100
+    hurdle_rate = np.asarray(hurdle_rate, dtype=np.float64) / 100
+    high_water_mark = np.asarray(high_water_mark, dtype=bool)
+
+    batch_shape = np.broadcast_shapes(gross_returns.shape[:-1], management_fee.shape, performance_fee.shape,
+                                      hurdle_rate.shape, high_water_mark.shape)
+    gross_returns = np.broadcast_to(gross_returns, batch_shape + (n_years,))
+
+    # Multiply year by year from the initial value, exactly as the loop did
+    growth = np.empty(batch_shape + (n_years + 1,))
+    growth[..., 0] = initial_investment
+    growth[..., 1:] = 1 + gross_returns / 100
+    gross_values = np.cumprod(growth, axis=-1)
+
+    net_values = np.empty(batch_shape + (n_years + 1,))
+    management_fees = np.zeros(batch_shape + (n_years + 1,))
+    performance_fees = np.zeros(batch_shape + (n_years + 1,))
+    net_values[..., 0] = initial_investment
+    high_water = np.full(batch_shape, float(initial_investment))
+
+    # The recurrence is sequential in time only; each step is vectorized over the batch
+    for year in range(1, n_years + 1):
+        previous = net_values[..., year - 1]
+        management = previous * management_fee
+        net_before_perf = gross_values[..., year] - management
+
+        gain = net_before_perf - previous
+        fee_base = np.maximum(0, np.where(high_water_mark, net_before_perf - high_water, gain))
+        charged = (fee_base > 0) & (gain > hurdle_rate * previous)
+        performance = np.where(charged, fee_base * performance_fee, 0.0)
+
+        management_fees[..., year] = management
+        performance_fees[..., year] = performance
+        net_values[..., year] = net_before_perf - performance
+        high_water = np.where(high_water_mark, np.maximum(high_water, net_values[..., year]), high_water)
+
+    return FeePaths(
+        years=np.arange(n_years + 1),
+        gross_values=gross_values,
+        net_values=net_values,
+        management_fees=management_fees,
+        performance_fees=performance_fees
+    )
+
+def compute_periodic_fee_paths(initial_investment, gross_returns, management_fee, performance_fee,
+                               hurdle_rate=0.0, high_water_mark=False, accrual='monthly', crystallization='quarterly'):
+    """NAV-based fee engine with sub-annual management accrual and performance crystallization.
+
+    Takes the same inputs as compute_fee_paths (annual gross returns in %,
+    broadcastable fee terms). Each year's return is spread geometrically
+    over its accrual periods. Every period the management fee
+    (management_fee / periods per year) is charged on the opening NAV and
+    stays out of the NAV. At every crystallization date the performance
+    fee is charged on the NAV gain since the previous crystallization (or
+    above the high-water mark), provided that gain beats the hurdle rate
+    pro-rated to the crystallization period.
+
+    Crystallization can be no more frequent than accrual. The result keeps
+    the annual layout of FeePaths: values at each year end and fees
+    summed per year, so memory does not grow with the number of periods.
+    """
+    periods_per_year = FREQUENCIES[accrual]
+    crystallizations_per_year = FREQUENCIES[crystallization]
+    if periods_per_year % crystallizations_per_year:
+        raise ValueError(f"Cannot crystallize {crystallization} with {accrual} accrual")
+    periods_per_window = periods_per_year // crystallizations_per_year
+
+    gross_returns = np.asarray(gross_returns, dtype=np.float64)
+    n_years = gross_returns.shape[-1]
+    management_fee = np.asarray(management_fee, dtype=np.float64) / 100
+    performance_fee = np.asarray(performance_fee, dtype=np.float64) / 100
+    window_hurdle = np.asarray(hurdle_rate, dtype=np.float64) / 100 / crystallizations_per_year
+    high_water_mark = np.asarray(high_water_mark, dtype=bool)
+
+    batch_shape = np.broadcast_shapes(gross_returns.shape[:-1], management_fee.shape, performance_fee.shape,
+                                      window_hurdle.shape, high_water_mark.shape)
+    gross_returns = np.broadcast_to(gross_returns, batch_shape + (n_years,))
+
+    growth = np.empty(batch_shape + (n_years + 1,))
+    growth[..., 0] = initial_investment
+    growth[..., 1:] = 1 + gross_returns / 100
+    gross_values = np.cumprod(growth, axis=-1)
+
+    # Within a year every period has the same return, so one crystallization
+    # window multiplies the NAV by a**k and accrues management fees of
+    # NAV * fee_per_period * (1 + a + ... + a**(k - 1)), where a is the
+    # per-period growth net of the management fee. A year losing more than
+    # 100% cannot be spread over periods and is treated as a total loss.
+    period_return = np.maximum(growth[..., 1:], 0) ** (1 / periods_per_year) - 1
+    fee_per_period = management_fee[..., None] / periods_per_year
+    a = 1 + period_return - fee_per_period
+    window_growth = a ** periods_per_window
+    with np.errstate(divide='ignore', invalid='ignore'):
+        geometric = np.where(np.isclose(a, 1, rtol=0, atol=1e-12), float(periods_per_window),
+                             (window_growth - 1) / (a - 1))
+    window_accrual = fee_per_period * geometric
+
+    net_values = np.empty(batch_shape + (n_years + 1,))
+    management_fees = np.zeros(batch_shape + (n_years + 1,))
+    performance_fees = np.zeros(batch_shape + (n_years + 1,))
+    net_values[..., 0] = initial_investment
+    nav = np.full(batch_shape, float(initial_investment))
+    high_water = nav.copy()
+
+    # Sequential over crystallization dates only; each step is vectorized over the batch
+    for year in range(1, n_years + 1):
+        for _ in range(crystallizations_per_year):
+            management_fees[..., year] += nav * window_accrual[..., year - 1]
+            nav_before_perf = nav * window_growth[..., year - 1]
+
+            gain = nav_before_perf - nav
+            fee_base = np.maximum(0, np.where(high_water_mark, nav_before_perf - high_water, gain))
+            charged = (fee_base > 0) & (gain > window_hurdle * nav)
+            performance = np.where(charged, fee_base * performance_fee, 0.0)
+
+            performance_fees[..., year] += performance
+            nav = nav_before_perf - performance
+            high_water = np.where(high_water_mark, np.maximum(high_water, nav), high_water)
+        net_values[..., year] = nav
+
+    return FeePaths(
+        years=np.arange(n_years + 1),
+        gross_values=gross_values,
+        net_values=net_values,
+        management_fees=management_fees,
+        performance_fees=performance_fees
+    )
+
+def apply_fees(initial_investment, gross_returns, management_fee, performance_fee, hurdle_rate=0.0,
+               high_water_mark=False, accrual='annual', crystallization='annual'):
+    """Fee paths at the chosen granularity, annual included, from the NAV engine.
+
+    Every setting goes through compute_periodic_fee_paths, so changing the
+    granularity only changes when fees accrue and crystallize, never the
+    model. compute_fee_paths is the legacy annual loop and is not used here.
+    """
+    return compute_periodic_fee_paths(initial_investment, gross_returns, management_fee, performance_fee,
+                                      hurdle_rate, high_water_mark, accrual, crystallization)
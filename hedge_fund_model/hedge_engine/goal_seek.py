@@ -0,0 +1,58 @@
+import numpy as np
+from finance_utils import goal_seek  # shared with the PE/VC model
+
+from .fees import apply_fees
+from .scenario import draw_returns
+
+# Inputs that can be solved for (all in %, as in the app) with default search bounds
+SOLVABLE_INPUTS = {
+    'management_fee': (0.0, 10.0),
+    'performance_fee': (0.0, 100.0),
+    'hurdle_rate': (0.0, 50.0),
+    'annual_return': (-50.0, 100.0)
+}
+# Terminal metrics, named as in the batch runner's output
+METRICS = ('final_net_value', 'net_annualized_return_pct', 'net_moic', 'fee_drag_pct', 'total_fees')
+
+def terminal_metrics(paths, initial_investment, years):
+    """Every METRICS value at the end of each path, as arrays over the batch shape."""
+    final_gross = paths.gross_values[..., -1]
+    final_net = paths.net_values[..., -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'final_net_value': final_net,
+            'net_annualized_return_pct': ((final_net / initial_investment) ** (1 / years) - 1) * 100,
+            'net_moic': final_net / initial_investment,
+            'fee_drag_pct': np.where(final_gross > 0, (final_gross - final_net) / final_gross * 100, np.nan),
+            'total_fees': paths.total_fees
+        }
+
+def solve_for(input_name, metric, target, initial_investment, annual_return, years, management_fee,
+              performance_fee, hurdle_rate=0.0, high_water_mark=False, volatility=0.0, seed=None,
+              accrual='annual', crystallization='annual', bounds=None):
+    """Value of input_name (in %) at which metric equals target, all other inputs as given.
+
+    Each search step runs a grid of candidates through the vectorized fee
+    engine in one call. With volatility, every candidate uses the same random
+    path as the app for this seed, and solving for annual_return shifts that
+    path. Raises ValueError when no value within bounds reaches the target.
+    """
+    if input_name not in SOLVABLE_INPUTS:
+        raise ValueError(f"Cannot solve for {input_name!r}; choose one of {list(SOLVABLE_INPUTS)}")
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; choose one of {list(METRICS)}")
+    returns = draw_returns(annual_return, volatility, years, seed)
+    inputs = {'management_fee': management_fee, 'performance_fee': performance_fee, 'hurdle_rate': hurdle_rate}
+
+    def evaluate(values):
+        if input_name == 'annual_return':
+            gross_returns = returns + (values - annual_return)[:, None]
+            fees = inputs
+        else:
+            gross_returns = returns
+            fees = dict(inputs, **{input_name: values})
+        paths = apply_fees(initial_investment, gross_returns, high_water_mark=high_water_mark, accrual=accrual,
+                           crystallization=crystallization, **fees)
+        return np.broadcast_to(terminal_metrics(paths, initial_investment, years)[metric], values.shape)
+
+    return goal_seek(evaluate, target, *(bounds or SOLVABLE_INPUTS[input_name]))
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .fees import apply_fees
+
+PERCENTILES = (5, 50, 95)
+# Paths per chunk: bounds memory at roughly 100 MB for 3 structures x 50 years
+CHUNK_PATHS = 50_000
+# The per-year fan chart is drawn from the first FAN_PATHS paths; terminal statistics use every path
+FAN_PATHS = CHUNK_PATHS
+
+@dataclass
+class MonteCarloSummary:
+    """Distribution of outcomes per fee structure over simulated return paths.
+
+    Quantile arrays have a trailing axis matching `percentiles`. Fee drag is
+    the share of the gross terminal value lost to fees, in percent. A path
+    breaches its high-water mark when it ends below its own running peak net
+    value, i.e. the investor is under water and no performance fee accrues.
+    """
+    percentiles: tuple
+    n_paths: int
+    years: np.ndarray
+    gross_fan: np.ndarray               # (years + 1, n_percentiles)
+    net_fan: np.ndarray                 # (structures, years + 1, n_percentiles)
+    terminal_gross: np.ndarray          # (n_percentiles,)
+    terminal_net: np.ndarray            # (structures, n_percentiles)
+    mean_terminal_net: np.ndarray       # (structures,)
+    fee_drag: np.ndarray                # (structures, n_percentiles)
+    hwm_breach_probability: np.ndarray  # (structures,)
+
+def standard_normal_paths(n_paths, years, seed=None, chunk_paths=CHUNK_PATHS):
+    """Yield seeded standard normal shocks of shape (chunk, years).
+
+    The same seed always yields the same paths, so every fee structure (and
+    every rerun with a different fee input) is priced on common random numbers.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_paths, chunk_paths):
+        yield rng.standard_normal((min(chunk_paths, n_paths - start), years))
+
+def simulate_fee_structures(initial_investment, annual_return, volatility, years, n_paths,
+                            management_fee, performance_fee, hurdle_rate=0.0, high_water_mark=False,
+                            seed=None, percentiles=PERCENTILES, chunk_paths=CHUNK_PATHS,
+                            accrual='annual', crystallization='annual'):
+    """Run every fee structure on the same n_paths normal return paths.
+
+    annual_return and volatility are the mean and standard deviation of the
+    yearly gross return in percent, as in the app. management_fee,
+    performance_fee, hurdle_rate and high_water_mark are 1-D sequences (one
+    entry per fee structure) or scalars shared by all structures.
+    accrual and crystallization select the fee granularity (see apply_fees).
+    """
+    structure_terms = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(management_fee, dtype=np.float64)),
+        np.atleast_1d(np.asarray(performance_fee, dtype=np.float64)),
+        np.atleast_1d(np.asarray(hurdle_rate, dtype=np.float64)),
+        np.atleast_1d(np.asarray(high_water_mark, dtype=bool))
+    )
+    # A trailing axis lets the structure terms broadcast against (paths, years)
+    management_fee, performance_fee, hurdle_rate, high_water_mark = (term[:, None] for term in structure_terms)
+    n_structures = management_fee.shape[0]
+
+    terminal_gross = np.empty(n_paths)
+    terminal_net = np.empty((n_structures, n_paths))
+    under_water = np.zeros(n_structures)
+    fan_gross, fan_net = [], []
+
+    offset = 0
+    for shocks in standard_normal_paths(n_paths, years, seed, chunk_paths):
+        returns = annual_return + volatility * shocks
+        paths = apply_fees(initial_investment, returns, management_fee, performance_fee,
+                           hurdle_rate, high_water_mark, accrual, crystallization)
+        chunk = slice(offset, offset + len(shocks))
+        terminal_gross[chunk] = paths.gross_values[0, :, -1]
+        terminal_net[:, chunk] = paths.net_values[..., -1]
+        peak = paths.net_values.max(axis=-1)
+        under_water += (paths.net_values[..., -1] < peak).sum(axis=-1)
+        if offset < FAN_PATHS:
+            # Collected across chunks, so the fan does not depend on chunk_paths
+            fan = slice(0, FAN_PATHS - offset)
+            fan_gross.append(paths.gross_values[0, fan])
+            fan_net.append(paths.net_values[:, fan])
+        offset += len(shocks)
+
+    gross_fan = np.percentile(np.concatenate(fan_gross), percentiles, axis=0).T
+    net_fan = np.moveaxis(np.percentile(np.concatenate(fan_net, axis=1), percentiles, axis=1), 0, -1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fee_drag = np.where(terminal_gross > 0, (terminal_gross - terminal_net) / terminal_gross * 100, np.nan)
+
+    return MonteCarloSummary(
+        percentiles=tuple(percentiles),
+        n_paths=n_paths,
+        years=np.arange(years + 1),
+        gross_fan=gross_fan,
+        net_fan=net_fan,
+        terminal_gross=np.percentile(terminal_gross, percentiles),
+        terminal_net=np.percentile(terminal_net, percentiles, axis=1).T,
+        mean_terminal_net=terminal_net.mean(axis=1),
+        fee_drag=np.nanpercentile(fee_drag, percentiles, axis=1).T,
+        hwm_breach_probability=under_water / n_paths
+    )
@@ -0,0 +1,48 @@
+import numpy as np
+
+from .fees import apply_fees, constant_returns
+
+def draw_returns(annual_return, volatility, years, seed=None):
+    """Annual gross returns (%) for one path: normal draws when volatility > 0, else constant."""
+    if volatility > 0:
+        return np.random.default_rng(seed).normal(annual_return, volatility, years)
+    return constant_returns(annual_return, years)
+
+def run_fee_comparison(initial_investment, annual_return, volatility, years,
+                       management_fees, performance_fees, hurdle_rate=0.0, high_water_mark=False, seed=None,
+                       accrual='annual', crystallization='annual'):
+    """Evaluate several fee structures on one shared return path.
+
+    management_fees and performance_fees are sequences with one entry per fee
+    structure (in %); the result's arrays have shape (structures, years + 1).
+    accrual and crystallization are keys of FREQUENCIES (see apply_fees).
+    """
+    return apply_fees(
+        initial_investment, draw_returns(annual_return, volatility, years, seed),
+        management_fee=np.asarray(management_fees, dtype=np.float64),
+        performance_fee=np.asarray(performance_fees, dtype=np.float64),
+        hurdle_rate=hurdle_rate,
+        high_water_mark=high_water_mark,
+        accrual=accrual,
+        crystallization=crystallization
+    )
+
+def calculate_portfolio_values(initial_investment, annual_return, volatility, years,
+                               management_fee, performance_fee, hurdle_rate, high_water_mark, seed=None,
+                               accrual='annual', crystallization='annual'):
+    """Single fee structure version of run_fee_comparison, returning the app's original tuple."""
+    paths = apply_fees(
+        initial_investment, draw_returns(annual_return, volatility, years, seed),
+        management_fee, performance_fee, hurdle_rate, high_water_mark, accrual, crystallization
+    )
+    return paths.years, paths.gross_values, paths.net_values, paths.management_fees, paths.performance_fees
+
+def annualized_returns(values, initial_investment):
+    """Annualized return (decimal) from year 1 to the end for value paths shaped (..., years + 1)."""
+    values = np.asarray(values, dtype=np.float64)
+    holding_years = np.arange(1, values.shape[-1])
+    return (values[..., 1:] / initial_investment) ** (1 / holding_years) - 1
+
+def multiples(values, initial_investment):
+    """MOIC from year 1 to the end for value paths shaped (..., years + 1)."""
+    return np.asarray(values, dtype=np.float64)[..., 1:] / initial_investment
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .fees import apply_fees
+
+# Default grid: 50 management fees x 50 performance fees x 10 hurdle rates
+GRID_SHAPE = (50, 50, 10)
+
+@dataclass
+class SensitivityGrid:
+    """Terminal outcomes over a management x performance x hurdle fee grid.
+
+    terminal_net and fee_drag have shape (management, performance, hurdle).
+    Fee drag is the share of the gross terminal value lost to fees, in percent.
+    """
+    management_fees: np.ndarray
+    performance_fees: np.ndarray
+    hurdle_rates: np.ndarray
+    terminal_gross: float
+    terminal_net: np.ndarray
+    fee_drag: np.ndarray
+
+    def scaled(self, factor):
+        """Same grid for an investment `factor` times larger (every fee rule is proportional)."""
+        return SensitivityGrid(
+            management_fees=self.management_fees,
+            performance_fees=self.performance_fees,
+            hurdle_rates=self.hurdle_rates,
+            terminal_gross=self.terminal_gross * factor,
+            terminal_net=self.terminal_net * factor,
+            fee_drag=self.fee_drag
+        )
+
+def fee_grid(max_management_fee, max_performance_fee, max_hurdle_rate, shape=GRID_SHAPE):
+    """Evenly spaced fee axes (in %) from zero to each maximum."""
+    return tuple(np.linspace(0.0, stop, points)
+                 for stop, points in zip((max_management_fee, max_performance_fee, max_hurdle_rate), shape))
+
+def evaluate_fee_grid(initial_investment, gross_returns, management_fees, performance_fees, hurdle_rates,
+                      high_water_mark=False, accrual='annual', crystallization='annual'):
+    """Run every fee combination on one return path (in %) in a single batched pass."""
+    management_fees = np.asarray(management_fees, dtype=np.float64)
+    performance_fees = np.asarray(performance_fees, dtype=np.float64)
+    hurdle_rates = np.asarray(hurdle_rates, dtype=np.float64)
+
+    # Each fee axis gets its own batch dimension, so the engine broadcasts them into a cube
+    paths = apply_fees(
+        initial_investment, gross_returns,
+        management_fee=management_fees[:, None, None],
+        performance_fee=performance_fees[None, :, None],
+        hurdle_rate=hurdle_rates[None, None, :],
+        high_water_mark=high_water_mark,
+        accrual=accrual,
+        crystallization=crystallization
+    )
+    terminal_gross = float(paths.gross_values[(0,) * (paths.gross_values.ndim - 1) + (-1,)])
+    terminal_net = paths.net_values[..., -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fee_drag = np.where(terminal_gross > 0, (terminal_gross - terminal_net) / terminal_gross * 100, np.nan)
+
+    return SensitivityGrid(
+        management_fees=management_fees,
+        performance_fees=performance_fees,
+        hurdle_rates=hurdle_rates,
+        terminal_gross=terminal_gross,
+        terminal_net=terminal_net,
+        fee_drag=fee_drag
+    )
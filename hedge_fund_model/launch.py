@@ -1,17 +1,87 @@
+"""Launch the hedge fund Streamlit app.
+
+Modes:
+    python launch.py                 local use; Streamlit opens a browser tab once the server is up
+    python launch.py --headless      no browser (also chosen automatically when there is no display)
+    python launch.py --server        headless server for deployment: binds 0.0.0.0, no file watcher
+    python launch.py --check-imports measure the app's cold import time against IMPORT_BUDGET_SECONDS
+
+The launcher itself only imports the standard library; Streamlit, pandas and
+plotly are loaded by the Streamlit process that serves the app.
+"""
+import argparse
+import os
 import subprocess
 import sys
-import os
 
-def launch_app():
-    """Launch the Streamlit app."""
-    # Get the directory of this script
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Construct the path to app.py
-    app_path = os.path.join(current_dir, 'app.py')
-    
-    # Launch the Streamlit app
-    subprocess.run([sys.executable, '-m', 'streamlit', 'run', app_path])
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, 'app.py')
+
+# Modules app.py imports at startup, and the cold-start budget for importing them
+APP_IMPORTS = ['streamlit', 'numpy', 'pandas', 'plotly.graph_objects', 'hedge_engine', 'finance_utils']
+IMPORT_BUDGET_SECONDS = 2.0
+
+def has_display():
+    """False on headless Linux hosts (no X11/Wayland display)."""
+    if sys.platform.startswith('linux'):
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return True
+
+def streamlit_command(headless=False, server=False, port=None):
+    """The `streamlit run` command line for the chosen mode."""
+    command = [sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+               '--server.headless', 'true' if headless or server else 'false']
+    if port:
+        command += ['--server.port', str(port)]
+    if server:
+        command += [
+            '--server.address', '0.0.0.0',
+            '--server.fileWatcherType', 'none',
+            '--server.runOnSave', 'false',
+            '--browser.gatherUsageStats', 'false'
+        ]
+    return command
+
+def measure_import_times(modules=APP_IMPORTS):
+    """Cumulative cold import time (seconds) after each module, measured in a fresh interpreter."""
+    script = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {APP_DIR!r})\n"
+        "start = time.perf_counter()\n"
+        f"for name in {list(modules)!r}:\n"
+        "    __import__(name)\n"
+        "    print(name, time.perf_counter() - start)\n"
+    )
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    return [(name, float(seconds)) for name, seconds in (line.split() for line in output.splitlines())]
+
+def check_imports(budget=IMPORT_BUDGET_SECONDS):
+    """Print the import timings and return True when the total fits the budget."""
+    previous = 0.0
+    for name, elapsed in measure_import_times():
+        print(f"{name:<22} {elapsed - previous:6.3f} s")
+        previous = elapsed
+    print(f"{'total':<22} {previous:6.3f} s (budget {budget:.1f} s)")
+    return previous <= budget
+
+def launch_app(headless=False, server=False, port=None):
+    """Run the Streamlit app in the foreground and return its exit code."""
+    headless = headless or server or not has_display()
+    return subprocess.run(streamlit_command(headless, server, port)).returncode
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the hedge fund performance app.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--headless', action='store_true', help="Do not open a browser")
+    mode.add_argument('--server', action='store_true', help="Headless server mode for deployments")
+    mode.add_argument('--check-imports', action='store_true',
+                      help=f"Fail if the app's imports take longer than {IMPORT_BUDGET_SECONDS:.1f} s")
+    parser.add_argument('--port', type=int, default=os.environ.get('PORT'), help="Server port (default: $PORT or 8501)")
+    args = parser.parse_args(argv)
+
+    if args.check_imports:
+        return 0 if check_imports() else 1
+    return launch_app(headless=args.headless, server=args.server, port=args.port)
 
 if __name__ == '__main__':
-    launch_app() 
\ No newline at end of file
+    sys.exit(main())
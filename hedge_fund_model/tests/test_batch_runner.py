@@ -0,0 +1,50 @@
+"""Scenario file parsing of the headless batch runner."""
+import pandas as pd
+import pytest
+
+from batch import read_scenarios
+
+SCENARIO = 'initial_investment,annual_return,years,management_fee,performance_fee,high_water_mark\n'
+
+def _read(tmp_path, flags):
+    path = tmp_path / 'scenarios.csv'
+    path.write_text(SCENARIO + ''.join(f'1000,8,5,2,20,{flag}\n' for flag in flags))
+    return read_scenarios(str(path))['high_water_mark'].tolist()
+
+def test_high_water_mark_literals(tmp_path):
+    flags = ['true', 'False', 'YES', 'no', ' 1 ', '0', '']
+    assert _read(tmp_path, flags) == [True, False, True, False, True, False, False]
+
+def test_numeric_high_water_mark(tmp_path):
+    assert _read(tmp_path, ['1', '0', '']) == [True, False, False]
+
+@pytest.mark.parametrize('flag', ['maybe', '2', 'on', 'y'])
+def test_unknown_high_water_mark_is_rejected(tmp_path, flag):
+    with pytest.raises(ValueError, match='unknown high_water_mark values'):
+        _read(tmp_path, ['true', flag])
+
+def test_parquet_booleans(tmp_path):
+    path = tmp_path / 'scenarios.parquet'
+    pd.DataFrame({'initial_investment': [1000.0] * 2, 'annual_return': [8.0] * 2, 'years': [5, 5],
+                  'management_fee': [2.0] * 2, 'performance_fee': [20.0] * 2,
+                  'high_water_mark': [True, False]}).to_parquet(path)
+    assert read_scenarios(str(path))['high_water_mark'].tolist() == [True, False]
+
+def _read_years(tmp_path, years):
+    path = tmp_path / 'scenarios.csv'
+    path.write_text(SCENARIO + ''.join(f'1000,8,{value},2,20,false\n' for value in years))
+    return read_scenarios(str(path))['years']
+
+def test_whole_number_years(tmp_path):
+    years = _read_years(tmp_path, ['5', '10.0', '1'])
+    assert years.tolist() == [5, 10, 1]
+    assert pd.api.types.is_integer_dtype(years)
+
+@pytest.mark.parametrize('value, shown', [('2.5', '2.5'), ('', 'nan'), ('0', '0'), ('-3', '-3'), ('ten', 'ten')])
+def test_bad_years_are_rejected_with_their_rows(tmp_path, value, shown):
+    with pytest.raises(ValueError, match=rf'whole number of at least 1; bad rows: 1 \({shown}\)$'):
+        _read_years(tmp_path, ['5', value, '7'])
+
+def test_many_bad_years_are_summarized(tmp_path):
+    with pytest.raises(ValueError, match=r'bad rows: 0 \(0.5\), .*, 9 \(0.5\) and 2 more$'):
+        _read_years(tmp_path, ['0.5'] * 12)
@@ -0,0 +1,173 @@
+"""hedge_engine's fee paths against the app's original per-year loop."""
+import itertools
+
+import numpy as np
+import pytest
+
+from hedge_engine import compute_fee_paths, constant_returns
+from hedge_engine.fees import FREQUENCIES, apply_fees, compute_periodic_fee_paths
+
+INITIAL_INVESTMENT = 1000.0
+RETURN_PATHS = {
+    'steady gains': [10.0] * 8,
+    'losses': [-5.0, -20.0, -3.0, -10.0],
+    'drawdown and recovery': [15.0, -30.0, 12.0, 25.0, 8.0, -2.0, 30.0],
+    'small gains': [1.0, 2.5, 0.5, 3.0, 1.5],
+    'total loss': [20.0, -100.0, 10.0],
+    'mixed': [8.0, -12.0, 0.0, 22.0, -4.0, 9.0, 35.0, -18.0, 6.0, 14.0]
+}
+FEE_TERMS = list(itertools.product([0.0, 2.0], [0.0, 20.0], [0.0, 5.0], [False, True]))
+
+def loop_fee_paths(initial_investment, annual_returns, management_fee, performance_fee, hurdle_rate,
+                   high_water_mark):
+    """The original calculate_portfolio_values loop from app.py, with a given return path."""
+    years = len(annual_returns)
+    gross_values = np.zeros(years + 1)
+    net_values = np.zeros(years + 1)
+    management_fees = np.zeros(years + 1)
+    performance_fees = np.zeros(years + 1)
+
+    gross_values[0] = initial_investment
+    net_values[0] = initial_investment
+    high_water = initial_investment
+
+    for year in range(1, years + 1):
+        gross_return = 1 + (annual_returns[year - 1] / 100)
+        gross_values[year] = gross_values[year - 1] * gross_return
+
+        management_fee_amount = net_values[year - 1] * (management_fee / 100)
+        management_fees[year] = management_fee_amount
+        net_before_perf = gross_values[year] - management_fee_amount
+
+        if high_water_mark:
+            performance_fee_base = max(0, net_before_perf - high_water)
+        else:
+            performance_fee_base = max(0, net_before_perf - net_values[year - 1])
+
+        if performance_fee_base > 0 and (net_before_perf - net_values[year - 1]) > (hurdle_rate / 100 * net_values[year - 1]):
+            performance_fee_amount = performance_fee_base * (performance_fee / 100)
+        else:
+            performance_fee_amount = 0
+        performance_fees[year] = performance_fee_amount
+
+        net_values[year] = net_before_perf - performance_fee_amount
+        if high_water_mark:
+            high_water = max(high_water, net_values[year])
+
+    return gross_values, net_values, management_fees, performance_fees
+
+def periodic_loop_fee_paths(initial_investment, annual_returns, management_fee, performance_fee, hurdle_rate,
+                            high_water_mark, accrual, crystallization):
+    """compute_periodic_fee_paths' rules as a plain loop over every accrual period."""
+    periods_per_year = FREQUENCIES[accrual]
+    crystallizations_per_year = FREQUENCIES[crystallization]
+    years = len(annual_returns)
+    net_values = np.zeros(years + 1)
+    management_fees = np.zeros(years + 1)
+    performance_fees = np.zeros(years + 1)
+    net_values[0] = nav = high_water = initial_investment
+
+    for year in range(1, years + 1):
+        period_return = max(1 + annual_returns[year - 1] / 100, 0) ** (1 / periods_per_year) - 1
+        for _ in range(crystallizations_per_year):
+            opening = nav
+            for _ in range(periods_per_year // crystallizations_per_year):
+                fee = nav * management_fee / 100 / periods_per_year
+                management_fees[year] += fee
+                nav = nav * (1 + period_return) - fee
+            base = max(0, nav - high_water) if high_water_mark else max(0, nav - opening)
+            if base > 0 and nav - opening > hurdle_rate / 100 / crystallizations_per_year * opening:
+                performance_fees[year] += base * performance_fee / 100
+                nav -= base * performance_fee / 100
+            if high_water_mark:
+                high_water = max(high_water, nav)
+        net_values[year] = nav
+    return net_values, management_fees, performance_fees
+
+@pytest.mark.parametrize('path', RETURN_PATHS)
+@pytest.mark.parametrize('management_fee, performance_fee, hurdle_rate, high_water_mark', FEE_TERMS)
+def test_fee_paths_match_original_loop(path, management_fee, performance_fee, hurdle_rate, high_water_mark):
+    returns = RETURN_PATHS[path]
+    expected = loop_fee_paths(INITIAL_INVESTMENT, returns, management_fee, performance_fee, hurdle_rate,
+                              high_water_mark)
+    paths = compute_fee_paths(INITIAL_INVESTMENT, returns, management_fee, performance_fee, hurdle_rate,
+                              high_water_mark)
+    actual = (paths.gross_values, paths.net_values, paths.management_fees, paths.performance_fees)
+    for name, a, e in zip(('gross', 'net', 'management', 'performance'), actual, expected):
+        np.testing.assert_array_equal(a, e, err_msg=name)
+
+def test_batched_fee_structures_match_original_loop():
+    returns = np.array([RETURN_PATHS['drawdown and recovery'], RETURN_PATHS['small gains'] + [4.0, -1.0]])
+    terms = np.array(FEE_TERMS, dtype=np.float64)
+    management, performance, hurdle = (terms[:, i, None] for i in range(3))
+    high_water_mark = terms[:, 3, None].astype(bool)
+    paths = compute_fee_paths(INITIAL_INVESTMENT, returns, management, performance, hurdle, high_water_mark)
+    assert paths.net_values.shape == (len(FEE_TERMS), len(returns), returns.shape[1] + 1)
+    for s, p in itertools.product(range(len(FEE_TERMS)), range(len(returns))):
+        _, net, management_fees, performance_fees = loop_fee_paths(INITIAL_INVESTMENT, returns[p], *FEE_TERMS[s])
+        np.testing.assert_array_equal(paths.net_values[s, p], net)
+        np.testing.assert_array_equal(paths.management_fees[s, p], management_fees)
+        np.testing.assert_array_equal(paths.performance_fees[s, p], performance_fees)
+
+def test_high_water_mark_skips_fee_until_recovery():
+    returns = RETURN_PATHS['drawdown and recovery']
+    with_mark = compute_fee_paths(INITIAL_INVESTMENT, returns, 0.0, 20.0, 0.0, True)
+    without_mark = compute_fee_paths(INITIAL_INVESTMENT, returns, 0.0, 20.0, 0.0, False)
+    # Year 3 gains 12% but stays below the year-1 peak
+    assert with_mark.net_values[3] < with_mark.net_values[1]
+    assert with_mark.performance_fees[3] == 0
+    assert without_mark.performance_fees[3] > 0
+
+@pytest.mark.parametrize('path', RETURN_PATHS)
+@pytest.mark.parametrize('management_fee, performance_fee, hurdle_rate, high_water_mark', FEE_TERMS)
+@pytest.mark.parametrize('accrual, crystallization', [('monthly', 'monthly'), ('monthly', 'quarterly'),
+                                                      ('monthly', 'annual'), ('quarterly', 'quarterly'),
+                                                      ('quarterly', 'annual'), ('annual', 'annual')])
+def test_periodic_fee_paths_match_period_loop(path, management_fee, performance_fee, hurdle_rate, high_water_mark,
+                                              accrual, crystallization):
+    returns = RETURN_PATHS[path]
+    expected = periodic_loop_fee_paths(INITIAL_INVESTMENT, returns, management_fee, performance_fee, hurdle_rate,
+                                       high_water_mark, accrual, crystallization)
+    paths = compute_periodic_fee_paths(INITIAL_INVESTMENT, returns, management_fee, performance_fee, hurdle_rate,
+                                       high_water_mark, accrual, crystallization)
+    actual = (paths.net_values, paths.management_fees, paths.performance_fees)
+    for name, a, e in zip(('net', 'management', 'performance'), actual, expected):
+        np.testing.assert_allclose(a, e, rtol=1e-10, atol=1e-9, err_msg=name)
+
+def test_apply_fees_uses_nav_engine_for_annual_settings():
+    returns = RETURN_PATHS['mixed']
+    paths = apply_fees(INITIAL_INVESTMENT, returns, 2.0, 20.0, 5.0, True)
+    expected = periodic_loop_fee_paths(INITIAL_INVESTMENT, returns, 2.0, 20.0, 5.0, True, 'annual', 'annual')
+    np.testing.assert_allclose(paths.net_values, expected[0], rtol=1e-12)
+
+@pytest.mark.parametrize('path', ['steady gains', 'drawdown and recovery', 'mixed'])
+def test_accrual_frequency_only_matters_through_the_management_fee(path):
+    returns = RETURN_PATHS[path]
+    annual = apply_fees(INITIAL_INVESTMENT, returns, 0.0, 20.0, 5.0, True, 'annual', 'annual')
+    monthly = apply_fees(INITIAL_INVESTMENT, returns, 0.0, 20.0, 5.0, True, 'monthly', 'annual')
+    np.testing.assert_allclose(monthly.net_values, annual.net_values, rtol=1e-12)
+
+def test_annual_and_monthly_accrual_differ_by_the_accrual_effect():
+    # Without performance fees the two settings compound the same fee rate, once or twelve times a year
+    returns = RETURN_PATHS['steady gains']
+    annual = apply_fees(INITIAL_INVESTMENT, returns, 2.0, 0.0, accrual='annual', crystallization='annual')
+    monthly = apply_fees(INITIAL_INVESTMENT, returns, 2.0, 0.0, accrual='monthly', crystallization='annual')
+    years = np.arange(len(returns) + 1)
+    np.testing.assert_allclose(annual.net_values, INITIAL_INVESTMENT * (1.10 - 0.02) ** years, rtol=1e-12)
+    monthly_growth = (1.10 ** (1 / 12) - 0.02 / 12) ** 12
+    np.testing.assert_allclose(monthly.net_values, INITIAL_INVESTMENT * monthly_growth ** years, rtol=1e-12)
+    # The accrual effect is small next to the fee itself
+    assert abs(monthly.net_values[-1] / annual.net_values[-1] - 1) < 0.02
+
+def test_granularity_moves_ten_year_net_value_only_slightly():
+    returns = constant_returns(10.0, 10)
+    nets = [apply_fees(INITIAL_INVESTMENT, returns, 2.0, 20.0, accrual=accrual,
+                       crystallization=crystallization).net_values[-1]
+            for accrual, crystallization in [('annual', 'annual'), ('quarterly', 'annual'), ('monthly', 'monthly')]]
+    assert nets[0] == pytest.approx(1859.59, abs=0.01)
+    assert max(nets) / min(nets) - 1 < 0.02
+
+def test_crystallization_cannot_be_more_frequent_than_accrual():
+    with pytest.raises(ValueError):
+        compute_periodic_fee_paths(INITIAL_INVESTMENT, [10.0], 2.0, 20.0, accrual='quarterly',
+                                   crystallization='monthly')
@@ -0,0 +1,60 @@
+"""app.py under streamlit's AppTest: the headline metrics come from hedge_engine and every mode runs."""
+import os
+
+import pytest
+
+from hedge_engine import apply_fees, constant_returns
+
+testing = pytest.importorskip('streamlit.testing.v1')
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+def _run(**checkboxes):
+    at = testing.AppTest.from_file(APP, default_timeout=120).run()
+    for label, value in checkboxes.items():
+        next(c for c in at.sidebar.checkbox if c.label == label).set_value(value)
+        at.run()
+    return at
+
+def _metrics(at):
+    return {metric.label: metric.value for metric in at.metric}
+
+def test_default_metrics_match_engine():
+    at = _run()
+    assert not at.exception
+    paths = apply_fees(1000.0, constant_returns(10.0, 10), 2.0, 20.0)
+    metrics = _metrics(at)
+    assert metrics['Baseline Value (No Fees)'] == f'{paths.gross_values[-1]:,.2f} USD'
+    assert metrics['Live Scenario Value (With Fees)'] == f'{paths.net_values[-1]:,.2f} USD'
+    assert metrics['Total Fees Paid'] == f'{paths.management_fees.sum() + paths.performance_fees.sum():,.2f} USD'
+    assert metrics['Final IRR'] == '10.00%'
+
+@pytest.mark.parametrize('checkboxes', [
+    {'Include Volatility': True},
+    {'Include Volatility': True, 'Monte Carlo Mode': True},
+    {'Sensitivity Mode': True},
+    {'Goal Seek': True},
+    {'Apply High-Water Mark': True, 'Include Volatility': True, 'Sensitivity Mode': True},
+], ids=str)
+def test_modes_run_without_exceptions(checkboxes):
+    at = _run(**checkboxes)
+    assert not at.exception
+
+def test_small_monte_carlo_runs_on_rerun():
+    metrics = _metrics(_run(**{'Include Volatility': True, 'Monte Carlo Mode': True}))
+    assert 'Ends Below High-Water Mark' in metrics
+
+def test_large_monte_carlo_waits_for_run_button():
+    at = _run(**{'Include Volatility': True, 'Monte Carlo Mode': True})
+    at.sidebar.select_slider[0].set_value(1_000_000).run()
+    assert not at.exception
+    assert 'Ends Below High-Water Mark' not in _metrics(at)
+    assert [button.label for button in at.button] == ['Run Simulation']
+
+@pytest.mark.parametrize('solve_for', ['Management Fee 1 (%)', 'Performance Fee 1 (%)', 'Hurdle Rate (%)',
+                                       'Annual Return (%)'])
+def test_goal_seek_reports_each_input(solve_for):
+    at = _run(**{'Goal Seek': True})
+    next(s for s in at.sidebar.selectbox if s.label == 'Solve For').set_value(solve_for).run()
+    assert not at.exception
+    assert len(at.sidebar.success) + len(at.sidebar.warning) == 1
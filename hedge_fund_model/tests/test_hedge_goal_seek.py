@@ -0,0 +1,55 @@
+"""solve_for: the solved input, run through apply_fees, hits the target metric."""
+import numpy as np
+import pytest
+
+from hedge_engine import apply_fees, draw_returns, solve_for, terminal_metrics
+from hedge_engine.goal_seek import SOLVABLE_INPUTS
+
+INPUTS = dict(initial_investment=1000.0, annual_return=10.0, years=10, management_fee=2.0, performance_fee=20.0,
+              hurdle_rate=5.0)
+# (input, metric it moves, input value the target is taken from)
+CASES = [
+    ('management_fee', 'net_annualized_return_pct', 3.5),
+    ('performance_fee', 'final_net_value', 30.0),
+    ('hurdle_rate', 'total_fees', 7.0),
+    ('annual_return', 'net_moic', 14.0),
+    ('management_fee', 'fee_drag_pct', 1.0),
+]
+SETTINGS = [
+    dict(),
+    dict(volatility=20.0, seed=5, high_water_mark=True),
+    dict(volatility=12.0, seed=9, accrual='monthly', crystallization='quarterly'),
+]
+
+def _metric(input_name, value, metric, volatility=0.0, seed=None, high_water_mark=False, accrual='annual',
+            crystallization='annual'):
+    inputs = dict(INPUTS, **{input_name: value})
+    returns = draw_returns(INPUTS['annual_return'], volatility, INPUTS['years'], seed)
+    returns = returns + (inputs['annual_return'] - INPUTS['annual_return'])
+    paths = apply_fees(inputs['initial_investment'], returns, inputs['management_fee'], inputs['performance_fee'],
+                       inputs['hurdle_rate'], high_water_mark, accrual, crystallization)
+    return float(terminal_metrics(paths, inputs['initial_investment'], inputs['years'])[metric])
+
+def test_every_solvable_input_is_covered():
+    assert {input_name for input_name, _, _ in CASES} == set(SOLVABLE_INPUTS)
+
+@pytest.mark.parametrize('settings', SETTINGS, ids=str)
+@pytest.mark.parametrize('input_name, metric, value', CASES)
+def test_solved_input_hits_the_target(input_name, metric, value, settings):
+    target = _metric(input_name, value, metric, **settings)
+    solved = solve_for(input_name, metric, target, **INPUTS, **settings)
+    assert _metric(input_name, solved, metric, **settings) == pytest.approx(target, rel=1e-7, abs=1e-9)
+
+def test_solved_annual_return_shifts_the_random_path():
+    settings = dict(volatility=20.0, seed=5)
+    solved = solve_for('annual_return', 'final_net_value', 2500.0, **INPUTS, **settings)
+    returns = draw_returns(INPUTS['annual_return'], 20.0, INPUTS['years'], 5) + (solved - INPUTS['annual_return'])
+    np.testing.assert_allclose(apply_fees(1000.0, returns, 2.0, 20.0, 5.0).net_values[-1], 2500.0, rtol=1e-7)
+
+def test_target_out_of_range_raises():
+    with pytest.raises(ValueError, match='No input in'):
+        solve_for('management_fee', 'final_net_value', 5000.0, **INPUTS)
+    with pytest.raises(ValueError, match='Cannot solve for'):
+        solve_for('years', 'final_net_value', 2000.0, **INPUTS)
+    with pytest.raises(ValueError, match='Unknown metric'):
+        solve_for('management_fee', 'gross_moic', 2.0, **INPUTS)
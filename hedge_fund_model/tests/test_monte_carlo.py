@@ -0,0 +1,47 @@
+"""simulate_fee_structures: seeded, independent of chunking, and exact when there is no volatility."""
+import dataclasses
+
+import numpy as np
+import pytest
+
+from hedge_engine import apply_fees, constant_returns, simulate_fee_structures
+from hedge_engine.monte_carlo import standard_normal_paths
+
+STRUCTURES = dict(management_fee=[0.0, 2.0, 1.5], performance_fee=[0.0, 20.0, 15.0], hurdle_rate=5.0,
+                  high_water_mark=True)
+
+def _simulate(n_paths=2_000, seed=7, volatility=15.0, **options):
+    return simulate_fee_structures(1000.0, 8.0, volatility, 10, n_paths, seed=seed, **dict(STRUCTURES, **options))
+
+def assert_summaries_equal(actual, expected):
+    for field in dataclasses.fields(expected):
+        np.testing.assert_array_equal(getattr(actual, field.name), getattr(expected, field.name), err_msg=field.name)
+
+def test_same_seed_gives_the_same_summary():
+    assert_summaries_equal(_simulate(), _simulate())
+
+def test_different_seeds_give_different_summaries():
+    assert not np.array_equal(_simulate(seed=7).terminal_net, _simulate(seed=8).terminal_net)
+
+def test_chunked_shocks_are_one_stream():
+    chunks = list(standard_normal_paths(1_000, 10, seed=3, chunk_paths=300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    np.testing.assert_array_equal(np.concatenate(chunks), next(standard_normal_paths(1_000, 10, seed=3)))
+
+@pytest.mark.parametrize('chunk_paths', [1, 7, 500, 1_999])
+def test_summary_does_not_depend_on_chunk_size(chunk_paths):
+    assert_summaries_equal(_simulate(chunk_paths=chunk_paths), _simulate())
+
+@pytest.mark.parametrize('accrual, crystallization', [('annual', 'annual'), ('monthly', 'quarterly')])
+def test_zero_volatility_is_the_deterministic_path(accrual, crystallization):
+    summary = _simulate(n_paths=50, volatility=0.0, accrual=accrual, crystallization=crystallization)
+    paths = apply_fees(1000.0, constant_returns(8.0, 10), np.array(STRUCTURES['management_fee'])[:, None],
+                       np.array(STRUCTURES['performance_fee'])[:, None], STRUCTURES['hurdle_rate'], True,
+                       accrual, crystallization)
+    net_values = paths.net_values.reshape(3, -1)
+    gross_values = paths.gross_values.reshape(3, -1)[0]
+    np.testing.assert_allclose(summary.net_fan, np.repeat(net_values[..., None], 3, axis=-1), rtol=1e-12)
+    np.testing.assert_allclose(summary.gross_fan, np.repeat(gross_values[:, None], 3, axis=-1), rtol=1e-12)
+    np.testing.assert_allclose(summary.terminal_net, np.repeat(net_values[:, -1:], 3, axis=-1), rtol=1e-12)
+    np.testing.assert_allclose(summary.mean_terminal_net, net_values[:, -1], rtol=1e-12)
+    np.testing.assert_array_equal(summary.hwm_breach_probability, 0.0)
@@ -0,0 +1,45 @@
+"""evaluate_fee_grid cells against single apply_fees runs, before and after the per-unit rescale."""
+import itertools
+
+import numpy as np
+import pytest
+
+from hedge_engine import GRID_SHAPE, apply_fees, draw_returns, evaluate_fee_grid, fee_grid
+
+RETURNS = draw_returns(9.0, 18.0, 12, seed=11)
+GRID = fee_grid(5.0, 50.0, 10.0, shape=(6, 5, 4))
+# A few cells including the corners of the grid
+CELLS = [(0, 0, 0), (5, 4, 3), (2, 3, 1), (4, 1, 2), (1, 2, 0)]
+SETTINGS = list(itertools.product([False, True], [('annual', 'annual'), ('monthly', 'quarterly')]))
+
+def _cell_paths(initial_investment, cell, high_water_mark, accrual, crystallization):
+    management_fee, performance_fee, hurdle_rate = (axis[i] for axis, i in zip(GRID, cell))
+    return apply_fees(initial_investment, RETURNS, management_fee, performance_fee, hurdle_rate, high_water_mark,
+                      accrual, crystallization)
+
+def test_default_grid_axes():
+    axes = fee_grid(5.0, 50.0, 10.0)
+    assert tuple(len(axis) for axis in axes) == GRID_SHAPE
+    assert [(axis[0], axis[-1]) for axis in axes] == [(0.0, 5.0), (0.0, 50.0), (0.0, 10.0)]
+
+@pytest.mark.parametrize('high_water_mark, granularity', SETTINGS)
+def test_grid_cells_match_apply_fees(high_water_mark, granularity):
+    grid = evaluate_fee_grid(1000.0, RETURNS, *GRID, high_water_mark, *granularity)
+    assert grid.terminal_net.shape == (6, 5, 4)
+    for cell in CELLS:
+        paths = _cell_paths(1000.0, cell, high_water_mark, *granularity)
+        assert grid.terminal_gross == pytest.approx(paths.gross_values[-1], rel=1e-12)
+        assert grid.terminal_net[cell] == pytest.approx(paths.net_values[-1], rel=1e-12)
+        drag = (paths.gross_values[-1] - paths.net_values[-1]) / paths.gross_values[-1] * 100
+        assert grid.fee_drag[cell] == pytest.approx(drag, rel=1e-12, abs=1e-12)
+
+@pytest.mark.parametrize('high_water_mark, granularity', SETTINGS)
+def test_per_unit_grid_rescales_to_the_investment(high_water_mark, granularity):
+    """The app evaluates one unit invested and scales the cached grid to the investment amount."""
+    grid = evaluate_fee_grid(1.0, RETURNS, *GRID, high_water_mark, *granularity).scaled(2500.0)
+    for cell in CELLS:
+        paths = _cell_paths(2500.0, cell, high_water_mark, *granularity)
+        assert grid.terminal_gross == pytest.approx(paths.gross_values[-1], rel=1e-12)
+        assert grid.terminal_net[cell] == pytest.approx(paths.net_values[-1], rel=1e-12)
+    np.testing.assert_array_equal(grid.fee_drag,
+                                  evaluate_fee_grid(1.0, RETURNS, *GRID, high_water_mark, *granularity).fee_drag)